@@ -0,0 +1,12 @@
+from .access_log import AccessLogMiddleware, AccessLogSampler
+from .capture import TrafficCaptureMiddleware
+from .metrics import MetricsMiddleware
+from .query_profiler import QueryProfilerMiddleware
+
+__all__ = [
+    "AccessLogMiddleware",
+    "AccessLogSampler",
+    "MetricsMiddleware",
+    "QueryProfilerMiddleware",
+    "TrafficCaptureMiddleware",
+]
@@ -0,0 +1,200 @@
+import logging
+import random
+import re
+import time
+import uuid
+from typing import Self
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.config import AccessLogSettings
+from app.infrastructure.database.query_timer import QueryTimer, query_timer_var
+from app.infrastructure.logging.context import request_id_var
+
+# Client-supplied request ids are reused only when they look like ids
+VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def parse_route_values(entries: list[str]) -> dict[str, float]:
+    """``["/ping=0.01", ...]`` as ``{"/ping": 0.01}``."""
+    values = {}
+    for entry in entries:
+        route, _, value = entry.rpartition("=")
+        values[route.strip()] = float(value)
+    return values
+
+
+class AccessLogSampler:
+    """
+    Decides which requests get an access line.
+
+    Every route template has a sample rate and an optional rate limit (a
+    token bucket refilled at ``limit`` lines per second). Per-route values
+    match the template exactly or as a path prefix (``/api/v1/health``
+    covers ``/api/v1/health/pool``). 5xx responses and requests slower than
+    ``slow_ms`` bypass both.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        route_rates: dict[str, float] | None = None,
+        rate_limit: float = 0.0,
+        route_limits: dict[str, float] | None = None,
+        slow_ms: float = 1000.0,
+        rng: random.Random | None = None,
+        clock=time.monotonic,
+    ):
+        self.sample_rate = sample_rate
+        self.route_rates = route_rates or {}
+        self.rate_limit = rate_limit
+        self.route_limits = route_limits or {}
+        self.slow_ms = slow_ms
+        self._rng = rng or random.Random()
+        self._clock = clock
+        self._policies: dict[str, tuple[float, float]] = {}
+        self._buckets: dict[str, tuple[float, float]] = {}  # route -> (tokens, last refill)
+        self._skipped: dict[str, int] = {}
+
+    @classmethod
+    def from_settings(cls, settings: AccessLogSettings) -> Self:
+        return cls(
+            sample_rate=settings.SAMPLE_RATE,
+            route_rates=parse_route_values(settings.ROUTE_SAMPLE_RATES),
+            rate_limit=settings.RATE_LIMIT,
+            route_limits=parse_route_values(settings.ROUTE_RATE_LIMITS),
+            slow_ms=settings.SLOW_REQUEST_MS,
+        )
+
+    def admit(self, route: str, status: int, duration_ms: float) -> int | None:
+        """
+        None to skip the line, otherwise how many lines this route skipped
+        since its last logged one (to scale sampled counts back up).
+        """
+        if status < 500 and duration_ms < self.slow_ms:
+            sample_rate, limit = self._policy(route)
+            if (sample_rate < 1.0 and self._rng.random() >= sample_rate) or not self._take_token(route, limit):
+                self._skipped[route] = self._skipped.get(route, 0) + 1
+                return None
+        return self._skipped.pop(route, 0)
+
+    def _policy(self, route: str) -> tuple[float, float]:
+        policy = self._policies.get(route)
+        if policy is None:
+            policy = (
+                _lookup(self.route_rates, route, self.sample_rate),
+                _lookup(self.route_limits, route, self.rate_limit),
+            )
+            self._policies[route] = policy
+        return policy
+
+    def _take_token(self, route: str, limit: float) -> bool:
+        if limit <= 0:
+            return True
+        now = self._clock()
+        tokens, last = self._buckets.get(route, (max(limit, 1.0), now))
+        tokens = min(max(limit, 1.0), tokens + (now - last) * limit)
+        if tokens < 1.0:
+            self._buckets[route] = (tokens, now)
+            return False
+        self._buckets[route] = (tokens - 1.0, now)
+        return True
+
+
+def _lookup(values: dict[str, float], route: str, default: float) -> float:
+    """Value for the exact route, else for its longest configured path prefix."""
+    if route in values:
+        return values[route]
+    prefixes = [prefix for prefix in values if route.startswith(prefix.rstrip("/") + "/")]
+    return values[max(prefixes, key=len)] if prefixes else default
+
+
+class AccessLogMiddleware:
+    """
+    Pure ASGI middleware writing one structured line per request.
+
+    Each request gets an id (the client's request id header when it is
+    valid, else a new one), echoed on the response and set in a context
+    variable so every log line written while handling the request carries
+    it. The line records method, route template (not the raw path, which
+    would explode cardinality), status, duration and the time and number of
+    statements spent in the database, with the slowest statements as
+    normalized SQL.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        logger: logging.Logger,
+        sampler: AccessLogSampler,
+        request_id_header: str = "X-Request-ID",
+    ):
+        self.app = app
+        self.logger = logger
+        self.sampler = sampler
+        self._header = request_id_header.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = self._request_id(scope)
+        request_id_token = request_id_var.set(request_id)
+        # Reuse the query profiler's timer when it runs outside this middleware
+        timer = query_timer_var.get()
+        timer_token = None
+        if timer is None:
+            timer = QueryTimer()
+            timer_token = query_timer_var.set(timer)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [*message.get("headers", []), (self._header, request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            skipped = self.sampler.admit(route, status, duration_ms)
+            if skipped is not None:
+                self.logger.info(
+                    "%s %s %s %.1fms (db %.1fms, %s queries)",
+                    scope["method"],
+                    route,
+                    status,
+                    duration_ms,
+                    timer.seconds * 1000,
+                    timer.queries,
+                    extra={
+                        "method": scope["method"],
+                        "route": route,
+                        "status": status,
+                        "duration_ms": round(duration_ms, 3),
+                        "db_ms": round(timer.seconds * 1000, 3),
+                        "db_queries": timer.queries,
+                        "skipped": skipped,
+                        "slowest_queries": [
+                            {"ms": round(seconds * 1000, 3), "sql": sql} for seconds, sql in timer.slowest()
+                        ],
+                    },
+                )
+            if timer_token is not None:
+                query_timer_var.reset(timer_token)
+            request_id_var.reset(request_id_token)
+
+    def _request_id(self, scope: Scope) -> str:
+        for name, value in scope["headers"]:
+            if name == self._header:
+                candidate = value.decode("latin-1")
+                if VALID_REQUEST_ID.fullmatch(candidate):
+                    return candidate
+                break
+        return uuid.uuid4().hex
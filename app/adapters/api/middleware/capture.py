@@ -0,0 +1,107 @@
+import random
+import time
+from collections.abc import Sequence
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.adapters.api.middleware.access_log import UNMATCHED_ROUTE
+from app.infrastructure.traffic_capture import CapturedRequest, CaptureWriter
+
+
+class TrafficCaptureMiddleware:
+    """
+    Pure ASGI middleware recording requests for ``tests.benchmarks.replay``.
+
+    Each sampled request is handed to a CaptureWriter after its response
+    ends: arrival time, method, path, query, route template, status,
+    duration and the JSON body (up to ``max_body_bytes``; larger and
+    non-JSON bodies are left out, with the reason). Emails, passwords and
+    names are tokenized by the writer's thread, off the request path. Paths
+    under ``exclude_paths`` (streams, scrapes) are never recorded.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        writer: CaptureWriter,
+        sample_rate: float = 1.0,
+        max_body_bytes: int = 65536,
+        exclude_paths: Sequence[str] = (),
+        rng: random.Random | None = None,
+    ):
+        self.app = app
+        self.writer = writer
+        self.sample_rate = sample_rate
+        self.max_body_bytes = max_body_bytes
+        self.exclude_paths = tuple(path.rstrip("/") for path in exclude_paths)
+        self._rng = rng or random.Random()
+
+    def _excluded(self, path: str) -> bool:
+        return any(path == prefix or path.startswith(prefix + "/") for prefix in self.exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or self._excluded(scope["path"])
+            or (self.sample_rate < 1.0 and self._rng.random() >= self.sample_rate)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        arrived = time.time()
+        start = time.perf_counter()
+        chunks: list[bytes] = []
+        size = 0
+        too_large = False
+        status = 500
+
+        async def receive_and_keep() -> Message:
+            nonlocal size, too_large
+            message = await receive()
+            if message["type"] == "http.request" and not too_large:
+                body = message.get("body", b"")
+                size += len(body)
+                if size > self.max_body_bytes:
+                    too_large = True
+                    chunks.clear()
+                else:
+                    chunks.append(body)
+            return message
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive_and_keep, send_with_status)
+        finally:
+            body: bytes | None = b"".join(chunks) or None
+            omitted = ""
+            if too_large:
+                omitted = f"body over {self.max_body_bytes} bytes"
+            elif body is not None:
+                content_type = _header(scope, b"content-type")
+                if "json" not in content_type:
+                    body, omitted = None, f"content-type {content_type.split(';')[0] or 'missing'}"
+            self.writer.submit(
+                CapturedRequest(
+                    ts=arrived,
+                    method=scope["method"],
+                    path=scope["path"],
+                    query=scope["query_string"].decode("latin-1"),
+                    route=getattr(scope.get("route"), "path", UNMATCHED_ROUTE),
+                    status=status,
+                    ms=(time.perf_counter() - start) * 1000,
+                    body=body,
+                    omitted=omitted,
+                )
+            )
+
+
+def _header(scope: Scope, name: bytes) -> str:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1").lower()
+    return ""
@@ -0,0 +1,50 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.adapters.api.middleware.access_log import UNMATCHED_ROUTE
+from app.infrastructure.metrics import MetricsRegistry
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware counting requests and timing them per route.
+
+    Labels are method, route template and (for the counter) status; the
+    template keeps the number of series bounded whatever paths clients send.
+    """
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry):
+        self.app = app
+        self.requests = registry.counter(
+            "http_requests_total",
+            "HTTP requests by method, route template and status.",
+            labels=("method", "route", "status"),
+        )
+        self.duration = registry.histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency by method and route template.",
+            labels=("method", "route"),
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            self.duration.observe(elapsed, scope["method"], route)
+            self.requests.inc(scope["method"], route, str(status))
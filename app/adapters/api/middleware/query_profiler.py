@@ -0,0 +1,53 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.adapters.api.middleware.access_log import UNMATCHED_ROUTE
+from app.infrastructure.database.query_timer import QueryBudget, QueryTimer, query_timer_var
+
+
+def server_timing(timer: QueryTimer, elapsed: float) -> str:
+    """``Server-Timing`` value: DB time with the statement count, and total time so far."""
+    return f'db;dur={timer.seconds * 1000:.1f};desc="{timer.queries} queries", app;dur={elapsed * 1000:.1f}'
+
+
+class QueryProfilerMiddleware:
+    """
+    Pure ASGI middleware giving every request its own QueryTimer.
+
+    Engine events record each statement into it. Statement count and DB
+    time go back in a ``Server-Timing`` header (shown by browser dev tools),
+    measured when the response starts, so a streamed body's later queries
+    are not included. Inner middleware (the access log) read the same timer.
+
+    When ``app.state.query_budget`` holds a QueryBudget (tests), every
+    request is checked against it.
+    """
+
+    def __init__(self, app: ASGIApp, keep_slowest: int = 3, server_timing: bool = True):
+        self.app = app
+        self.keep_slowest = keep_slowest
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timer = QueryTimer(keep_slowest=self.keep_slowest)
+        token = query_timer_var.set(timer)
+        start = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.server_timing:
+                header = server_timing(timer, time.perf_counter() - start).encode("latin-1")
+                message["headers"] = [*message.get("headers", []), (b"server-timing", header)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            query_timer_var.reset(token)
+            budget = getattr(getattr(scope.get("app"), "state", None), "query_budget", None)
+            if isinstance(budget, QueryBudget):
+                budget.check(scope["method"], getattr(scope.get("route"), "path", UNMATCHED_ROUTE), timer)
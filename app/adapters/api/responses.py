@@ -0,0 +1,37 @@
+from typing import Any, Self
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# Describe the injected response's body, not the one being rendered
+_BODY_HEADERS = (b"content-length", b"content-type")
+
+
+class PydanticResponse(JSONResponse):
+    """
+    JSON response serialized by the model's own pydantic-core serializer.
+
+    Returning it from a route bypasses FastAPI's response handling, which
+    would validate the model against ``response_model`` again and encode it
+    through the generic path; the route's ``response_model`` still
+    documents the schema. Anything that isn't a model is encoded as by
+    JSONResponse.
+    """
+
+    @classmethod
+    def carrying(cls, content: Any, response: Response) -> Self:
+        """
+        Response for ``content`` with the status, headers, cookies and background set on ``response``.
+
+        FastAPI only copies what dependencies set on the injected Response
+        onto responses it builds itself, not onto one the route returns.
+        """
+        carried = cls(content, status_code=response.status_code or 200, background=response.background)
+        carried.headers.raw.extend((key, value) for key, value in response.headers.raw if key not in _BODY_HEADERS)
+        return carried
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return super().render(content)
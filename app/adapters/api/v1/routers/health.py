@@ -1,11 +1,56 @@
-from fastapi import APIRouter
+import logging
+from typing import Annotated
 
-from app.infrastructure.logging import logger
+from fastapi import APIRouter, Depends
+
+from app.dependencies import get_change_feed_listener, get_db_connector, get_logger, get_user_cache
+from app.infrastructure.cache import CacheBackend
+from app.infrastructure.change_feed import ChangeFeedListener
+from app.infrastructure.database.connector import DatabaseConnector
+from app.infrastructure.logging import queue_stats
 
 router = APIRouter(tags=["health"])
 
 
 @router.get("/health")
 async def health_check():
-    logger.debug("Health check called")
     return {"status": "ok"}
+
+
+@router.get("/health/pool")
+async def pool_stats(connector: Annotated[DatabaseConnector, Depends(get_db_connector)]):
+    """Connection pool occupancy and checkout wait-time histogram."""
+    return connector.pool_stats()
+
+
+@router.get("/health/replicas")
+async def replica_stats(connector: Annotated[DatabaseConnector, Depends(get_db_connector)]):
+    """Read replica health, smoothed probe latency and pool occupancy."""
+    return {"replicas": connector.replica_stats()}
+
+
+@router.get("/health/cache")
+async def cache_stats(cache: Annotated[CacheBackend | None, Depends(get_user_cache)]):
+    """User cache hit/miss/eviction counters."""
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats().as_dict()}
+
+
+@router.get("/health/change-feed")
+async def change_feed_stats(
+    listener: Annotated[ChangeFeedListener | None, Depends(get_change_feed_listener)],
+):
+    """LISTEN connection state, reconnects and subscriber fan-out counters."""
+    if listener is None:
+        return {"enabled": False}
+    return {"enabled": True, **listener.stats()}
+
+
+@router.get("/health/logging")
+async def logging_stats(app_logger: Annotated[logging.Logger, Depends(get_logger)]):
+    """Background log queue depth and records dropped by the overflow policy."""
+    stats = queue_stats(app_logger)
+    if stats is None:
+        return {"enabled": False}
+    return {"enabled": True, **stats}
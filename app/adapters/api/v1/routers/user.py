@@ -1,16 +1,69 @@
+import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.application.dto.user import UserCreate, UserRead, UserUpdate
+from app.adapters.api.responses import PydanticResponse
+from app.application.credentials import SessionFactory, verify_credentials
+from app.application.dto.user import (
+    UserBulkItem,
+    UserBulkResult,
+    UserCreate,
+    UserCredentials,
+    UserImportReport,
+    UserPage,
+    UserRead,
+    UserUpdate,
+)
+from app.application.export import MEDIA_TYPES, ExportFormat, encode_users
 from app.application.mappers.user_mapper import UserMapper
-from app.dependencies import get_db, get_user_repository
+from app.application.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.application.user_changes import SSE_MEDIA_TYPE, user_change_events
+from app.application.user_import import ImportFormat, import_users
+from app.dependencies import (
+    get_change_feed,
+    get_db,
+    get_read_db,
+    get_session_factory,
+    get_user_import_repository,
+    get_user_repository,
+)
+from app.domain.entities.user import UserEntity
+from app.infrastructure.change_feed import ChangeFeed
+from app.infrastructure.config import get_settings
+from app.infrastructure.database.repositories.user_import_repository import UserImportRepository
 from app.infrastructure.database.repositories.user_repository import UserRepository
+from app.infrastructure.security import PasswordHashingBusyError
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_BULK_SIZE = 1000
+
+
+def _validate_reads() -> bool:
+    """Whether read models are validated when built; fast mode trusts stored data."""
+    return not get_settings().FAST_RESPONSES
+
+
+def _to_read(entity: UserEntity) -> UserRead:
+    return UserMapper.to_read(entity, validate=_validate_reads())
+
+
+def _respond(model: BaseModel, response: Response) -> BaseModel | PydanticResponse:
+    """
+    In fast mode the model is serialized once, skipping FastAPI's response_model validation.
+
+    ``response`` is the route's injected Response: cookies and headers that
+    dependencies set on it (e.g. get_db's sticky-primary cookie) are kept.
+    """
+    return PydanticResponse.carrying(model, response) if get_settings().FAST_RESPONSES else model
+
 
 @router.post("/test")
 async def test_db_operations(
@@ -25,16 +78,16 @@ async def test_db_operations(
             full_name="Test User",
             password="fakepassword",
         )
-        test_user = UserMapper.create_to_entity(test_input)
+        test_user = await UserMapper.create_to_entity(test_input)
         await repository.create_user(db, test_user)
 
-        # Query users
-        result = await db.execute(select(repository.model))
-        users = result.scalars().all()
+        # Query users (count in SQL, sample only the first page)
+        users_count = await db.scalar(select(func.count()).select_from(repository.model))
+        users = await repository.list_users(db, limit=DEFAULT_PAGE_SIZE)
 
         return {
             "message": "Database test completed",
-            "users_count": len(users),
+            "users_count": users_count,
             "users": [{"email": u.email, "full_name": u.full_name} for u in users],
         }
     except Exception as e:
@@ -47,37 +100,204 @@ async def create_user(
     user: UserCreate,
     repository: Annotated[UserRepository, Depends(get_user_repository)],
     db: Annotated[AsyncSession, Depends(get_db)],
+    response: Response,
 ):
     try:
-        entity = UserMapper.create_to_entity(user)
+        entity = await UserMapper.create_to_entity(user)
         db_user = await repository.create_user(db, entity)
-        return UserMapper.to_read(db_user)
+        return _respond(_to_read(db_user), response)
+    except PasswordHashingBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
 
 
+@router.post("/bulk", response_model=UserBulkResult)
+async def create_users_bulk(
+    users: Annotated[list[UserCreate], Body(min_length=1, max_length=MAX_BULK_SIZE)],
+    repository: Annotated[UserRepository, Depends(get_user_repository)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    response: Response,
+):
+    """Create up to MAX_BULK_SIZE users with one INSERT; each item reports its own outcome."""
+    entities = await UserMapper.create_many_to_entities(users)
+
+    items: dict[int, UserBulkItem] = {}
+    pending: list[tuple[int, UserEntity]] = []
+    for index, entity in enumerate(entities):
+        if isinstance(entity, UserEntity):
+            pending.append((index, entity))
+        else:
+            items[index] = UserBulkItem(index=index, status="error", error=str(entity))
+
+    if pending:
+        try:
+            created = await repository.create_users(db, [entity for _, entity in pending])
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        for (index, _), db_user in zip(pending, created, strict=True):
+            if db_user is None:
+                items[index] = UserBulkItem(index=index, status="error", error="Email already registered")
+            else:
+                items[index] = UserBulkItem(index=index, status="created", user=_to_read(db_user))
+
+    ordered = [items[index] for index in range(len(users))]
+    created_count = sum(item.status == "created" for item in ordered)
+    return _respond(UserBulkResult(created=created_count, failed=len(ordered) - created_count, items=ordered), response)
+
+
+@router.post("/import", response_model=UserImportReport)
+async def import_users_upload(
+    file: UploadFile,
+    repository: Annotated[UserImportRepository, Depends(get_user_import_repository)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    import_format: Annotated[ImportFormat, Query(alias="format")] = "csv",
+    import_id: Annotated[str | None, Query(max_length=64)] = None,
+    chunk_size: Annotated[int, Query(ge=1, le=50_000)] = 5000,
+):
+    """
+    Import a CSV/NDJSON file of users (email, full_name, password) via COPY staging.
+
+    Send the same ``import_id`` again to resume an import that failed midway.
+    """
+    import_id = import_id or uuid.uuid4().hex
+    try:
+        return await import_users(
+            db,
+            repository,
+            file.read,
+            import_format,
+            import_id,
+            source=file.filename or "",
+            chunk_size=chunk_size,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Import {import_id} failed: {e}") from e
+
+
+@router.post("/verify", response_model=UserRead)
+async def verify_user_credentials(
+    credentials: UserCredentials,
+    repository: Annotated[UserRepository, Depends(get_user_repository)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    session_factory: Annotated[SessionFactory, Depends(get_session_factory)],
+    response: Response,
+):
+    """Check an email and password; a hash with outdated argon2 parameters is upgraded in the background."""
+    try:
+        user = await verify_credentials(db, repository, credentials.email, credentials.password, session_factory)
+    except PasswordHashingBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+    if user is None:
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+    return _respond(_to_read(user), response)
+
+
+@router.get("", response_model=UserPage)
+async def list_users(
+    repository: Annotated[UserRepository, Depends(get_user_repository)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    response: Response,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+):
+    """List users by ID. Pass ``next_cursor`` from the previous page as ``cursor``."""
+    after_id = None
+    if cursor is not None:
+        try:
+            after_id = int(decode_cursor(cursor)["id"])
+        except (InvalidCursorError, KeyError, TypeError, ValueError) as e:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+    # One extra row tells whether another page exists without a COUNT query.
+    users = await repository.list_user_views(
+        db, UserRead, limit=limit + 1, after_id=after_id, validate=_validate_reads()
+    )
+    next_cursor = encode_cursor({"id": users[limit - 1].id}) if len(users) > limit else None
+    return _respond(UserPage(items=users[:limit], next_cursor=next_cursor), response)
+
+
+@router.get("/export")
+async def export_users(
+    repository: Annotated[UserRepository, Depends(get_user_repository)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    export_format: Annotated[ExportFormat, Query(alias="format")] = "ndjson",
+    batch_size: Annotated[int, Query(ge=1, le=10_000)] = 1000,
+):
+    """Stream every user as NDJSON or CSV through a server-side cursor."""
+    return StreamingResponse(
+        encode_users(
+            repository.stream_user_views(db, UserRead, batch_size=batch_size, validate=_validate_reads()),
+            export_format,
+        ),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="users.{export_format}"'},
+    )
+
+
+@router.get("/changes")
+async def stream_user_changes(
+    feed: Annotated[ChangeFeed, Depends(get_change_feed)],
+    last_event_id: Annotated[str | None, Header()] = None,
+):
+    """
+    Server-Sent Events stream of user inserts, updates and deletes (ids only).
+
+    A ``resync`` event means events were missed and the client should reload.
+    """
+    feed_settings = get_settings().CHANGE_FEED
+    heartbeat = feed_settings.HEARTBEAT_INTERVAL if feed_settings is not None else 15.0
+    return StreamingResponse(
+        user_change_events(feed, heartbeat, resumed=last_event_id is not None),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{user_id}", response_model=UserRead)
 async def read_user(
     user_id: int,
     repository: Annotated[UserRepository, Depends(get_user_repository)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    response: Response,
 ):
-    db_user = await repository.get_user_by_id(db, user_id)
-    if db_user is None:
+    user = await repository.get_user_view(db, user_id, UserRead, validate=_validate_reads())
+    if user is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return UserMapper.to_read(db_user)
+    return _respond(user, response)
+
+
+@router.head("/{user_id}")
+async def user_exists(
+    user_id: int,
+    repository: Annotated[UserRepository, Depends(get_user_repository)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+):
+    """200 if the user exists, 404 if not; no column is read or decrypted."""
+    return Response(status_code=200 if await repository.user_exists(db, user_id) else 404)
 
 
 @router.get("/by-email/{email}", response_model=UserRead)
 async def read_user_by_email(
     email: str,
     repository: Annotated[UserRepository, Depends(get_user_repository)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    response: Response,
 ):
-    db_user = await repository.get_user_by_email(db, email)
-    if db_user is None:
+    user = await repository.get_user_view_by_email(db, email, UserRead, validate=_validate_reads())
+    if user is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return UserMapper.to_read(db_user)
+    return _respond(user, response)
+
+
+@router.head("/by-email/{email}")
+async def email_exists(
+    email: str,
+    repository: Annotated[UserRepository, Depends(get_user_repository)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+):
+    """200 if the email is registered, 404 if not (blind index probe, nothing decrypted)."""
+    return Response(status_code=200 if await repository.email_exists(db, email) else 404)
 
 
 @router.put("/{user_id}", response_model=UserRead)
@@ -86,18 +306,20 @@ async def update_user(
     user: UserUpdate,
     repository: Annotated[UserRepository, Depends(get_user_repository)],
     db: Annotated[AsyncSession, Depends(get_db)],
+    response: Response,
 ):
-    current = await repository.get_user_by_id(db, user_id)
-    if not current:
-        raise HTTPException(status_code=404, detail="User not found")
-
     try:
-        entity = UserMapper.update_to_entity(user, current)
-        updated_user = await repository.update_user(db, user_id, entity)
-        return UserMapper.to_read(updated_user)
+        changes = await UserMapper.update_to_changes(user)
+        updated_user = await repository.update_user_view(db, user_id, changes, UserRead, validate=_validate_reads())
+    except PasswordHashingBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
 
+    if updated_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return _respond(updated_user, response)
+
 
 @router.delete("/{user_id}")
 async def delete_user(
@@ -105,12 +327,11 @@ async def delete_user(
     repository: Annotated[UserRepository, Depends(get_user_repository)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
-    db_user = await repository.get_user_by_id(db, user_id)
-    if not db_user:
-        raise HTTPException(status_code=404, detail="User not found")
-
     try:
-        await repository.delete_user(db, user_id)
-        return {"message": "User deleted successfully"}
+        deleted = await repository.delete_user(db, user_id)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
+
+    if not deleted:
+        raise HTTPException(status_code=404, detail="User not found")
+    return {"message": "User deleted successfully"}
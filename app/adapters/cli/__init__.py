@@ -0,0 +1,25 @@
+"""
+Command line entry points.
+
+Usage: ``python -m app.adapters.cli <command> [options]``
+"""
+
+import argparse
+from collections.abc import Sequence
+
+from . import database, security, users
+
+COMMAND_MODULES = (database, users, security)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.adapters.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for module in COMMAND_MODULES:
+        module.register(subparsers)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
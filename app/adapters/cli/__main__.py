@@ -0,0 +1,3 @@
+from app.adapters.cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,34 @@
+import argparse
+import asyncio
+
+from alembic import command
+
+from app.infrastructure.database.connector import db_connector
+from app.infrastructure.database.migrations import alembic_config
+from app.infrastructure.logging import logger
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    migrate = subparsers.add_parser(
+        "migrate",
+        help="Upgrade the database schema (run once per deploy, before starting workers).",
+    )
+    migrate.add_argument("--revision", default="head", help="target revision (default: head)")
+    migrate.add_argument("--sql", action="store_true", help="print the SQL instead of running it")
+    migrate.set_defaults(handler=migrate_command)
+
+
+def migrate_command(args: argparse.Namespace) -> int:
+    if args.sql:
+        command.upgrade(alembic_config(), args.revision, sql=True)
+        return 0
+
+    async def run() -> None:
+        try:
+            await db_connector.migrate(args.revision)
+        finally:
+            await db_connector.dispose()
+
+    asyncio.run(run())
+    logger.info("Database migrated to %s", args.revision)
+    return 0
@@ -0,0 +1,58 @@
+import argparse
+import os
+from pathlib import Path
+
+from app.infrastructure.config import update_env_file
+from app.infrastructure.logging import logger
+from app.infrastructure.security import calibrate_argon2
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    calibrate = subparsers.add_parser(
+        "calibrate-argon2",
+        help="Pick the strongest argon2 parameters that fit a latency and memory budget on this host.",
+    )
+    calibrate.add_argument("--target-ms", type=float, default=250.0, help="max median time per hash")
+    calibrate.add_argument("--max-memory-mib", type=int, default=64, help="memory budget per hash")
+    calibrate.add_argument("--min-memory-mib", type=int, default=19, help="never go below this memory cost")
+    calibrate.add_argument("--parallelism", type=int, default=min(os.cpu_count() or 1, 4))
+    calibrate.add_argument("--samples", type=int, default=3)
+    calibrate.add_argument(
+        "--env-file",
+        type=Path,
+        default=Path(".env"),
+        help="dotenv file that receives ARGON2_* (env values take priority over config/*.conf)",
+    )
+    calibrate.add_argument("--dry-run", action="store_true", help="print the parameters without writing them")
+    calibrate.set_defaults(handler=calibrate_argon2_command)
+
+
+def calibrate_argon2_command(args: argparse.Namespace) -> int:
+    params = calibrate_argon2(
+        target_ms=args.target_ms,
+        max_memory_kib=args.max_memory_mib * 1024,
+        min_memory_kib=args.min_memory_mib * 1024,
+        parallelism=args.parallelism,
+        samples=args.samples,
+    )
+    logger.info(
+        "Argon2 calibration: time_cost=%s memory_cost=%sKiB parallelism=%s (%sms per hash)",
+        params.time_cost,
+        params.memory_cost,
+        params.parallelism,
+        params.measured_ms,
+    )
+    if not params.within_budget:
+        logger.warning("Even the cheapest allowed parameters exceed %sms on this host", args.target_ms)
+
+    if not args.dry_run:
+        update_env_file(
+            args.env_file,
+            {
+                "ARGON2_TIME_COST": params.time_cost,
+                "ARGON2_MEMORY_COST": params.memory_cost,
+                "ARGON2_PARALLELISM": params.parallelism,
+            },
+        )
+        logger.info("Argon2 parameters written to %s", args.env_file)
+    return 0 if params.within_budget else 1
@@ -0,0 +1,123 @@
+import argparse
+import asyncio
+import hashlib
+import sys
+from pathlib import Path
+
+from app.application.dto.user import UserImportReport, UserRead
+from app.application.export import encode_users
+from app.application.user_import import ImportFormat, import_users
+from app.dependencies import container
+from app.infrastructure.database.connector import db_connector
+from app.infrastructure.database.repositories.user_repository import UserRepository
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    backfill = subparsers.add_parser(
+        "backfill-email-index",
+        help="Populate the email blind index for existing users.",
+    )
+    backfill.add_argument("--batch-size", type=int, default=1000)
+    backfill.set_defaults(handler=backfill_email_index)
+
+    export = subparsers.add_parser("export-users", help="Stream all users as NDJSON or CSV.")
+    export.add_argument("--format", dest="export_format", choices=("ndjson", "csv"), default="ndjson")
+    export.add_argument("--output", type=Path, help="file to write (default: stdout)")
+    export.add_argument("--batch-size", type=int, default=1000)
+    export.set_defaults(handler=export_users)
+
+    importer = subparsers.add_parser(
+        "import-users",
+        help="Bulk import users from CSV/NDJSON through COPY staging (resumable).",
+    )
+    importer.add_argument("path", type=Path)
+    importer.add_argument("--format", dest="import_format", choices=("csv", "ndjson"))
+    importer.add_argument("--import-id", help="resume key (default: SHA-256 of the file)")
+    importer.add_argument("--chunk-size", type=int, default=5000)
+    importer.add_argument("--errors-file", type=Path, help="write rejected lines here as NDJSON")
+    importer.set_defaults(handler=import_users_command)
+
+
+def backfill_email_index(args: argparse.Namespace) -> int:
+    async def run() -> int:
+        repository = UserRepository(logger=container.logger, settings=container.settings)
+        try:
+            async with container.get_db() as db:
+                return await repository.backfill_email_index(db, batch_size=args.batch_size)
+        finally:
+            await db_connector.dispose()
+
+    total = asyncio.run(run())
+    container.logger.info("Backfill finished: %s users updated", total)
+    return 0
+
+
+def export_users(args: argparse.Namespace) -> int:
+    async def run(output) -> None:
+        repository = container.get_user_repository()
+        try:
+            async with container.get_db() as db:
+                batches = repository.stream_user_views(db, UserRead, batch_size=args.batch_size)
+                async for chunk in encode_users(batches, args.export_format):
+                    output.write(chunk)
+        finally:
+            await db_connector.dispose()
+
+    if args.output is None:
+        asyncio.run(run(sys.stdout.buffer))
+    else:
+        with args.output.open("wb") as output:
+            asyncio.run(run(output))
+    return 0
+
+
+def import_users_command(args: argparse.Namespace) -> int:
+    import_format: ImportFormat = args.import_format or (
+        "ndjson" if args.path.suffix in (".ndjson", ".jsonl") else "csv"
+    )
+    import_id = args.import_id or _file_digest(args.path)
+
+    def log_progress(report: UserImportReport) -> None:
+        container.logger.info(
+            "Import %s: %s read, %s staged, %s failed, %s merged (%s rows/s)",
+            report.import_id,
+            report.rows_read,
+            report.rows_staged,
+            report.rows_failed,
+            report.rows_merged,
+            report.rows_per_second,
+        )
+
+    async def run() -> UserImportReport:
+        repository = container.get_user_import_repository()
+        try:
+            async with container.get_db() as db:
+                with args.path.open("rb") as source:
+                    return await import_users(
+                        db,
+                        repository,
+                        lambda size: asyncio.to_thread(source.read, size),
+                        import_format,
+                        import_id,
+                        source=str(args.path),
+                        chunk_size=args.chunk_size,
+                        on_progress=log_progress,
+                    )
+        finally:
+            await db_connector.dispose()
+
+    report = asyncio.run(run())
+    if args.errors_file is not None:
+        with args.errors_file.open("w") as errors_file:
+            for error in report.errors:
+                errors_file.write(error.model_dump_json() + "\n")
+    return 0 if report.rows_failed == 0 else 1
+
+
+def _file_digest(path: Path) -> str:
+    """Default import id: same file, same id, so re-running resumes instead of duplicating."""
+    digest = hashlib.sha256()
+    with path.open("rb") as source:
+        while chunk := source.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
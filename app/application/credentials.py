@@ -0,0 +1,38 @@
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities.user import UserEntity
+from app.domain.repositories.user_repository import UserRepository
+from app.infrastructure.security import verify_password_async
+
+type SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+
+
+async def verify_credentials(
+    db: AsyncSession,
+    repository: UserRepository,
+    email: str,
+    password: str,
+    session_factory: SessionFactory,
+) -> UserEntity | None:
+    """
+    The active user registered with ``email`` if ``password`` matches, else None.
+
+    A matching hash made with outdated argon2 parameters is replaced in the
+    background, in a session from ``session_factory``: the request's own
+    session is closed by the time the new hash is ready.
+    """
+    user = await repository.get_user_by_email(db, email)
+    if user is None or user.id is None or not user.is_active:
+        return None
+    user_id = user.id
+
+    async def persist_rehash(new_hash: str) -> None:
+        async with session_factory() as session:
+            await repository.update_user(session, user_id, {"hashed_password": new_hash})
+
+    if not await verify_password_async(password, user.hashed_password, on_rehash=persist_rehash):
+        return None
+    return user
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict, EmailStr
 
 
@@ -10,6 +12,11 @@ class UserCreate(UserBase):
     password: str
 
 
+class UserCredentials(BaseModel):
+    email: EmailStr
+    password: str
+
+
 class UserUpdate(BaseModel):
     email: EmailStr | None = None
     full_name: str | None = None
@@ -24,3 +31,38 @@ class UserRead(UserBase):
     is_superuser: bool
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class UserPage(BaseModel):
+    items: list[UserRead]
+    next_cursor: str | None = None
+
+
+class UserBulkItem(BaseModel):
+    index: int
+    status: Literal["created", "error"]
+    user: UserRead | None = None
+    error: str | None = None
+
+
+class UserBulkResult(BaseModel):
+    created: int
+    failed: int
+    items: list[UserBulkItem]
+
+
+class UserImportError(BaseModel):
+    line: int
+    error: str
+
+
+class UserImportReport(BaseModel):
+    import_id: str
+    status: str
+    rows_read: int
+    rows_staged: int
+    rows_failed: int
+    rows_merged: int
+    elapsed_seconds: float
+    rows_per_second: float
+    errors: list[UserImportError] = []
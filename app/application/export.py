@@ -0,0 +1,33 @@
+import csv
+import io
+from collections.abc import AsyncIterator
+from typing import Literal
+
+from app.application.dto.user import UserRead
+
+type ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+EXPORT_FIELDS = tuple(UserRead.model_fields)
+
+
+async def encode_users(batches: AsyncIterator[list[UserRead]], export_format: ExportFormat) -> AsyncIterator[bytes]:
+    """Encode batches of users (``stream_user_views`` onto UserRead) as NDJSON or CSV, one chunk per batch."""
+    if export_format == "csv":
+        yield _csv_rows([EXPORT_FIELDS])
+
+    async for users in batches:
+        if export_format == "csv":
+            yield _csv_rows([tuple(getattr(user, field) for field in EXPORT_FIELDS) for user in users])
+        else:
+            yield b"".join(user.model_dump_json().encode() + b"\n" for user in users)
+
+
+def _csv_rows(rows: list[tuple]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
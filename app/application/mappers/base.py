@@ -14,13 +14,35 @@ class BaseMapper[
 ](Protocol):
     """Protocol for mapper implementations."""
 
-    def create_to_entity(self, create_dto: CreateT) -> EntityT: ...
+    async def create_to_entity(self, create_dto: CreateT) -> EntityT: ...
 
-    def update_to_entity(self, update_dto: UpdateT, current: EntityT) -> EntityT: ...
+    async def update_to_changes(self, update_dto: UpdateT) -> dict[str, Any]: ...
 
     def to_read(self, entity: EntityT) -> ReadT: ...
 
 
+def update_changes(
+    update: BaseModel,
+    *,
+    field_map: dict[str, str] | None = None,
+    transforms: dict[str, TransformFn] | None = None,
+) -> dict[str, Any]:
+    """
+    Turn the fields explicitly set on an update DTO into target-field changes.
+
+    - field_map maps input field names to target field names.
+    - transforms applies per-field transformations before mapping.
+    """
+    field_map = field_map or {}
+    transforms = transforms or {}
+
+    changes: dict[str, Any] = {}
+    for key, value in update.model_dump(exclude_unset=True).items():
+        transform = transforms.get(key)
+        changes[field_map.get(key, key)] = transform(value) if transform else value
+    return changes
+
+
 def merge_update[
     CurrentT: BaseModel,
     UpdateT: BaseModel,
@@ -34,20 +56,8 @@ def merge_update[
     """
     Merge an update DTO into an existing model using model_dump.
 
-    - field_map maps input field names to target field names.
-    - transforms applies per-field transformations before merging.
+    See update_changes for field_map and transforms.
     """
-    field_map = field_map or {}
-    transforms = transforms or {}
-
-    update_data = update.model_dump(exclude_unset=True)
-    normalized: dict[str, Any] = {}
-
-    for key, value in update_data.items():
-        target_key = field_map.get(key, key)
-        transform = transforms.get(key)
-        normalized[target_key] = transform(value) if transform else value
-
     base_data = current.model_dump()
-    base_data.update(normalized)
+    base_data.update(update_changes(update, field_map=field_map, transforms=transforms))
     return base_data
@@ -1,33 +1,50 @@
+from typing import Any
+
 from app.application.dto.user import UserCreate, UserRead, UserUpdate
-from app.application.mappers.base import merge_update
+from app.application.mappers.base import update_changes
 from app.domain.entities.user import UserEntity
-from app.infrastructure.security import hash_password
+from app.infrastructure.security import hash_password_async, hash_passwords_async
 
 
 class UserMapper:
     @staticmethod
-    def create_to_entity(user_create: UserCreate) -> UserEntity:
+    async def create_to_entity(user_create: UserCreate) -> UserEntity:
         return UserEntity(
             email=user_create.email,
             full_name=user_create.full_name,
-            hashed_password=hash_password(user_create.password),
+            hashed_password=await hash_password_async(user_create.password),
         )
 
     @staticmethod
-    def update_to_entity(user_update: UserUpdate, current: UserEntity) -> UserEntity:
-        merged = merge_update(
-            current,
-            user_update,
-            field_map={"password": "hashed_password"},
-            transforms={"password": hash_password},
-        )
-        return UserEntity(**merged)
+    async def create_many_to_entities(users_create: list[UserCreate]) -> list[UserEntity | BaseException]:
+        """Map a batch of create DTOs, hashing passwords concurrently; failures are returned in place."""
+        hashed_passwords = await hash_passwords_async([user.password for user in users_create])
+        return [
+            hashed
+            if isinstance(hashed, BaseException)
+            else UserEntity(email=user.email, full_name=user.full_name, hashed_password=hashed)
+            for user, hashed in zip(users_create, hashed_passwords, strict=True)
+        ]
+
+    @staticmethod
+    async def update_to_changes(user_update: UserUpdate) -> dict[str, Any]:
+        """Entity-field changes for the fields the client set; ``None`` values are ignored."""
+        changes = update_changes(user_update, field_map={"password": "hashed_password"})
+        changes = {key: value for key, value in changes.items() if value is not None}
+        if "hashed_password" in changes:
+            changes["hashed_password"] = await hash_password_async(changes["hashed_password"])
+        return changes
 
     @staticmethod
-    def to_read(entity: UserEntity) -> UserRead:
+    def to_read(entity: UserEntity, *, validate: bool = True) -> UserRead:
+        """
+        ``validate=False`` trusts the entity (its email was validated when it
+        was stored) and skips the EmailStr check, by far the costliest part.
+        """
         if entity.id is None:
             raise ValueError("UserEntity.id is required for UserRead")
-        return UserRead(
+        build = UserRead if validate else UserRead.model_construct
+        return build(
             id=entity.id,
             email=entity.email,
             full_name=entity.full_name,
@@ -0,0 +1,39 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator
+
+from app.infrastructure.change_feed import ChangeFeed, UserChange
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+def format_event(event_id: int, change: UserChange) -> bytes:
+    return f"id: {event_id}\nevent: {change.op}\ndata: {json.dumps(change.public())}\n\n".encode()
+
+
+async def user_change_events(
+    feed: ChangeFeed,
+    heartbeat: float,
+    resumed: bool = False,
+) -> AsyncIterator[bytes]:
+    """
+    Server-Sent Events for user changes.
+
+    Event ids only count within one connection; events are not replayed, so a
+    client reconnecting with ``Last-Event-ID`` (``resumed``) first gets a
+    ``resync`` event telling it to reload. Keep-alive comments every
+    ``heartbeat`` seconds stop proxies from closing an idle stream.
+    """
+    with feed.subscribe() as subscription:
+        event_id = 0
+        if resumed:
+            event_id += 1
+            yield format_event(event_id, UserChange.resync("client reconnected"))
+        while True:
+            try:
+                change = await asyncio.wait_for(subscription.get(), timeout=heartbeat)
+            except TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            event_id += 1
+            yield format_event(event_id, change)
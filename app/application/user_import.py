@@ -0,0 +1,168 @@
+import csv
+import json
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any, Literal
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.dto.user import UserCreate, UserImportError, UserImportReport
+from app.infrastructure.database.models.user_import import UserImport
+from app.infrastructure.database.repositories.user_import_repository import (
+    StagedRow,
+    UserImportRepository,
+)
+from app.infrastructure.security import hash_passwords_async
+
+type ImportFormat = Literal["csv", "ndjson"]
+type ReadChunk = Callable[[int], Awaitable[bytes]]
+type ProgressCallback = Callable[[UserImportReport], None]
+
+READ_SIZE = 1 << 16
+MAX_REPORTED_ERRORS = 1000
+
+
+async def iter_lines(read: ReadChunk) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines without holding more than one read in memory."""
+    pending = b""
+    while chunk := await read(READ_SIZE):
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r")
+    if pending:
+        yield pending.rstrip(b"\r")
+
+
+async def parse_records(
+    lines: AsyncIterator[bytes],
+    import_format: ImportFormat,
+) -> AsyncIterator[tuple[int, dict[str, Any] | str]]:
+    """
+    Yield ``(line_no, record)`` per data line, or ``(line_no, error)`` for unparsable ones.
+
+    CSV takes its field names from the first line and expects one record per line.
+    """
+    header: list[str] | None = None
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            text = line.decode("utf-8")
+            if import_format == "ndjson":
+                record = json.loads(text)
+                if not isinstance(record, dict):
+                    raise ValueError("expected a JSON object")
+            else:
+                values = next(csv.reader([text]))
+                if header is None:
+                    header = [value.strip() for value in values]
+                    continue
+                if len(values) != len(header):
+                    raise ValueError(f"expected {len(header)} fields, got {len(values)}")
+                record = dict(zip(header, values, strict=True))
+        except (UnicodeDecodeError, ValueError, csv.Error) as e:
+            yield line_no, str(e)
+            continue
+        yield line_no, record
+
+
+async def import_users(
+    db: AsyncSession,
+    repository: UserImportRepository,
+    read: ReadChunk,
+    import_format: ImportFormat,
+    import_id: str,
+    source: str = "",
+    chunk_size: int = 5000,
+    on_progress: ProgressCallback | None = None,
+) -> UserImportReport:
+    """
+    Validate, hash, stage and merge a CSV/NDJSON stream of users.
+
+    Re-running with the same ``import_id`` and input resumes after the last
+    committed chunk; a finished import is not applied twice.
+    """
+    start = time.perf_counter()
+    job = await repository.get_or_create_job(db, import_id, source)
+    errors: list[UserImportError] = []
+    processed = 0
+
+    def report() -> UserImportReport:
+        elapsed = time.perf_counter() - start
+        return UserImportReport(
+            import_id=job.import_id,
+            status=job.status,
+            rows_read=job.rows_read,
+            rows_staged=job.rows_staged,
+            rows_failed=job.rows_failed,
+            rows_merged=job.rows_merged,
+            elapsed_seconds=round(elapsed, 3),
+            rows_per_second=round(processed / elapsed, 1) if elapsed else 0.0,
+            errors=errors,
+        )
+
+    if job.status == "done":
+        return report()
+
+    to_skip = job.rows_read
+    chunk: list[tuple[int, dict[str, Any] | str]] = []
+    async for line_no, record in parse_records(iter_lines(read), import_format):
+        if to_skip:
+            to_skip -= 1
+            continue
+        chunk.append((line_no, record))
+        if len(chunk) >= chunk_size:
+            await _stage_chunk(db, repository, job, chunk, errors)
+            processed += len(chunk)
+            chunk = []
+            if on_progress is not None:
+                on_progress(report())
+
+    if chunk:
+        await _stage_chunk(db, repository, job, chunk, errors)
+        processed += len(chunk)
+
+    await repository.merge(db, job)
+    final = report()
+    if on_progress is not None:
+        on_progress(final)
+    return final
+
+
+async def _stage_chunk(
+    db: AsyncSession,
+    repository: UserImportRepository,
+    job: UserImport,
+    chunk: list[tuple[int, dict[str, Any] | str]],
+    errors: list[UserImportError],
+) -> None:
+    failed = 0
+
+    def fail(line_no: int, error: str) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append(UserImportError(line=line_no, error=error))
+
+    valid: list[tuple[int, UserCreate]] = []
+    for line_no, record in chunk:
+        if isinstance(record, str):
+            fail(line_no, record)
+            continue
+        try:
+            valid.append((line_no, UserCreate.model_validate(record)))
+        except ValidationError as e:
+            fail(line_no, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+
+    hashed_passwords = await hash_passwords_async([user.password for _, user in valid])
+    rows: list[StagedRow] = []
+    for (line_no, user), hashed in zip(valid, hashed_passwords, strict=True):
+        if isinstance(hashed, BaseException):
+            fail(line_no, str(hashed))
+        else:
+            rows.append((line_no, user.email, user.full_name, hashed))
+
+    await repository.stage_chunk(db, job, rows, rows_read=len(chunk), rows_failed=failed)
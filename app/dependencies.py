@@ -1,66 +1,272 @@
-from collections.abc import AsyncIterator
+import asyncio
+import contextlib
+import functools
+import math
+import time
+from collections.abc import AsyncIterator, Callable
 from contextlib import asynccontextmanager
+from typing import Any
 
+from fastapi import Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.application.dto.user import UserRead
 from app.domain.repositories.user_repository import (
     UserRepository as UserRepositoryInterface,
 )
-from app.infrastructure.config import Settings
+from app.infrastructure.cache import CacheBackend, CachedUserRepository, InMemoryCache
+from app.infrastructure.change_feed import ChangeFeed, ChangeFeedListener
+from app.infrastructure.config import get_settings
 from app.infrastructure.database.connector import db_connector
+from app.infrastructure.database.repositories.user_import_repository import (
+    UserImportRepository,
+)
 from app.infrastructure.database.repositories.user_repository import (
     UserRepository as UserRepositoryImplementation,
 )
 from app.infrastructure.logging import logger
+from app.infrastructure.metrics import MetricFamily, MultiprocessCollector, metrics_registry
+
+# Read-your-writes: unix time until which this client's reads go to the primary
+STICKY_PRIMARY_COOKIE = "db_primary_until"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# USER_CACHE.BACKEND -> backend factory taking MAX_SIZE; a shared cache registers here
+USER_CACHE_BACKENDS: dict[str, Callable[[int], CacheBackend]] = {"memory": InMemoryCache}
 
 
 class DependencyContainer:
     """Container for dependency management."""
 
+    _cache_follower: asyncio.Task[None] | None = None
+
     def __init__(self):
-        self.settings = Settings.load_configs()
+        self.settings = get_settings()
         self.logger = logger
         self._db_connector = db_connector
+        self._user_cache = self._build_user_cache()
+        self._change_feed, self._change_feed_listener = self._build_change_feed()
+        self._metrics_collector = self._build_metrics_collector()
 
         # Repository factory
         self._repositories = self._build_repositories()
 
-    def _build_repositories(self):
-        return {"user_repository": UserRepositoryImplementation(logger=self.logger, settings=self.settings)}
+    def _build_user_cache(self) -> CacheBackend | None:
+        cache_settings = self.settings.USER_CACHE
+        if cache_settings is None or not cache_settings.ENABLED:
+            return None
+        try:
+            build = USER_CACHE_BACKENDS[cache_settings.BACKEND]
+        except KeyError:
+            raise ValueError(
+                f"Unknown USER_CACHE BACKEND {cache_settings.BACKEND!r}; expected one of {sorted(USER_CACHE_BACKENDS)}"
+            ) from None
+        return build(cache_settings.MAX_SIZE)
+
+    def _build_change_feed(self) -> tuple[ChangeFeed, ChangeFeedListener | None]:
+        feed_settings = self.settings.CHANGE_FEED
+        if feed_settings is None or not feed_settings.ENABLED:
+            return ChangeFeed(), None
+        feed = ChangeFeed(queue_size=feed_settings.SUBSCRIBER_QUEUE_SIZE)
+        listener = ChangeFeedListener(
+            self._db_connector.connect_raw,
+            feed,
+            channel=feed_settings.CHANNEL,
+            logger=self.logger,
+            heartbeat=feed_settings.HEARTBEAT_INTERVAL,
+            reconnect_max_delay=feed_settings.RECONNECT_MAX_DELAY,
+        )
+        return feed, listener
+
+    def _build_metrics_collector(self) -> MultiprocessCollector | None:
+        metrics_settings = self.settings.METRICS
+        if metrics_settings is None or not metrics_settings.MULTIPROCESS_DIR:
+            return None
+        return MultiprocessCollector(metrics_registry, metrics_settings.MULTIPROCESS_DIR)
+
+    def _build_repositories(self) -> dict[str, Any]:
+        user_repository_impl = UserRepositoryImplementation(logger=self.logger, settings=self.settings)
+        user_repository: UserRepositoryInterface = user_repository_impl
+        cache_settings = self.settings.USER_CACHE
+        if self._user_cache is not None and cache_settings is not None:
+            user_repository = CachedUserRepository(
+                user_repository_impl,
+                self._user_cache,
+                ttl=cache_settings.TTL,
+                negative_ttl=cache_settings.NEGATIVE_TTL,
+            )
+        return {
+            "user_repository": user_repository,
+            "user_repository_impl": user_repository_impl,
+            "user_import_repository": UserImportRepository(logger=self.logger, settings=self.settings),
+        }
 
     @asynccontextmanager
-    async def get_db(self) -> AsyncIterator[AsyncSession]:
-        """Dependency that provides an async database session."""
-        session = self._db_connector.get_session()
+    async def get_db(self, readonly: bool = False) -> AsyncIterator[AsyncSession]:
+        """Dependency that provides an async database session (on a read replica if ``readonly``)."""
+        session = await self._db_connector.open_session(readonly=readonly)
         try:
             yield session
         except Exception as e:
             await session.rollback()
-            self.logger.error(f"Database error: {e}")
+            self.logger.error("Database error: %s", e)
             raise
         finally:
             await session.close()
 
+    @property
+    def db_connector(self):
+        return self._db_connector
+
+    @property
+    def user_cache(self) -> CacheBackend | None:
+        return self._user_cache
+
+    @property
+    def change_feed(self) -> ChangeFeed:
+        return self._change_feed
+
+    @property
+    def change_feed_listener(self) -> ChangeFeedListener | None:
+        return self._change_feed_listener
+
+    async def warm_up_database(self) -> None:
+        """Open and prime WARMUP_CONNECTIONS pooled connections before serving traffic."""
+        database = self.settings.DATABASE
+        if database is None or database.WARMUP_CONNECTIONS <= 0:
+            return
+        await self._db_connector.warm_up(
+            database.WARMUP_CONNECTIONS,
+            primers=[functools.partial(self._repositories["user_repository_impl"].prime_statements, views=[UserRead])],
+        )
+
+    async def drain_database(self) -> None:
+        """Wait up to DRAIN_TIMEOUT for in-flight sessions, then close every connection."""
+        database = self.settings.DATABASE
+        await self._db_connector.drain(database.DRAIN_TIMEOUT if database is not None else 0)
+
+    async def start_change_feed(self) -> None:
+        """Start listening for user changes and let the user cache follow them."""
+        if self._change_feed_listener is None:
+            return
+        user_repository = self._repositories["user_repository"]
+        if isinstance(user_repository, CachedUserRepository):
+            subscription = self._change_feed.subscribe()
+            self._cache_follower = asyncio.create_task(user_repository.follow(subscription))
+        self._change_feed_listener.start()
+
+    async def stop_change_feed(self) -> None:
+        if self._change_feed_listener is not None:
+            await self._change_feed_listener.stop()
+        if self._cache_follower is not None:
+            self._cache_follower.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._cache_follower
+            self._cache_follower = None
+
+    def collect_metrics(self) -> list[MetricFamily]:
+        """This worker's metrics, or every worker's when MULTIPROCESS_DIR is set."""
+        if self._metrics_collector is None:
+            return metrics_registry.collect()
+        return self._metrics_collector.collect()
+
+    def start_metrics(self) -> None:
+        """Periodically share this worker's metrics with the other workers."""
+        metrics_settings = self.settings.METRICS
+        if self._metrics_collector is not None and metrics_settings is not None:
+            self._metrics_collector.start(metrics_settings.FLUSH_INTERVAL)
+
+    async def stop_metrics(self) -> None:
+        if self._metrics_collector is not None:
+            await self._metrics_collector.stop()
+
+    def mark_primary_sticky(self, response: Response) -> None:
+        """After a write, pin the client's reads to the primary for STICKY_PRIMARY_SECONDS."""
+        routing = self.settings.READ_ROUTING
+        if routing is None or routing.STICKY_PRIMARY_SECONDS <= 0 or not self.settings.DATABASE_REPLICAS:
+            return
+        response.set_cookie(
+            STICKY_PRIMARY_COOKIE,
+            f"{time.time() + routing.STICKY_PRIMARY_SECONDS:.3f}",
+            max_age=math.ceil(routing.STICKY_PRIMARY_SECONDS),
+            httponly=True,
+            samesite="lax",
+        )
+
+    def reads_from_primary(self, request: Request) -> bool:
+        """Whether the client wrote recently enough that replicas may not have its write yet."""
+        try:
+            return float(request.cookies.get(STICKY_PRIMARY_COOKIE, "0")) > time.time()
+        except ValueError:
+            return False
+
     def get_user_repository(self) -> UserRepositoryInterface:
         """Dependency that provides the configured user repository instance."""
         return self._repositories["user_repository"]
 
+    def get_user_import_repository(self) -> UserImportRepository:
+        """Dependency that provides the bulk user import repository."""
+        return self._repositories["user_import_repository"]
+
 
 # FastAPI dependencies
-async def get_db():
-    """Dependency that provides an async database session."""
+async def get_db(request: Request, response: Response):
+    """Dependency that provides an async database session on the primary."""
+    if request.method not in SAFE_METHODS:
+        container.mark_primary_sticky(response)
     async with container.get_db() as session:
         yield session
 
 
+async def get_read_db(request: Request):
+    """
+    Dependency that provides a session for read-only routes.
+
+    Uses a healthy read replica when configured, unless the client wrote
+    within the last STICKY_PRIMARY_SECONDS; falls back to the primary.
+    """
+    async with container.get_db(readonly=not container.reads_from_primary(request)) as session:
+        yield session
+
+
+def get_session_factory():
+    """Dependency that provides sessions on the primary for work that outlives the request."""
+    return container.get_db
+
+
 def get_logger():
     """Dependency that provides the configured logger instance."""
     return container.logger
 
 
+def get_db_connector():
+    """Dependency that provides the database connector."""
+    return container.db_connector
+
+
+def get_user_cache() -> CacheBackend | None:
+    """Dependency that provides the user cache backend (None when disabled)."""
+    return container.user_cache
+
+
+def get_change_feed() -> ChangeFeed:
+    """Dependency that provides the in-process user change feed."""
+    return container.change_feed
+
+
+def get_change_feed_listener() -> ChangeFeedListener | None:
+    """Dependency that provides the change feed listener (None when disabled)."""
+    return container.change_feed_listener
+
+
 def get_user_repository() -> UserRepositoryInterface:
     """Dependency that provides the configured user repository instance."""
     return container.get_user_repository()
 
 
+def get_user_import_repository() -> UserImportRepository:
+    """Dependency that provides the bulk user import repository."""
+    return container.get_user_import_repository()
+
+
 container = DependencyContainer()
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from typing import Any, TypeVar
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -16,6 +17,11 @@ class CRUDRepository[T](ABC):
         """Create a new record."""
         pass
 
+    @abstractmethod
+    async def create_many(self, db: AsyncSession, objs: list[T]) -> list[T | None]:
+        """Create several records in one statement; ``None`` marks records skipped as duplicates."""
+        pass
+
     @abstractmethod
     async def read(self, db: AsyncSession, id: Any) -> T | None:
         """Read a record by id."""
@@ -27,11 +33,28 @@ class CRUDRepository[T](ABC):
         pass
 
     @abstractmethod
-    async def update(self, db: AsyncSession, id: Any, obj: T) -> T:
-        """Update a record."""
+    async def read_page(
+        self,
+        db: AsyncSession,
+        *,
+        limit: int,
+        after: Any | None = None,
+        **filters: Any,
+    ) -> list[T]:
+        """Read up to ``limit`` records in primary key order, starting after the ``after`` key."""
+        pass
+
+    @abstractmethod
+    def stream(self, db: AsyncSession, *, batch_size: int = 1000, **filters: Any) -> AsyncIterator[list[T]]:
+        """Iterate over all records in primary key order, ``batch_size`` at a time."""
+        pass
+
+    @abstractmethod
+    async def update(self, db: AsyncSession, id: Any, values: dict[str, Any]) -> T | None:
+        """Update the given columns of a record; ``None`` if it does not exist."""
         pass
 
     @abstractmethod
-    async def delete(self, db: AsyncSession, id: Any) -> None:
-        """Delete a record by id."""
+    async def delete(self, db: AsyncSession, id: Any) -> bool:
+        """Delete a record by id; ``False`` if it did not exist."""
         pass
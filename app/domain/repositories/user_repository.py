@@ -1,17 +1,38 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from typing import Any
 
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities.user import UserEntity
 
 
+def to_view[ViewT: BaseModel](user: UserEntity, view: type[ViewT], validate: bool = False) -> ViewT:
+    """The ``view`` fields of ``user``; unvalidated unless ``validate`` (entities are already valid)."""
+    values = {name: getattr(user, name) for name in view.model_fields}
+    return view.model_validate(values) if validate else view.model_construct(**values)
+
+
 class UserRepository(ABC):
-    """Abstract interface for user repository operations."""
+    """
+    Abstract interface for user repository operations.
+
+    The ``*_view`` methods return read models (``view``: a model whose fields
+    are named after UserEntity's) instead of entities, and the ``*_exists``
+    checks only a boolean. Their defaults go through the entity methods;
+    database implementations select only the view's columns, or none.
+    """
 
     @abstractmethod
     async def create_user(self, db: AsyncSession, user: UserEntity) -> UserEntity:
         pass
 
+    @abstractmethod
+    async def create_users(self, db: AsyncSession, users: list[UserEntity]) -> list[UserEntity | None]:
+        """Create users in one statement; ``None`` marks users whose email is already taken."""
+        pass
+
     @abstractmethod
     async def get_user_by_email(
         self,
@@ -28,15 +49,94 @@ class UserRepository(ABC):
     ) -> UserEntity | None:
         pass
 
+    @abstractmethod
+    async def list_users(
+        self,
+        db: AsyncSession,
+        *,
+        limit: int,
+        after_id: int | None = None,
+    ) -> list[UserEntity]:
+        pass
+
+    @abstractmethod
+    def stream_users(self, db: AsyncSession, *, batch_size: int = 1000) -> AsyncIterator[list[UserEntity]]:
+        pass
+
     @abstractmethod
     async def update_user(
         self,
         db: AsyncSession,
         user_id: int,
-        user: UserEntity,
-    ) -> UserEntity:
+        changes: dict[str, Any],
+    ) -> UserEntity | None:
+        """Apply ``changes`` (entity field names) in one statement; ``None`` if the user does not exist."""
         pass
 
     @abstractmethod
-    async def delete_user(self, db: AsyncSession, user_id: int) -> None:
+    async def delete_user(self, db: AsyncSession, user_id: int) -> bool:
+        """Delete a user in one statement; ``False`` if the user does not exist."""
         pass
+
+    async def get_user_view[ViewT: BaseModel](
+        self,
+        db: AsyncSession,
+        user_id: int,
+        view: type[ViewT],
+        *,
+        validate: bool = False,
+    ) -> ViewT | None:
+        user = await self.get_user_by_id(db, user_id)
+        return None if user is None else to_view(user, view, validate)
+
+    async def get_user_view_by_email[ViewT: BaseModel](
+        self,
+        db: AsyncSession,
+        email: str,
+        view: type[ViewT],
+        *,
+        validate: bool = False,
+    ) -> ViewT | None:
+        user = await self.get_user_by_email(db, email)
+        return None if user is None else to_view(user, view, validate)
+
+    async def list_user_views[ViewT: BaseModel](
+        self,
+        db: AsyncSession,
+        view: type[ViewT],
+        *,
+        limit: int,
+        after_id: int | None = None,
+        validate: bool = False,
+    ) -> list[ViewT]:
+        users = await self.list_users(db, limit=limit, after_id=after_id)
+        return [to_view(user, view, validate) for user in users]
+
+    async def stream_user_views[ViewT: BaseModel](
+        self,
+        db: AsyncSession,
+        view: type[ViewT],
+        *,
+        batch_size: int = 1000,
+        validate: bool = False,
+    ) -> AsyncIterator[list[ViewT]]:
+        async for users in self.stream_users(db, batch_size=batch_size):
+            yield [to_view(user, view, validate) for user in users]
+
+    async def update_user_view[ViewT: BaseModel](
+        self,
+        db: AsyncSession,
+        user_id: int,
+        changes: dict[str, Any],
+        view: type[ViewT],
+        *,
+        validate: bool = False,
+    ) -> ViewT | None:
+        user = await self.update_user(db, user_id, changes)
+        return None if user is None else to_view(user, view, validate)
+
+    async def user_exists(self, db: AsyncSession, user_id: int) -> bool:
+        return await self.get_user_by_id(db, user_id) is not None
+
+    async def email_exists(self, db: AsyncSession, email: str) -> bool:
+        return await self.get_user_by_email(db, email) is not None
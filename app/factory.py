@@ -1,25 +1,60 @@
-import logging
-from contextlib import asynccontextmanager
-from typing import Annotated
+import time
+from collections.abc import Iterator
+from contextlib import asynccontextmanager, contextmanager
 
-from fastapi import Depends, FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 
+from app.adapters.api.middleware import (
+    AccessLogMiddleware,
+    AccessLogSampler,
+    MetricsMiddleware,
+    QueryProfilerMiddleware,
+    TrafficCaptureMiddleware,
+)
 from app.adapters.api.v1.routers import api_v1_router
-from app.dependencies import get_logger
+from app.dependencies import container, get_logger
 from app.infrastructure.config import get_settings
-from app.infrastructure.database.connector import db_connector
+from app.infrastructure.database.connector import DatabaseDrainingError, db_connector
+from app.infrastructure.metrics import CONTENT_TYPE, metrics_registry, render
+from app.infrastructure.security import get_hashing_pool
+from app.infrastructure.traffic_capture import CaptureWriter
 
 
 def create_app() -> FastAPI:
     """Create the FastAPI application."""
     settings = get_settings()
     logger = get_logger()
+    capture = settings.TRAFFIC_CAPTURE
+    capture_writer = CaptureWriter.from_settings(capture) if capture is not None and capture.ENABLED else None
 
     @asynccontextmanager
     async def lifespan(_: FastAPI):
-        await init_db()
+        with timed(logger, "Startup"):
+            with timed(logger, "Schema version check"):
+                await db_connector.verify_schema_version()
+            with timed(logger, "Connection warm-up"):
+                await container.warm_up_database()
+            await container.start_change_feed()
+            container.start_metrics()
+            if settings.READ_ROUTING is not None:
+                db_connector.start_replica_monitor(settings.READ_ROUTING.HEALTH_CHECK_INTERVAL)
         yield
+        with timed(logger, "Shutdown"):
+            await db_connector.stop_replica_monitor()
+            with timed(logger, "Change feed stop"):
+                await container.stop_change_feed()
+            with timed(logger, "Connection drain"):
+                await container.drain_database()
+            get_hashing_pool().shutdown()
+            await container.stop_metrics()
+            if capture_writer is not None:
+                capture_writer.close()
+                stats = capture_writer.stats()
+                logger.info(
+                    "Captured %s requests to %s (%s dropped)", stats["written"], stats["path"], stats["dropped"]
+                )
 
     app = FastAPI(
         title=settings.APP_NAME,
@@ -38,11 +73,48 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    metrics = settings.METRICS
+    metrics_enabled = metrics is not None and metrics.ENABLED
+    if metrics_enabled:
+        app.add_middleware(MetricsMiddleware, registry=metrics_registry)
+
+    if capture is not None and capture_writer is not None:
+        app.add_middleware(
+            TrafficCaptureMiddleware,
+            writer=capture_writer,
+            sample_rate=capture.SAMPLE_RATE,
+            max_body_bytes=capture.MAX_BODY_BYTES,
+            exclude_paths=capture.EXCLUDE_PATHS,
+        )
+
+    access_log = settings.ACCESS_LOG
+    if access_log is not None and access_log.ENABLED:
+        # Added late so it is outer and times the whole stack
+        app.add_middleware(
+            AccessLogMiddleware,
+            logger=logger,
+            sampler=AccessLogSampler.from_settings(access_log),
+            request_id_header=access_log.REQUEST_ID_HEADER,
+        )
+
+    profiler = settings.QUERY_PROFILER
+    if profiler is not None and profiler.ENABLED:
+        # Outermost: its query timer is the one the access log reports
+        app.add_middleware(
+            QueryProfilerMiddleware,
+            keep_slowest=profiler.SLOWEST_STATEMENTS,
+            server_timing=profiler.SERVER_TIMING,
+        )
+
     app.include_router(api_v1_router, prefix="/api/v1")
 
+    @app.exception_handler(DatabaseDrainingError)
+    async def database_draining(_: Request, exc: DatabaseDrainingError):
+        # Shutting down: let the client retry against another instance
+        return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
     @app.get("/welcome")
-    async def welcome(logger: Annotated[logging.Logger, Depends(get_logger)]):
-        logger.debug("Welcome endpoint accessed")
+    async def welcome():
         return {
             "message": f"Welcome to {settings.APP_NAME}",
             "log_level": settings.LOG_LEVEL,
@@ -52,14 +124,22 @@ def create_app() -> FastAPI:
         }
 
     @app.get("/ping")
-    async def ping(logger: Annotated[logging.Logger, Depends(get_logger)]):
-        logger.debug("Ping endpoint accessed")
+    async def ping():
         return {"message": "pong"}
 
+    if metrics_enabled:
+        # Sync so that merging the other workers' files runs in the threadpool
+        @app.get("/metrics", include_in_schema=False)
+        def metrics_endpoint():
+            return Response(render(container.collect_metrics()), media_type=CONTENT_TYPE)
+
     logger.debug("Application initialized")
     return app
 
 
-async def init_db():
-    """Initialize database tables and schema."""
-    await db_connector.create_database()
+@contextmanager
+def timed(logger, step: str) -> Iterator[None]:
+    """Log how long a lifespan step took."""
+    start = time.perf_counter()
+    yield
+    logger.info("%s finished in %.1f ms", step, (time.perf_counter() - start) * 1000)
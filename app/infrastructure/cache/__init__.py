@@ -0,0 +1,5 @@
+from app.infrastructure.cache.backend import MISSING, CacheBackend, CacheStats
+from app.infrastructure.cache.memory import InMemoryCache
+from app.infrastructure.cache.user_repository import CachedUserRepository
+
+__all__ = ["MISSING", "CacheBackend", "CacheStats", "CachedUserRepository", "InMemoryCache"]
@@ -0,0 +1,61 @@
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import Any, Final
+
+
+class _Missing:
+    """Sentinel type for keys that are not cached (distinct from a cached ``None``)."""
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING: Final = _Missing()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class CacheBackend(ABC):
+    """
+    Key/value store behind the read-through caches.
+
+    Values may be ``None`` (negative entries), so lookups return ``MISSING``
+    for absent or expired keys. Implement this for a shared cache (e.g. Redis)
+    to replace the in-process one.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Any:
+        """Cached value, or ``MISSING``."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store ``value`` for ``ttl`` seconds."""
+        pass
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Invalidate keys; unknown keys are ignored."""
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Drop every entry."""
+        pass
+
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        """Hit/miss/eviction counters since start."""
+        pass
@@ -0,0 +1,58 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from app.infrastructure.cache.backend import MISSING, CacheBackend, CacheStats
+
+
+class InMemoryCache(CacheBackend):
+    """
+    Size-bounded LRU with per-entry TTL, local to one process.
+
+    Every operation is O(1) and never awaits, so it is safe to share between
+    the tasks of one event loop without a lock.
+    """
+
+    def __init__(self, max_size: int, clock: Callable[[], float] = time.monotonic):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._stats = CacheStats()
+
+    async def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return MISSING
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            if self._entries.pop(key, None) is not None:
+                self._stats.invalidations += 1
+
+    async def clear(self) -> None:
+        self._stats.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        self._stats.size = len(self._entries)
+        return CacheStats(**self._stats.as_dict())
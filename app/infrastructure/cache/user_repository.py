@@ -0,0 +1,199 @@
+from collections.abc import AsyncIterator
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities.user import UserEntity
+from app.domain.repositories.user_repository import (
+    UserRepository as UserRepositoryInterface,
+)
+from app.infrastructure.cache.backend import MISSING, CacheBackend
+from app.infrastructure.change_feed import Subscription, UserChange
+from app.infrastructure.database.repositories.user_repository import UserRepository
+from app.infrastructure.security import email_blind_index
+
+
+class CachedUserRepository(UserRepositoryInterface):
+    """
+    Read-through cache in front of a UserRepository.
+
+    ``user:id:<id>`` holds the entity (or ``None`` for a known miss) and
+    ``user:email:<blind index>`` holds only the id, so an email key can never
+    serve a user whose email has since changed: the entity it resolves to is
+    checked against the email before being returned. Writes go to the
+    database first and then invalidate or refresh the affected keys.
+
+    Single-user views are built from the cached entity (the interface
+    defaults); lists and streams, which aren't cached, use the database's
+    projections. Existence checks answer from a cached entry when there is
+    one and otherwise probe the database without filling the cache.
+
+    Rows read through a replica session may predate a write whose
+    invalidation already happened, so they are only cached for ``negative_ttl``.
+    """
+
+    def __init__(self, repository: UserRepository, backend: CacheBackend, ttl: float, negative_ttl: float):
+        self.repository = repository
+        self.backend = backend
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+    @property
+    def model(self):
+        return self.repository.model
+
+    @staticmethod
+    def _id_key(user_id: int) -> str:
+        return f"user:id:{user_id}"
+
+    @staticmethod
+    def _email_key(email_hash: str) -> str:
+        return f"user:email:{email_hash}"
+
+    def _fill_ttl(self, db: AsyncSession) -> float:
+        return self.negative_ttl if db.info.get("replica") is not None else self.ttl
+
+    async def _remember(self, user: UserEntity, ttl: float | None = None) -> None:
+        if user.id is None:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        await self.backend.set(self._id_key(user.id), user.model_copy(), ttl)
+        await self.backend.set(self._email_key(email_blind_index(user.email)), user.id, ttl)
+
+    async def get_user_by_id(self, db: AsyncSession, user_id: int) -> UserEntity | None:
+        cached = await self.backend.get(self._id_key(user_id))
+        if cached is not MISSING:
+            return None if cached is None else cached.model_copy()
+
+        user = await self.repository.get_user_by_id(db, user_id)
+        if user is None:
+            await self.backend.set(self._id_key(user_id), None, self.negative_ttl)
+        else:
+            await self._remember(user, self._fill_ttl(db))
+        return user
+
+    async def get_user_by_email(self, db: AsyncSession, email: str) -> UserEntity | None:
+        email_hash = email_blind_index(email)
+        email_key = self._email_key(email_hash)
+        cached_id = await self.backend.get(email_key)
+        if cached_id is None:
+            return None
+        if cached_id is not MISSING:
+            user = await self.get_user_by_id(db, cached_id)
+            if user is not None and email_blind_index(user.email) == email_hash:
+                return user
+
+        user = await self.repository.get_user_by_email(db, email)
+        if user is None:
+            await self.backend.set(email_key, None, self.negative_ttl)
+        else:
+            await self._remember(user, self._fill_ttl(db))
+        return user
+
+    async def create_user(self, db: AsyncSession, user: UserEntity) -> UserEntity:
+        created = await self.repository.create_user(db, user)
+        await self._remember(created)
+        return created
+
+    async def create_users(self, db: AsyncSession, users: list[UserEntity]) -> list[UserEntity | None]:
+        created = await self.repository.create_users(db, users)
+        # Drop negative entries for every submitted email, created or not.
+        await self.backend.delete(*{self._email_key(email_blind_index(user.email)) for user in users})
+        return created
+
+    async def list_users(self, db: AsyncSession, *, limit: int, after_id: int | None = None) -> list[UserEntity]:
+        return await self.repository.list_users(db, limit=limit, after_id=after_id)
+
+    def stream_users(self, db: AsyncSession, *, batch_size: int = 1000) -> AsyncIterator[list[UserEntity]]:
+        return self.repository.stream_users(db, batch_size=batch_size)
+
+    async def list_user_views[ViewT: BaseModel](
+        self,
+        db: AsyncSession,
+        view: type[ViewT],
+        *,
+        limit: int,
+        after_id: int | None = None,
+        validate: bool = False,
+    ) -> list[ViewT]:
+        return await self.repository.list_user_views(db, view, limit=limit, after_id=after_id, validate=validate)
+
+    def stream_user_views[ViewT: BaseModel](
+        self,
+        db: AsyncSession,
+        view: type[ViewT],
+        *,
+        batch_size: int = 1000,
+        validate: bool = False,
+    ) -> AsyncIterator[list[ViewT]]:
+        return self.repository.stream_user_views(db, view, batch_size=batch_size, validate=validate)
+
+    async def update_user(self, db: AsyncSession, user_id: int, changes: dict[str, Any]) -> UserEntity | None:
+        try:
+            updated = await self.repository.update_user(db, user_id, changes)
+        finally:
+            await self.backend.delete(self._id_key(user_id))
+        if updated is not None:
+            await self._remember(updated)
+        return updated
+
+    async def update_user_view[ViewT: BaseModel](
+        self,
+        db: AsyncSession,
+        user_id: int,
+        changes: dict[str, Any],
+        view: type[ViewT],
+        *,
+        validate: bool = False,
+    ) -> ViewT | None:
+        # The view may lack fields of the entity, so entries are dropped instead of refreshed:
+        # the user's, and a known miss for the new email
+        keys = [self._id_key(user_id)]
+        if changes.get("email") is not None:
+            keys.append(self._email_key(email_blind_index(changes["email"])))
+        try:
+            return await self.repository.update_user_view(db, user_id, changes, view, validate=validate)
+        finally:
+            await self.backend.delete(*keys)
+
+    async def user_exists(self, db: AsyncSession, user_id: int) -> bool:
+        cached = await self.backend.get(self._id_key(user_id))
+        if cached is not MISSING:
+            return cached is not None
+        return await self.repository.user_exists(db, user_id)
+
+    async def email_exists(self, db: AsyncSession, email: str) -> bool:
+        # A cached id may belong to a user whose email has since changed; only a known miss is trusted
+        if await self.backend.get(self._email_key(email_blind_index(email))) is None:
+            return False
+        return await self.repository.email_exists(db, email)
+
+    async def delete_user(self, db: AsyncSession, user_id: int) -> bool:
+        try:
+            return await self.repository.delete_user(db, user_id)
+        finally:
+            await self.backend.delete(self._id_key(user_id))
+
+    async def invalidate_user(self, user_id: int, email: str | None = None) -> None:
+        """Drop a user's entries after a change made outside this repository."""
+        keys = [self._id_key(user_id)]
+        if email is not None:
+            keys.append(self._email_key(email_blind_index(email)))
+        await self.backend.delete(*keys)
+
+    async def apply_change(self, change: UserChange) -> None:
+        """Invalidate what a change-feed event touched; ``resync`` drops everything."""
+        if change.op == "resync":
+            await self.backend.clear()
+            return
+        keys = [self._email_key(email_hash) for email_hash in change.email_hashes]
+        if change.id is not None:
+            keys.append(self._id_key(change.id))
+        await self.backend.delete(*keys)
+
+    async def follow(self, subscription: Subscription) -> None:
+        """Apply change-feed events until cancelled, so writes by other workers are seen."""
+        with subscription:
+            async for change in subscription:
+                await self.apply_change(change)
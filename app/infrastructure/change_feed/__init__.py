@@ -0,0 +1,12 @@
+from app.infrastructure.change_feed.events import UserChange
+from app.infrastructure.change_feed.feed import ChangeFeed, Subscription
+from app.infrastructure.change_feed.listener import ChangeFeedListener
+from app.infrastructure.change_feed.triggers import install_user_change_trigger
+
+__all__ = [
+    "ChangeFeed",
+    "ChangeFeedListener",
+    "Subscription",
+    "UserChange",
+    "install_user_change_trigger",
+]
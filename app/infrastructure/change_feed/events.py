@@ -0,0 +1,58 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Literal, Self
+
+type ChangeOp = Literal["insert", "update", "delete", "resync"]
+
+ROW_OPS = ("insert", "update", "delete")
+
+
+@dataclass(frozen=True)
+class UserChange:
+    """
+    One changed row of the users table, as published by the NOTIFY triggers.
+
+    ``resync`` tells a subscriber that events may have been lost or were
+    never sent (listener reconnect, subscriber overflow, a statement that
+    changed too many rows to list) and any derived state must be rebuilt
+    from the database.
+    """
+
+    op: ChangeOp
+    id: int | None = None
+    # Blind indexes of the affected emails (old and new on update)
+    email_hashes: tuple[str, ...] = ()
+    reason: str | None = None
+
+    @classmethod
+    def from_payload(cls, payload: str) -> list[Self]:
+        """
+        The changes in one statement's NOTIFY payload: one per row, or a single resync.
+
+        Raises ValueError when the payload is malformed.
+        """
+        data = json.loads(payload)
+        if not isinstance(data, dict):
+            raise ValueError(f"invalid user change payload: {payload!r}")
+        rows = data.get("rows")
+        if data.get("op") == "resync" and isinstance(rows, int):
+            return [cls.resync(f"{rows} rows changed in one statement")]
+        if (
+            data.get("op") not in ROW_OPS
+            or not isinstance(rows, list)
+            or not all(isinstance(row, list) and row and isinstance(row[0], int) for row in rows)
+        ):
+            raise ValueError(f"invalid user change payload: {payload!r}")
+        return [
+            cls(op=data["op"], id=row[0], email_hashes=tuple(h for h in row[1:] if isinstance(h, str))) for row in rows
+        ]
+
+    @classmethod
+    def resync(cls, reason: str) -> Self:
+        return cls(op="resync", reason=reason)
+
+    def public(self) -> dict[str, Any]:
+        """Fields safe to expose to API clients."""
+        if self.op == "resync":
+            return {"op": self.op, "reason": self.reason}
+        return {"op": self.op, "id": self.id}
@@ -0,0 +1,108 @@
+import asyncio
+from collections.abc import Callable
+from typing import Any, Self
+
+from app.infrastructure.change_feed.events import UserChange
+from app.infrastructure.logging import logger
+
+
+class Subscription:
+    """
+    Bounded queue of changes for one consumer.
+
+    A consumer that falls ``queue_size`` events behind loses its backlog and
+    receives a single ``resync`` event instead, so a slow consumer costs the
+    publisher nothing and memory stays bounded. Further events are dropped
+    until that resync has been consumed: whatever the consumer reloads then
+    already reflects them.
+    """
+
+    def __init__(self, queue_size: int, on_close: Callable[[], None] | None = None):
+        self._on_close = on_close
+        self._queue: asyncio.Queue[UserChange] = asyncio.Queue(maxsize=queue_size)
+        self._resync_pending = False
+        self.overflows = 0
+
+    def offer(self, change: UserChange) -> None:
+        """Enqueue without blocking (called by the feed)."""
+        if self._resync_pending:
+            return
+        try:
+            self._queue.put_nowait(change)
+        except asyncio.QueueFull:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(UserChange.resync("subscriber overflow"))
+            self._resync_pending = True
+            self.overflows += 1
+
+    async def get(self) -> UserChange:
+        change = await self._queue.get()
+        if change.op == "resync":
+            self._resync_pending = False
+        return change
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> UserChange:
+        return await self.get()
+
+    def close(self) -> None:
+        if self._on_close is not None:
+            self._on_close()
+            self._on_close = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class ChangeFeed:
+    """In-process fan-out of user changes to any number of subscribers."""
+
+    def __init__(self, queue_size: int = 1000):
+        self.queue_size = queue_size
+        self._subscribers: set[Subscription] = set()
+        self.published = 0
+        self.invalid = 0
+        self._closed_overflows = 0
+
+    def subscribe(self, queue_size: int | None = None) -> Subscription:
+        subscription = Subscription(
+            queue_size or self.queue_size,
+            on_close=lambda: self._unsubscribe(subscription),
+        )
+        self._subscribers.add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        if subscription in self._subscribers:
+            self._subscribers.discard(subscription)
+            self._closed_overflows += subscription.overflows
+
+    def publish(self, change: UserChange) -> None:
+        self.published += 1
+        for subscription in tuple(self._subscribers):
+            subscription.offer(change)
+
+    def publish_payload(self, payload: str) -> None:
+        """Publish a raw NOTIFY payload, skipping (and counting) malformed ones."""
+        try:
+            changes = UserChange.from_payload(payload)
+        except ValueError as e:
+            self.invalid += 1
+            logger.warning("Ignoring change feed payload: %s", e)
+            return
+        for change in changes:
+            self.publish(change)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "invalid": self.invalid,
+            "overflows": self._closed_overflows + sum(s.overflows for s in self._subscribers),
+        }
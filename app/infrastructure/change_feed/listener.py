@@ -0,0 +1,89 @@
+import asyncio
+import contextlib
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from psycopg import AsyncConnection, sql
+
+from app.infrastructure.change_feed.events import UserChange
+from app.infrastructure.change_feed.feed import ChangeFeed
+from app.infrastructure.logging.base_logger import BaseLogger
+
+type Connect = Callable[[], Awaitable[AsyncConnection]]
+
+INITIAL_RECONNECT_DELAY = 0.5
+
+
+class ChangeFeedListener:
+    """
+    Long-lived LISTEN on a dedicated connection, publishing into a ChangeFeed.
+
+    Postgres only delivers notifications to connected listeners, so every
+    reconnect publishes ``resync``: subscribers must assume they missed events.
+    Between notifications the connection is probed every ``heartbeat`` seconds
+    so a silently dropped connection is noticed instead of waited on forever.
+    """
+
+    def __init__(
+        self,
+        connect: Connect,
+        feed: ChangeFeed,
+        channel: str,
+        logger: BaseLogger,
+        heartbeat: float = 15.0,
+        reconnect_max_delay: float = 30.0,
+    ):
+        self._connect = connect
+        self.feed = feed
+        self.channel = channel
+        self.logger = logger
+        self.heartbeat = heartbeat
+        self.reconnect_max_delay = reconnect_max_delay
+        self.connected = False
+        self.reconnects = 0
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="user-change-feed")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        self.connected = False
+
+    async def _run(self) -> None:
+        delay = INITIAL_RECONNECT_DELAY
+        listened_before = False
+        while True:
+            try:
+                async with await self._connect() as conn:
+                    await conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+                    self.connected = True
+                    if listened_before:
+                        self.reconnects += 1
+                        self.feed.publish(UserChange.resync("listener reconnected"))
+                    listened_before = True
+                    delay = INITIAL_RECONNECT_DELAY
+                    self.logger.info("Listening for user changes on channel %s", self.channel)
+                    await self._listen(conn)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning("User change feed disconnected (%s); reconnecting in %.1fs", e, delay)
+            self.connected = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.reconnect_max_delay)
+
+    async def _listen(self, conn: AsyncConnection) -> None:
+        while True:
+            async for notify in conn.notifies(timeout=self.heartbeat):
+                self.feed.publish_payload(notify.payload)
+            # Raises if the server or the network went away while we were idle.
+            await conn.execute("SELECT 1")
+
+    def stats(self) -> dict[str, Any]:
+        return {"connected": self.connected, "reconnects": self.reconnects, **self.feed.stats()}
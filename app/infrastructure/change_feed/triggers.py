@@ -0,0 +1,77 @@
+from sqlalchemy import Connection, Table, text
+
+FUNCTION_NAME = "notify_user_change"
+# One statement trigger per operation: each references only the transition tables it has
+TRIGGERS = {
+    "INSERT": ("users_notify_insert", "NEW TABLE AS new_rows"),
+    "UPDATE": ("users_notify_update", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+    "DELETE": ("users_notify_delete", "OLD TABLE AS old_rows"),
+}
+# The row trigger of earlier builds; dropped so changes aren't published twice
+ROW_TRIGGER_NAME = "users_notify_change"
+# An update row is up to ~150 payload bytes (id and two blind indexes); NOTIFY payloads stop at 8000
+MAX_NOTIFY_ROWS = 40
+
+
+def install_user_change_trigger(conn: Connection, table: Table, channel: str) -> None:
+    """
+    (Re)create the statement triggers that NOTIFY ``channel`` of changes to ``table``.
+
+    Each INSERT, UPDATE or DELETE sends one notification for all the rows it
+    changed: ``{"op", "rows": [[id, email_hash...], ...]}`` with the email
+    blind indexes (old and new on update), never plaintext or ciphertext.
+    A statement changing more than MAX_NOTIFY_ROWS rows (an import merge, a
+    backfill) sends a single ``{"op": "resync", "rows": n}`` instead, so
+    bulk writes neither fill the notify queue nor outgrow the payload limit.
+    Notifications are sent at commit, so rolled-back writes publish nothing.
+    Idempotent, so it runs on every startup.
+    """
+    preparer = conn.dialect.identifier_preparer
+    table_name = preparer.format_table(table)
+    schema_prefix = f"{preparer.quote_schema(table.schema)}." if table.schema else ""
+    function_name = f"{schema_prefix}{preparer.quote(FUNCTION_NAME)}"
+    channel_literal = "'" + channel.replace("'", "''") + "'"
+
+    conn.execute(
+        text(f"""
+        CREATE OR REPLACE FUNCTION {function_name}() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            changed bigint;
+            changed_rows json;
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                SELECT count(*) INTO changed FROM new_rows;
+            ELSE
+                SELECT count(*) INTO changed FROM old_rows;
+            END IF;
+            IF changed = 0 THEN
+                RETURN NULL;
+            END IF;
+            IF changed > {MAX_NOTIFY_ROWS} THEN
+                PERFORM pg_notify({channel_literal}, json_build_object('op', 'resync', 'rows', changed)::text);
+                RETURN NULL;
+            END IF;
+            IF TG_OP = 'DELETE' THEN
+                SELECT json_agg(json_build_array(o.id, o.email_hash)) INTO changed_rows FROM old_rows o;
+            ELSIF TG_OP = 'UPDATE' THEN
+                SELECT json_agg(json_build_array(n.id, o.email_hash, n.email_hash)) INTO changed_rows
+                FROM new_rows n JOIN old_rows o ON o.id = n.id;
+            ELSE
+                SELECT json_agg(json_build_array(n.id, n.email_hash)) INTO changed_rows FROM new_rows n;
+            END IF;
+            PERFORM pg_notify({channel_literal}, json_build_object('op', lower(TG_OP), 'rows', changed_rows)::text);
+            RETURN NULL;
+        END
+        $$
+        """)
+    )
+    conn.execute(text(f"DROP TRIGGER IF EXISTS {preparer.quote(ROW_TRIGGER_NAME)} ON {table_name}"))
+    for operation, (trigger_name, transition_tables) in TRIGGERS.items():
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {preparer.quote(trigger_name)} ON {table_name}"))
+        conn.execute(
+            text(
+                f"CREATE TRIGGER {preparer.quote(trigger_name)} AFTER {operation} ON {table_name} "
+                f"REFERENCING {transition_tables} FOR EACH STATEMENT EXECUTE FUNCTION {function_name}()"
+            )
+        )
@@ -1,14 +1,22 @@
 import configparser
+import logging
 import os
 import re
-from functools import lru_cache
+from functools import cache, lru_cache
 from pathlib import Path
-from typing import Any, get_type_hints
+from typing import Any, Literal, get_type_hints
 
 from dotenv import load_dotenv
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+_log = logging.getLogger(__name__)
+
+
+@cache
+def _field_types(model_cls: type[BaseSettings]) -> dict[str, Any]:
+    return get_type_hints(model_cls)
+
 
 class DatabaseSettings(BaseSettings):
     HOST: str = "localhost"
@@ -17,27 +25,141 @@ class DatabaseSettings(BaseSettings):
     DB_USER: str = "postgres"
     DB_PASSWORD: str = "postgres"
     DB_SCHEMA: str = "public"
+    POOL_CLASS: Literal["queue", "null"] = "queue"
     POOL_SIZE: int = 5
     MAX_OVERFLOW: int = 10
+    POOL_TIMEOUT: int = 30
+    POOL_RECYCLE: int = 3600
+    POOL_PRE_PING: bool = True
+    POOL_USE_LIFO: bool = False
+    SSL_MODE: str = "prefer"
+    CONNECT_TIMEOUT: int = 10
+    APPLICATION_NAME: str | None = None  # Defaults to APP_NAME
+    WARMUP_CONNECTIONS: int = 0  # Pooled connections opened and primed at startup (capped at POOL_SIZE)
+    DRAIN_TIMEOUT: float = 10.0  # Seconds shutdown waits for checked-out connections before disposing
 
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
 
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.HOST}:{self.PORT}/{self.DB_NAME}"
 
 
+class ReadRoutingSettings(BaseSettings):
+    HEALTH_CHECK_INTERVAL: float = 5.0  # Seconds between replica probes (health + latency)
+    STICKY_PRIMARY_SECONDS: float = 5.0  # Reads go to the primary this long after a client writes; 0 disables
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
+
+
+class PasswordHashingSettings(BaseSettings):
+    # Argon2id cost parameters; tune per host with `python -m app.adapters.cli calibrate-argon2`
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 2
+    HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    HASH_WORKERS: int = 2
+    HASH_QUEUE_SIZE: int = 64  # Hashes queued or running before new calls are rejected
+    HASH_TIMEOUT: float = 5.0  # Seconds a caller waits for a single hash/verify
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
+
+
+# Sections with generic field names (ENABLED, TTL, SAMPLE_RATE...) read them from the
+# environment with their section as prefix (USER_CACHE_ENABLED), so one variable
+# can't switch several features at once. .conf keys stay unprefixed.
+class UserCacheSettings(BaseSettings):
+    ENABLED: bool = True
+    BACKEND: str = "memory"  # Key of app.dependencies.USER_CACHE_BACKENDS
+    MAX_SIZE: int = 10000  # Entries kept before the least recently used is evicted
+    TTL: float = 60.0  # Seconds a cached user is served without hitting the database
+    NEGATIVE_TTL: float = 5.0  # Seconds a "no such user" answer is cached
+
+    model_config = SettingsConfigDict(env_file=".env", env_prefix="USER_CACHE_", extra="ignore", frozen=True)
+
+
+class ChangeFeedSettings(BaseSettings):
+    ENABLED: bool = True
+    CHANNEL: str = "user_changes"  # NOTIFY channel written by the users table trigger
+    SUBSCRIBER_QUEUE_SIZE: int = 1000  # Events buffered per subscriber before it is told to resync
+    HEARTBEAT_INTERVAL: float = 15.0  # Seconds between listener liveness probes and SSE keep-alives
+    RECONNECT_MAX_DELAY: float = 30.0  # Upper bound of the listener's exponential reconnect backoff
+
+    model_config = SettingsConfigDict(env_file=".env", env_prefix="CHANGE_FEED_", extra="ignore", frozen=True)
+
+
+class AccessLogSettings(BaseSettings):
+    ENABLED: bool = True
+    REQUEST_ID_HEADER: str = "X-Request-ID"  # Reused from the client when present, echoed on the response
+    SAMPLE_RATE: float = 1.0  # Fraction of requests logged on routes without their own rate
+    # "route=rate" entries keyed by route template; probes stay quiet unless configured otherwise
+    ROUTE_SAMPLE_RATES: list[str] = ["/ping=0.01", "/welcome=0.01", "/api/v1/health=0.01"]
+    RATE_LIMIT: float = 0.0  # Max access lines per second per route; 0 = unlimited
+    ROUTE_RATE_LIMITS: list[str] = ["/api/v1/users/changes=1"]  # "route=lines_per_second" entries
+    SLOW_REQUEST_MS: float = 1000.0  # Slower requests, and 5xx responses, are always logged
+
+    model_config = SettingsConfigDict(env_file=".env", env_prefix="ACCESS_LOG_", extra="ignore", frozen=True)
+
+
+class QueryProfilerSettings(BaseSettings):
+    ENABLED: bool = True
+    SERVER_TIMING: bool = True  # Add a Server-Timing header with DB time and statement count
+    SLOW_QUERY_MS: float = 200.0  # Log statements slower than this with their normalized SQL; 0 = off
+    SLOWEST_STATEMENTS: int = 3  # Slowest statements kept per request for the access log
+
+    model_config = SettingsConfigDict(env_file=".env", env_prefix="QUERY_PROFILER_", extra="ignore", frozen=True)
+
+
+class TrafficCaptureSettings(BaseSettings):
+    ENABLED: bool = False
+    DIRECTORY: str = "captures"  # Each worker appends to its own capture-<pid>-<start>.jsonl here
+    SAMPLE_RATE: float = 1.0  # Fraction of requests recorded
+    MAX_BODY_BYTES: int = 65536  # Larger bodies are recorded without the body
+    EXCLUDE_PATHS: list[str] = ["/metrics", "/api/v1/users/changes"]  # Path prefixes never recorded (scrapes, streams)
+    QUEUE_SIZE: int = 10000  # Requests waiting for the writer thread; more are dropped
+    TOKEN_KEY: str = ""  # HMAC key of the email/password tokens; empty = random per process
+
+    model_config = SettingsConfigDict(env_file=".env", env_prefix="TRAFFIC_CAPTURE_", extra="ignore", frozen=True)
+
+
+class MetricsSettings(BaseSettings):
+    ENABLED: bool = True
+    # Shared by all workers of one server; each writes its metrics there and /metrics
+    # merges them. Empty = single process. Must be emptied before the server starts.
+    MULTIPROCESS_DIR: str = ""
+    FLUSH_INTERVAL: float = 5.0  # Seconds between writes of this worker's metrics to MULTIPROCESS_DIR
+
+    model_config = SettingsConfigDict(env_file=".env", env_prefix="METRICS_", extra="ignore", frozen=True)
+
+
 class Settings(BaseSettings):
     APP_NAME: str = "Empty APP"
     LOG_LEVEL: str = "INFO"
     LOG_NAME: str = "Empty App"
+    LOG_FORMAT: Literal["text", "json"] = "text"  # json: one compact object per line, for log shippers
+    LOG_QUEUE_SIZE: int = 10000  # Records buffered for the background writer thread; 0 writes synchronously
+    LOG_OVERFLOW: Literal["drop_new", "drop_oldest", "block"] = "drop_new"  # When the queue is full
+    LOG_BLOCK_TIMEOUT: float = 0.1  # "block": seconds to wait for room before dropping the record
     DEBUG: bool = False
     CORS_ORIGINS: list[str] = ["*"]
+    # User routes build responses from already validated entities and return them
+    # pre-serialized; False re-validates them through FastAPI's response_model
+    FAST_RESPONSES: bool = True
     ENVIRONMENT: str = "TEST"
     DATABASE: DatabaseSettings | None = None  # Initialized dynamically later
+    DATABASE_REPLICAS: list[DatabaseSettings] = []  # One per [POSTGRESQL_REPLICA*] section
+    READ_ROUTING: ReadRoutingSettings | None = None  # Initialized dynamically later
+    PASSWORD_HASHING: PasswordHashingSettings | None = None  # Initialized dynamically later
+    USER_CACHE: UserCacheSettings | None = None  # Initialized dynamically later
+    CHANGE_FEED: ChangeFeedSettings | None = None  # Initialized dynamically later
+    ACCESS_LOG: AccessLogSettings | None = None  # Initialized dynamically later
+    METRICS: MetricsSettings | None = None  # Initialized dynamically later
+    QUERY_PROFILER: QueryProfilerSettings | None = None  # Initialized dynamically later
+    TRAFFIC_CAPTURE: TrafficCaptureSettings | None = None  # Initialized dynamically later
     SECRET_KEY: str = Field(default=os.getenv("SECRET_KEY", "fallback_secret_key"))
+    BLIND_INDEX_KEY: str = Field(default=os.getenv("BLIND_INDEX_KEY", "fallback_blind_index_key"))
 
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
 
     @classmethod
     def load_configs(cls):
@@ -52,7 +174,7 @@ class Settings(BaseSettings):
             conf_section: dict[str, Any],
         ) -> dict[str, Any]:
             parsed: dict[str, Any] = {}
-            model_types = get_type_hints(model_cls)
+            model_types = _field_types(model_cls)
             for k, raw_value in conf_section.items():
                 field = k.upper()
                 if field not in model_cls.model_fields:
@@ -71,49 +193,89 @@ class Settings(BaseSettings):
                     else:
                         parsed[field] = value
                 except Exception as e:
-                    print(f"Error parsing field {field}: {e}")
+                    _log.warning("Error parsing field %s: %s", field, e)
             return parsed
 
         def merge_env_with_conf(
             model_cls: type[BaseSettings],
             conf_section: dict[str, str],
         ) -> BaseSettings:
-            # Load values from .env
-            env_values = model_cls().model_dump()
+            # Load values from .env: only those actually set there, class defaults
+            # must not mask .conf values
+            env_values = model_cls().model_dump(exclude_unset=True)
 
             # Parse values from .conf
             conf_values = parse_conf_section(model_cls, conf_section)
 
-            # Merge: .env takes priority; .conf fills missing fields
+            # Merge: .env takes priority; .conf fills missing fields; class defaults the rest
             combined = {**conf_values, **env_values}
 
-            print(
-                "Combined config - ENV: %s | CONF: %s | FINAL: %s",
-                env_values,
-                conf_values,
-                combined,
-            )
+            # Keys only: values include credentials.
+            _log.debug("%s loaded (conf keys: %s)", model_cls.__name__, sorted(conf_values))
             return model_cls(**combined)
 
+        def section(name: str) -> dict[str, str]:
+            return dict(config[name].items()) if name in config else {}
+
         load_dotenv()
 
         # Main settings (DEFAULT section)
         settings = merge_env_with_conf(cls, config.defaults())
 
         # Database configuration
-        db_section = {}
-        if "POSTGRESQL" in config:
-            db_section = dict(config["POSTGRESQL"].items())
-
-        print("Loading database configuration: %s", db_section)
-
-        db_kwargs = merge_env_with_conf(DatabaseSettings, db_section)
+        database = DatabaseSettings(**merge_env_with_conf(DatabaseSettings, section("POSTGRESQL")).model_dump())
+        _log.debug("Database configuration: %s:%s/%s", database.HOST, database.PORT, database.DB_NAME)
 
-        settings.DATABASE = DatabaseSettings(**db_kwargs.model_dump())
+        # Read replicas: each section only lists what differs from the primary
+        # (usually HOST); .env values are not applied so they can't clobber it.
+        replicas = [
+            DatabaseSettings(
+                **{
+                    **database.model_dump(),
+                    **parse_conf_section(DatabaseSettings, section(name)),
+                }
+            )
+            for name in config.sections()
+            if re.match(r"POSTGRESQL_REPLICA(\b|_)", name)
+        ]
 
-        return settings
+        # Settings are frozen: attach every section in one copy.
+        return settings.model_copy(
+            update={
+                "DATABASE": database,
+                "DATABASE_REPLICAS": replicas,
+                "READ_ROUTING": merge_env_with_conf(ReadRoutingSettings, section("READ_ROUTING")),
+                "PASSWORD_HASHING": merge_env_with_conf(PasswordHashingSettings, section("PASSWORD_HASHING")),
+                "USER_CACHE": merge_env_with_conf(UserCacheSettings, section("USER_CACHE")),
+                "CHANGE_FEED": merge_env_with_conf(ChangeFeedSettings, section("CHANGE_FEED")),
+                "ACCESS_LOG": merge_env_with_conf(AccessLogSettings, section("ACCESS_LOG")),
+                "METRICS": merge_env_with_conf(MetricsSettings, section("METRICS")),
+                "QUERY_PROFILER": merge_env_with_conf(QueryProfilerSettings, section("QUERY_PROFILER")),
+                "TRAFFIC_CAPTURE": merge_env_with_conf(TrafficCaptureSettings, section("TRAFFIC_CAPTURE")),
+            }
+        )
 
 
 @lru_cache
 def get_settings():
+    """
+    The process-wide settings snapshot.
+
+    Config files and .env are read once; every module shares this frozen
+    instance. Call ``Settings.load_configs()`` directly only to re-read them.
+    """
     return Settings.load_configs()
+
+
+def update_env_file(path: Path, values: dict[str, Any]) -> None:
+    """Set ``KEY=value`` lines in a dotenv file, replacing existing keys and appending new ones."""
+    lines = path.read_text().splitlines() if path.exists() else []
+    pending = {key: str(value) for key, value in values.items()}
+
+    for i, line in enumerate(lines):
+        key = line.split("=", 1)[0].strip()
+        if "=" in line and not line.lstrip().startswith("#") and key in pending:
+            lines[i] = f"{key}={pending.pop(key)}"
+
+    lines.extend(f"{key}={value}" for key, value in pending.items())
+    path.write_text("\n".join(lines) + "\n")
@@ -1,12 +1,52 @@
+import asyncio
+import contextlib
+import math
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any, cast
 from urllib.parse import quote_plus
 
-from sqlalchemy import text
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from psycopg import AsyncConnection
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 
-from app.infrastructure.config import Settings
-from app.infrastructure.database.models import Base, create_schema
+from app.infrastructure.change_feed import install_user_change_trigger
+from app.infrastructure.config import DatabaseSettings, Settings, get_settings
+from app.infrastructure.database.migrations import BASELINE_REVISION, alembic_config, head_revisions
+from app.infrastructure.database.models import Base, User, create_schema
+from app.infrastructure.database.pool import InstrumentedAsyncQueuePool, pool_metrics, pool_stats
+from app.infrastructure.database.query_timer import normalize_sql, query_timer_var
+from app.infrastructure.database.replicas import Replica, ReplicaRouter
 from app.infrastructure.logging import logger
+from app.infrastructure.metrics import MetricFamily, metrics_registry
+
+# Runs hot queries on a fresh session so the driver prepares them
+StatementPrimer = Callable[[AsyncSession], Awaitable[Any]]
+
+DRAIN_POLL_INTERVAL = 0.05
+
+# pg_advisory_xact_lock key serializing concurrent `migrate` runs
+MIGRATION_LOCK_KEY = 0x6D696772  # "migr"
+
+# ``database`` label of the primary; replicas use host:port
+PRIMARY_DATABASE = "primary"
+
+STATEMENT_DURATION = metrics_registry.histogram(
+    "db_statement_duration_seconds",
+    "Time the driver spent executing each statement.",
+    labels=("database",),
+)
+
+
+class DatabaseDrainingError(RuntimeError):
+    """Raised when a session is requested while the connector drains for shutdown."""
+
+
+class SchemaVersionError(RuntimeError):
+    """Raised when the database is not migrated to the revision this build expects."""
 
 
 class DatabaseConnector:
@@ -18,35 +58,182 @@ class DatabaseConnector:
     def __init__(self, settings: Settings, logger):
         self.settings = settings
         self._logger = logger
-        self._engine = None
+        self._engine: AsyncEngine | None = None
         self._session_factory = None
+        self._replica_router: ReplicaRouter | None = None
+        self._replica_monitor: asyncio.Task[None] | None = None
+        self._checked_out = 0
+        self._draining = False
 
     @property
     def database_uri(self) -> str:
         """Generate database URI with escaped credentials"""
         if self.settings.DATABASE is None:
             raise RuntimeError("Database settings not initialized")
-        escaped_user = quote_plus(self.settings.DATABASE.DB_USER)
-        escaped_password = quote_plus(self.settings.DATABASE.DB_PASSWORD)
+        return self._database_uri(self.settings.DATABASE)
+
+    def _database_uri(self, database: DatabaseSettings) -> str:
+        escaped_user = quote_plus(database.DB_USER)
+        escaped_password = quote_plus(database.DB_PASSWORD)
         uri = (
-            f"postgresql+psycopg://{escaped_user}:{escaped_password}@"
-            f"{self.settings.DATABASE.HOST}:{self.settings.DATABASE.PORT}/"
-            f"{self.settings.DATABASE.DB_NAME}"
+            f"postgresql+psycopg://{escaped_user}:{escaped_password}@{database.HOST}:{database.PORT}/{database.DB_NAME}"
         )
         self._logger.debug("Database URI generated: %s", uri)
         return uri
 
+    @property
+    def engine_options(self) -> dict[str, Any]:
+        """Keyword arguments for create_async_engine built from the database settings."""
+        if self.settings.DATABASE is None:
+            raise RuntimeError("Database settings not initialized")
+        return self._engine_options(self.settings.DATABASE)
+
+    def _engine_options(self, database: DatabaseSettings) -> dict[str, Any]:
+        options: dict[str, Any] = {
+            "echo": self.settings.ENVIRONMENT == "DEV",
+            "pool_pre_ping": database.POOL_PRE_PING,
+            "connect_args": {
+                "connect_timeout": database.CONNECT_TIMEOUT,
+                "sslmode": database.SSL_MODE,
+                "application_name": database.APPLICATION_NAME or self.settings.APP_NAME,
+            },
+        }
+        if database.POOL_CLASS == "null":
+            options["poolclass"] = NullPool
+        else:
+            options.update(
+                poolclass=InstrumentedAsyncQueuePool,
+                pool_size=database.POOL_SIZE,
+                max_overflow=database.MAX_OVERFLOW,
+                pool_timeout=database.POOL_TIMEOUT,
+                pool_recycle=database.POOL_RECYCLE,
+                pool_use_lifo=database.POOL_USE_LIFO,
+            )
+        return options
+
     def create_engine(self):
         """Create SQLAlchemy async engine using escaped URI."""
         if self._engine is None:
-            self._logger.info("Creating database engine")
-            self._engine = create_async_engine(
-                self.database_uri,
-                pool_pre_ping=True,
-                echo=self.settings.ENVIRONMENT == "DEV",
+            options = self.engine_options
+            self._logger.info(
+                "Creating database engine (pool=%s, size=%s, max_overflow=%s)",
+                options["poolclass"].__name__,
+                options.get("pool_size"),
+                options.get("max_overflow"),
             )
+            self._engine = create_async_engine(self.database_uri, **options)
+            self._instrument_engine(self._engine, self.settings.DATABASE, PRIMARY_DATABASE)
         return self._engine
 
+    def _instrument_engine(self, engine: AsyncEngine, database: DatabaseSettings, name: str) -> None:
+        """Set search_path on every new connection, count checkouts and time statements."""
+        statement_seconds = STATEMENT_DURATION.labels(name)
+        profiler = self.settings.QUERY_PROFILER
+        slow_query_seconds = (
+            profiler.SLOW_QUERY_MS / 1000 if profiler is not None and profiler.SLOW_QUERY_MS > 0 else math.inf
+        )
+        search_path = f"{engine.dialect.identifier_preparer.quote_schema(database.DB_SCHEMA)}, public"
+
+        def set_search_path(dbapi_connection, connection_record):
+            # Outside a transaction, so the pool's reset-on-return ROLLBACK keeps it
+            autocommit = dbapi_connection.autocommit
+            dbapi_connection.autocommit = True
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"SET SESSION search_path TO {search_path}")
+            cursor.close()
+            dbapi_connection.autocommit = autocommit
+
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            self._checked_out += 1
+
+        def on_checkin(dbapi_connection, connection_record):
+            self._checked_out -= 1
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            context.query_start = time.perf_counter()
+
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - context.query_start
+            statement_seconds.observe(elapsed)
+            timer = query_timer_var.get()
+            if timer is not None:
+                timer.record(elapsed, statement)
+            if elapsed >= slow_query_seconds:
+                self._log_slow_query(name, statement, elapsed)
+
+        event.listen(engine.sync_engine, "connect", set_search_path, insert=True)
+        event.listen(engine.sync_engine, "checkout", on_checkout)
+        event.listen(engine.sync_engine, "checkin", on_checkin)
+        event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+
+    def _log_slow_query(self, database: str, statement: str, seconds: float) -> None:
+        sql = normalize_sql(statement)
+        self._logger.warning(
+            "Slow query on %s (%.1f ms): %s",
+            database,
+            seconds * 1000,
+            sql,
+            extra={"database": database, "db_ms": round(seconds * 1000, 3), "sql": sql},
+        )
+
+    @property
+    def in_flight(self) -> int:
+        """Connections currently checked out of the primary and replica pools."""
+        return self._checked_out
+
+    def pool_stats(self) -> dict[str, Any]:
+        """Live pool occupancy and checkout wait-time histogram."""
+        return pool_stats(self.create_engine().pool)
+
+    def collect_metrics(self) -> list[MetricFamily]:
+        """
+        Pool gauges for the primary and every replica, plus replica health.
+
+        Only engines that already exist are reported: a scrape never opens a pool.
+        """
+        pools = []
+        if self._engine is not None:
+            pools.append((PRIMARY_DATABASE, self._engine.pool))
+        replicas = self._replica_router.replicas if self._replica_router is not None else []
+        pools.extend((replica.name, replica.engine.pool) for replica in replicas)
+        return [
+            *pool_metrics(pools),
+            MetricFamily(
+                "db_connections_in_flight",
+                "gauge",
+                "Connections checked out of the primary and replica pools.",
+                samples={(): self._checked_out},
+            ),
+            MetricFamily(
+                "db_replica_up",
+                "gauge",
+                "1 while the read replica passes health checks.",
+                ("database",),
+                {(replica.name,): int(replica.healthy) for replica in replicas},
+            ),
+        ]
+
+    async def connect_raw(self) -> AsyncConnection:
+        """
+        Open a standalone autocommit psycopg connection outside the pool.
+
+        For long-lived sessions such as LISTEN, which would otherwise pin a
+        pooled connection forever.
+        """
+        if self.settings.DATABASE is None:
+            raise RuntimeError("Database settings not initialized")
+        database = self.settings.DATABASE
+        return await AsyncConnection.connect(
+            host=database.HOST,
+            port=database.PORT,
+            dbname=database.DB_NAME,
+            user=database.DB_USER,
+            password=database.DB_PASSWORD,
+            autocommit=True,
+            **self.engine_options["connect_args"],
+        )
+
     def create_session_factory(self):
         """Create async session factory."""
         if self._session_factory is None:
@@ -61,36 +248,242 @@ class DatabaseConnector:
 
     def get_session(self) -> AsyncSession:
         """Get a new async database session."""
+        if self._draining:
+            raise DatabaseDrainingError("Database connector is draining for shutdown")
         session_factory = self.create_session_factory()
         return session_factory()
 
-    async def create_database(self):
-        """Create all database tables."""
+    @property
+    def replica_router(self) -> ReplicaRouter:
+        """Router over one engine per configured read replica (built on first use)."""
+        if self._replica_router is None:
+            replicas = []
+            for database in self.settings.DATABASE_REPLICAS:
+                name = f"{database.HOST}:{database.PORT}"
+                engine = create_async_engine(self._database_uri(database), **self._engine_options(database))
+                self._instrument_engine(engine, database, name)
+                replicas.append(
+                    Replica(
+                        name=name,
+                        engine=engine,
+                        session_factory=async_sessionmaker(
+                            bind=engine,
+                            autoflush=False,
+                            expire_on_commit=False,
+                            class_=AsyncSession,
+                        ),
+                    )
+                )
+            self._replica_router = ReplicaRouter(replicas, self._logger)
+        return self._replica_router
+
+    async def open_session(self, readonly: bool = False) -> AsyncSession:
+        """
+        Session on the primary, or on a read replica when ``readonly``.
+
+        A replica session checks out its connection up front (validated by
+        pre-ping), so an unreachable replica is marked down and the next
+        candidate, ultimately the primary, is used before the caller runs
+        any query. Replica sessions carry ``info["replica"]``.
+        """
+        if self._draining:
+            raise DatabaseDrainingError("Database connector is draining for shutdown")
+        if readonly:
+            for replica in self.replica_router.candidates():
+                session = replica.session_factory()
+                try:
+                    await session.connection()
+                except (SQLAlchemyError, OSError) as e:
+                    await session.close()
+                    self.replica_router.mark_failure(replica, e)
+                    continue
+                session.info["replica"] = replica.name
+                return session
+        return self.get_session()
+
+    def start_replica_monitor(self, interval: float) -> None:
+        """Probe replicas in the background so routing follows their health and latency."""
+        if self.settings.DATABASE_REPLICAS and self._replica_monitor is None:
+            self._replica_monitor = asyncio.create_task(self.replica_router.monitor(interval))
+
+    async def stop_replica_monitor(self) -> None:
+        if self._replica_monitor is not None:
+            self._replica_monitor.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._replica_monitor
+            self._replica_monitor = None
+
+    def replica_stats(self) -> list[dict[str, Any]]:
+        """Health, smoothed latency and failure counts per read replica."""
+        if not self.settings.DATABASE_REPLICAS:
+            return []
+        return [
+            {**stats, "pool": pool_stats(replica.engine.pool)}
+            for stats, replica in zip(self.replica_router.stats(), self.replica_router.replicas, strict=True)
+        ]
+
+    async def warm_up(self, connections: int, primers: Sequence[StatementPrimer] = ()) -> int:
+        """
+        Open ``connections`` pooled connections at once and prime them.
+
+        Connecting sets search_path; each connection then runs ``primers``
+        with psycopg preparing every statement on first execution. Prepared
+        statements live as long as the connection, so the first requests
+        after a deploy skip both the handshake and parse/plan. Failures are
+        logged, not raised: the pool still connects on demand. Returns the
+        number of connections warmed.
+        """
+        database = self.settings.DATABASE
+        if database is None or database.POOL_CLASS == "null" or connections <= 0:
+            return 0
+        connections = min(connections, database.POOL_SIZE)
+        start = time.perf_counter()
+        # Hold every session until all are primed, so each gets its own connection
+        sessions = [self.get_session() for _ in range(connections)]
+        try:
+            results = await asyncio.gather(
+                *(self._prime(session, primers) for session in sessions),
+                return_exceptions=True,
+            )
+        finally:
+            await asyncio.gather(*(session.close() for session in sessions))
+        errors = [result for result in results if isinstance(result, BaseException)]
+        warmed = connections - len(errors)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if errors:
+            self._logger.warning(
+                "Warmed %s of %s database connections in %.1f ms; first error: %s",
+                warmed,
+                connections,
+                elapsed_ms,
+                errors[0],
+            )
+        else:
+            self._logger.info("Warmed %s database connections in %.1f ms", warmed, elapsed_ms)
+        return warmed
+
+    @staticmethod
+    async def _prime(session: AsyncSession, primers: Sequence[StatementPrimer]) -> None:
+        connection = await session.connection()
+        driver_connection = cast(AsyncConnection, (await connection.get_raw_connection()).driver_connection)
+        threshold = driver_connection.prepare_threshold
+        driver_connection.prepare_threshold = 0  # Prepare on first execution
+        try:
+            for primer in primers:
+                await primer(session)
+        finally:
+            driver_connection.prepare_threshold = threshold
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Stop handing out sessions, wait up to ``timeout`` seconds for
+        checked-out connections to come back, then dispose every engine.
+
+        New sessions raise DatabaseDrainingError meanwhile. Returns whether
+        all connections were returned before the deadline; the connector
+        is usable again afterwards (engines are rebuilt on demand).
+        """
+        start = time.perf_counter()
+        self._draining = True
+        try:
+            deadline = start + timeout
+            while self._checked_out > 0 and time.perf_counter() < deadline:
+                await asyncio.sleep(DRAIN_POLL_INTERVAL)
+            drained = self._checked_out <= 0
+            if not drained:
+                self._logger.warning(
+                    "Disposing database engines with %s connections still checked out after %.1fs",
+                    self._checked_out,
+                    timeout,
+                )
+            await self.dispose()
+        finally:
+            self._draining = False
+        self._logger.info("Database drained and disposed in %.1f ms", (time.perf_counter() - start) * 1000)
+        return drained
+
+    async def dispose(self):
+        """Close every pooled connection and drop the engines."""
+        await self.stop_replica_monitor()
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+            self._session_factory = None
+        if self._replica_router is not None:
+            for replica in self._replica_router.replicas:
+                await replica.engine.dispose()
+            self._replica_router = None
+
+    async def migrate(self, revision: str = "head") -> None:
+        """
+        Create the schema, upgrade it to ``revision`` and install the change-feed trigger.
+
+        A database whose tables were built by the old startup create_all (no
+        alembic_version yet) is stamped at the baseline revision first, so
+        only the later revisions run on it. A one-shot deploy step, not something workers run. Everything
+        happens in one transaction under an advisory lock, so concurrent
+        runs apply the migrations once and the others find nothing to do.
+        """
+        if self.settings.DATABASE is None:
+            raise RuntimeError("Database settings not initialized")
         try:
             engine = self.create_engine()
             async with engine.begin() as conn:
+                await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
                 await conn.run_sync(create_schema)
-                await conn.run_sync(Base.metadata.create_all)
+                await conn.run_sync(_upgrade, revision)
+                feed_settings = self.settings.CHANGE_FEED
+                if feed_settings is not None and feed_settings.ENABLED:
+                    await conn.run_sync(install_user_change_trigger, User.__table__, feed_settings.CHANNEL)
             self._logger.info(
-                "Database tables created in schema %s",
+                "Database schema %s migrated to %s",
                 self.settings.DATABASE.DB_SCHEMA,
+                revision,
             )
         except SQLAlchemyError as e:
-            self._logger.error(f"Error creating database: {e}")
+            self._logger.error("Error migrating database: %s", e)
             raise
 
+    async def verify_schema_version(self) -> None:
+        """
+        Check, with a single query, that the database is at this build's head revision.
+
+        Raises SchemaVersionError when it is not (or was never migrated), so
+        a worker refuses to start instead of serving against the wrong schema.
+        """
+        if self.settings.DATABASE is None:
+            raise RuntimeError("Database settings not initialized")
+        expected = head_revisions()
+        engine = self.create_engine()
+        schema = engine.dialect.identifier_preparer.quote_schema(self.settings.DATABASE.DB_SCHEMA)
+        version_table = f"{schema}.alembic_version"
+        try:
+            async with engine.connect() as conn:
+                current = set((await conn.execute(text(f"SELECT version_num FROM {version_table}"))).scalars())
+        except ProgrammingError as e:
+            raise SchemaVersionError(
+                "Database schema is not versioned; run `python -m app.adapters.cli migrate`"
+            ) from e
+        if current != expected:
+            raise SchemaVersionError(
+                f"Database schema is at {sorted(current) or 'no revision'} but this build expects "
+                f"{sorted(expected)}; run `python -m app.adapters.cli migrate`"
+            )
+        self._logger.info("Database schema at revision %s", ", ".join(sorted(current)))
+
     async def drop_database(self):
         """Drop all database tables."""
         try:
             engine = self.create_engine()
             async with engine.begin() as conn:
                 await conn.run_sync(Base.metadata.drop_all)
+                await conn.run_sync(_drop_version_table, self.settings.DATABASE.DB_SCHEMA)
             self._logger.warning(
                 "Database tables dropped from schema %s",
                 self.settings.DATABASE.DB_SCHEMA,
             )
         except SQLAlchemyError as e:
-            self._logger.error(f"Error dropping database: {e}")
+            self._logger.error("Error dropping database: %s", e)
             raise
 
     async def health_check(self) -> bool:
@@ -100,9 +493,35 @@ class DatabaseConnector:
                 await session.execute(text("SELECT 1"))
             return True
         except SQLAlchemyError as e:
-            self._logger.error(f"Database health check failed: {e}")
+            self._logger.error("Database health check failed: %s", e)
             return False
 
 
+def _upgrade(connection: Connection, revision: str) -> None:
+    from alembic import command
+
+    config = alembic_config()
+    config.attributes["connection"] = connection
+    if _predates_migrations(connection):
+        logger.warning("Users table has no schema version; stamping it at baseline %s", BASELINE_REVISION)
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, revision)
+
+
+def _predates_migrations(connection: Connection) -> bool:
+    """Whether the tables were built by the old startup create_all: users exists, alembic_version doesn't."""
+    inspector = inspect(connection)
+    schema = User.__table__.schema
+    return inspector.has_table(User.__tablename__, schema=schema) and not inspector.has_table(
+        "alembic_version", schema=schema
+    )
+
+
+def _drop_version_table(connection: Connection, schema: str) -> None:
+    preparer = connection.dialect.identifier_preparer
+    connection.execute(text(f"DROP TABLE IF EXISTS {preparer.quote_schema(schema)}.alembic_version"))
+
+
 # Singleton instance
-db_connector = DatabaseConnector(Settings.load_configs(), logger)
+db_connector = DatabaseConnector(get_settings(), logger)
+metrics_registry.add_collector(db_connector.collect_metrics)
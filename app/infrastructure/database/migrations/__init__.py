@@ -0,0 +1,33 @@
+"""
+Alembic migrations for the application schema.
+
+Apply them with ``python -m app.adapters.cli migrate`` (one-shot, before
+rolling out workers); new revisions come from ``alembic revision
+--autogenerate -m "..."`` run at the repository root.
+"""
+
+from pathlib import Path
+
+# Alembic is imported on use: importing it costs more than the rest of the
+# database layer, and workers only need it for the startup version check.
+MIGRATIONS_DIR = Path(__file__).parent
+
+# The schema create_all built before migrations existed; databases from that
+# time are stamped here by ``migrate`` and upgraded from it
+BASELINE_REVISION = "3f1c2a9d8b47"
+
+
+def alembic_config():
+    """Alembic config pointing at this package, independent of the working directory."""
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    return config
+
+
+def head_revisions() -> set[str]:
+    """Revisions the database must be at for this build (read from the version files, no query)."""
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory.from_config(alembic_config()).get_heads())
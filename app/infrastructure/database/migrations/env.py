@@ -0,0 +1,69 @@
+"""
+Alembic environment.
+
+``migrate`` hands in its own connection (already inside the migration
+transaction) through ``config.attributes["connection"]``; the plain
+``alembic`` CLI gets a connection from the app's engine instead.
+"""
+
+import asyncio
+
+from alembic import context
+from sqlalchemy.engine import Connection
+
+from app.infrastructure.config import get_settings
+from app.infrastructure.database.connector import db_connector
+from app.infrastructure.database.models import Base
+from app.infrastructure.database.types.encrypted_column import EncryptedType
+
+config = context.config
+schema = get_settings().DATABASE.DB_SCHEMA
+
+
+def include_name(name, type_, parent_names) -> bool:
+    # Tables live in DB_SCHEMA; ignore everything else in the database
+    return name == schema if type_ == "schema" else True
+
+
+def render_item(type_, obj, autogen_context):
+    # Encrypted columns are plain BYTEA in the database
+    if type_ == "type" and isinstance(obj, EncryptedType):
+        autogen_context.imports.add("from sqlalchemy.dialects import postgresql")
+        return "postgresql.BYTEA()"
+    return False
+
+
+def configure(**options) -> None:
+    context.configure(
+        target_metadata=Base.metadata,
+        version_table_schema=schema,
+        include_schemas=True,
+        include_name=include_name,
+        render_item=render_item,
+        **options,
+    )
+
+
+def run_on(connection: Connection) -> None:
+    configure(connection=connection)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_online() -> None:
+    try:
+        async with db_connector.create_engine().connect() as connection:
+            await connection.run_sync(run_on)
+            await connection.commit()
+    finally:
+        await db_connector.dispose()
+
+
+if context.is_offline_mode():
+    configure(url=db_connector.database_uri, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+elif (connection := config.attributes.get("connection")) is not None:
+    run_on(connection)
+else:
+    asyncio.run(run_online())
@@ -0,0 +1,50 @@
+"""Baseline: the users table as create_all built it before migrations
+
+Databases created by the old startup create_all are at this revision
+already; ``migrate`` stamps them here instead of running it.
+
+Revision ID: 3f1c2a9d8b47
+Revises:
+Create Date: 2026-10-18 09:00:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+from app.infrastructure.config import get_settings
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c2a9d8b47"
+down_revision: str | Sequence[str] | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Tables follow DB_SCHEMA, like the models
+schema = get_settings().DATABASE.DB_SCHEMA
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("email", postgresql.BYTEA(), nullable=False),
+        sa.Column("full_name", postgresql.BYTEA(), nullable=False),
+        sa.Column("hashed_password", postgresql.BYTEA(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("is_superuser", sa.Boolean(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        schema=schema,
+    )
+    op.create_index(op.f(f"ix_{schema}_users_email"), "users", ["email"], unique=True, schema=schema)
+    op.create_index(op.f(f"ix_{schema}_users_id"), "users", ["id"], unique=False, schema=schema)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f(f"ix_{schema}_users_id"), table_name="users", schema=schema)
+    op.drop_index(op.f(f"ix_{schema}_users_email"), table_name="users", schema=schema)
+    op.drop_table("users", schema=schema)
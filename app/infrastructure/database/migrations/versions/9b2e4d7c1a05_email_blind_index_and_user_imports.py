@@ -0,0 +1,130 @@
+"""Email blind index on users, user imports and the import staging table
+
+Revision ID: 9b2e4d7c1a05
+Revises: 3f1c2a9d8b47
+Create Date: 2026-10-18 09:30:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import context, op
+
+from app.infrastructure.config import get_settings
+from app.infrastructure.database.types.encrypted_column import EncryptedType
+from app.infrastructure.security import email_blind_index
+
+# revision identifiers, used by Alembic.
+revision: str = "9b2e4d7c1a05"
+down_revision: str | Sequence[str] | None = "3f1c2a9d8b47"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Tables follow DB_SCHEMA, like the models
+schema = get_settings().DATABASE.DB_SCHEMA
+BACKFILL_BATCH_SIZE = 1000
+
+# Only the columns the backfill touches, as they are at this revision
+users = sa.table(
+    "users",
+    sa.column("id", sa.Integer()),
+    sa.column("email", EncryptedType(key=get_settings().SECRET_KEY)),
+    sa.column("email_hash", sa.String(64)),
+    schema=schema,
+)
+
+
+def backfill_email_hashes(conn: sa.Connection, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """Set email_hash on every row without one, a batch at a time; returns the rows updated."""
+    total = 0
+    while True:
+        rows = conn.execute(
+            sa.select(users.c.id, users.c.email)
+            .where(users.c.email_hash.is_(None))
+            .order_by(users.c.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return total
+        conn.execute(
+            users.update().where(users.c.id == sa.bindparam("user_id")).values(email_hash=sa.bindparam("hash")),
+            [{"user_id": row.id, "hash": email_blind_index(row.email)} for row in rows],
+        )
+        total += len(rows)
+
+
+def check_unique_email_hashes(conn: sa.Connection) -> None:
+    """The unique index can't be built over emails that differ only in case or whitespace."""
+    duplicates = conn.scalar(
+        sa.select(sa.func.count()).select_from(
+            sa.select(users.c.email_hash)
+            .where(users.c.email_hash.is_not(None))
+            .group_by(users.c.email_hash)
+            .having(sa.func.count() > 1)
+            .subquery()
+        )
+    )
+    if duplicates:
+        raise RuntimeError(
+            f"{duplicates} emails are registered more than once (ignoring case and surrounding whitespace); "
+            "merge or delete the duplicate users, then run the migration again"
+        )
+
+
+def upgrade() -> None:
+    # Nullable: filled below, and rows written by older builds during a rollout have none
+    op.add_column("users", sa.Column("email_hash", sa.String(length=64), nullable=True), schema=schema)
+    if not context.is_offline_mode():
+        conn = op.get_bind()
+        backfill_email_hashes(conn)
+        check_unique_email_hashes(conn)
+    # pgp_sym_encrypt salts every value, so the unique index on the ciphertext never rejected anything
+    op.drop_index(op.f(f"ix_{schema}_users_email"), table_name="users", schema=schema)
+    op.create_index(op.f(f"ix_{schema}_users_email_hash"), "users", ["email_hash"], unique=True, schema=schema)
+
+    op.create_table(
+        "user_imports",
+        sa.Column("import_id", sa.String(length=64), nullable=False),
+        sa.Column("source", sa.String(length=255), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("rows_read", sa.Integer(), nullable=False),
+        sa.Column("rows_staged", sa.Integer(), nullable=False),
+        sa.Column("rows_failed", sa.Integer(), nullable=False),
+        sa.Column("rows_merged", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("import_id"),
+        schema=schema,
+    )
+    op.create_index(op.f(f"ix_{schema}_user_imports_id"), "user_imports", ["id"], unique=False, schema=schema)
+
+    op.create_table(
+        "user_import_staging",
+        sa.Column("import_id", sa.String(length=64), nullable=False),
+        sa.Column("line_no", sa.Integer(), nullable=False),
+        sa.Column("email", sa.Text(), nullable=False),
+        sa.Column("email_hash", sa.String(length=64), nullable=False),
+        sa.Column("full_name", sa.Text(), nullable=False),
+        sa.Column("hashed_password", sa.Text(), nullable=False),
+        schema=schema,
+        prefixes=["UNLOGGED"],
+    )
+    op.create_index(
+        op.f(f"ix_{schema}_user_import_staging_import_id"),
+        "user_import_staging",
+        ["import_id"],
+        unique=False,
+        schema=schema,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f(f"ix_{schema}_user_import_staging_import_id"), table_name="user_import_staging", schema=schema)
+    op.drop_table("user_import_staging", schema=schema)
+    op.drop_index(op.f(f"ix_{schema}_user_imports_id"), table_name="user_imports", schema=schema)
+    op.drop_table("user_imports", schema=schema)
+    op.drop_index(op.f(f"ix_{schema}_users_email_hash"), table_name="users", schema=schema)
+    op.create_index(op.f(f"ix_{schema}_users_email"), "users", ["email"], unique=True, schema=schema)
+    op.drop_column("users", "email_hash", schema=schema)
@@ -1,4 +1,5 @@
 from .base import Base, create_schema
 from .user import User
+from .user_import import UserImport, user_import_staging
 
-__all__ = ["Base", "create_schema", "User"]
+__all__ = ["Base", "create_schema", "User", "UserImport", "user_import_staging"]
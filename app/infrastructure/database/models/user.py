@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, func
+from sqlalchemy import Boolean, String, func
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -13,17 +13,30 @@ settings = get_settings()
 class User(Base):
     __tablename__ = "users"
 
+    # pgp_sym_encrypt salts every value, so the ciphertext can't be indexed or
+    # constrained. Equality lookups and uniqueness go through email_hash.
     email: Mapped[str] = mapped_column(
         EncryptedType(key=settings.SECRET_KEY),
+        nullable=False,
+    )
+    # Blind index: keyed HMAC of the normalized email (see security.email_blind_index).
+    # Nullable only so rows created before the column existed can be backfilled.
+    email_hash: Mapped[str | None] = mapped_column(
+        String(64),
         unique=True,
         index=True,
-        nullable=False,
+        nullable=True,
     )
     full_name: Mapped[str] = mapped_column(EncryptedType(key=settings.SECRET_KEY))
 
+    # Deferred: a plain select(User) or db.get doesn't decrypt it. Queries that
+    # need it ask for it (load_only/undefer); reading it unloaded raises instead
+    # of lazy loading.
     hashed_password: Mapped[str] = mapped_column(
         EncryptedType(key=settings.SECRET_KEY),
         nullable=False,
+        deferred=True,
+        deferred_raiseload=True,
     )
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     is_superuser: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, Table, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastructure.config import get_settings
+
+from .base import Base
+
+settings = get_settings()
+
+
+class UserImport(Base):
+    """Progress of a bulk user import; ``rows_read`` is the resume checkpoint."""
+
+    __tablename__ = "user_imports"
+
+    import_id: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    source: Mapped[str] = mapped_column(String(255), default="")
+    status: Mapped[str] = mapped_column(String(16), default="staging")  # staging | done
+    rows_read: Mapped[int] = mapped_column(Integer, default=0)
+    rows_staged: Mapped[int] = mapped_column(Integer, default=0)
+    rows_failed: Mapped[int] = mapped_column(Integer, default=0)
+    rows_merged: Mapped[int] = mapped_column(Integer, default=0)
+
+
+# Plain rows loaded with COPY before the set-based merge into users. UNLOGGED
+# skips WAL for this throwaway data; rows are deleted by the merge that reads them.
+user_import_staging = Table(
+    "user_import_staging",
+    Base.metadata,
+    Column("import_id", String(64), nullable=False, index=True),
+    Column("line_no", Integer, nullable=False),
+    Column("email", Text, nullable=False),
+    Column("email_hash", String(64), nullable=False),
+    Column("full_name", Text, nullable=False),
+    Column("hashed_password", Text, nullable=False),
+    schema=settings.DATABASE.DB_SCHEMA,
+    prefixes=["UNLOGGED"],
+)
@@ -0,0 +1,119 @@
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any, Self, cast
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.infrastructure.metrics import Histogram, MetricFamily
+
+POOL_GAUGES = {
+    "size": "Connections the pool keeps open.",
+    "checked_out": "Connections currently in use.",
+    "checked_in": "Idle connections in the pool.",
+    "overflow": "Connections open beyond the pool size.",
+    "waiters": "Checkouts blocked because every connection is in use and the pool cannot grow.",
+}
+
+
+class PoolTelemetry:
+    """
+    Checkout counters shared by every generation of an instrumented pool.
+    """
+
+    def __init__(self) -> None:
+        self.checkout_wait = Histogram()
+        self.timeouts = 0
+        self._waiters = 0
+        self._lock = threading.Lock()
+
+    @property
+    def waiters(self) -> int:
+        return self._waiters
+
+    @contextmanager
+    def checkout(self, blocks: bool) -> Iterator[None]:
+        """Time a checkout; ``blocks`` counts it as a waiter until it gets a connection or times out."""
+        if blocks:
+            with self._lock:
+                self._waiters += 1
+        start = time.perf_counter()
+        try:
+            yield
+        except PoolTimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - start)
+            if blocks:
+                with self._lock:
+                    self._waiters -= 1
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long callers wait for a connection.
+
+    The measured time covers the whole checkout, including opening a new
+    connection when the pool is allowed to grow; only checkouts that find
+    the pool exhausted count as waiters.
+    """
+
+    def __init__(self, creator: Any, **kw: Any):
+        super().__init__(creator, **kw)
+        self.telemetry = PoolTelemetry()
+
+    def exhausted(self) -> bool:
+        """No idle connection and no room to open one: a checkout now blocks (QueuePool's own test)."""
+        return self.checkedin() == 0 and -1 < self._max_overflow <= self.overflow()
+
+    def _do_get(self) -> Any:
+        with self.telemetry.checkout(blocks=self.exhausted()):
+            return super()._do_get()
+
+    def recreate(self) -> Self:
+        # engine.dispose() swaps in a fresh pool; keep accumulating into the same telemetry.
+        pool = cast(Self, super().recreate())
+        pool.telemetry = self.telemetry
+        return pool
+
+
+def pool_stats(pool: Pool) -> dict[str, Any]:
+    """Snapshot of pool occupancy and, for instrumented pools, checkout wait times."""
+    stats: dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # QueuePool counts overflow from -pool_size; clamp to connections beyond pool_size.
+            overflow=max(pool.overflow(), 0),
+        )
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        stats.update(
+            waiters=pool.telemetry.waiters,
+            timeouts=pool.telemetry.timeouts,
+            checkout_wait_seconds=pool.telemetry.checkout_wait.snapshot(),
+        )
+    return stats
+
+
+def pool_metrics(pools: Iterable[tuple[str, Pool]]) -> list[MetricFamily]:
+    """pool_stats of each ``(database, pool)`` as metric families labelled by database."""
+    gauges = {key: MetricFamily(f"db_pool_{key}", "gauge", doc, ("database",)) for key, doc in POOL_GAUGES.items()}
+    timeouts = MetricFamily(
+        "db_pool_checkout_timeouts_total", "counter", "Checkouts that gave up waiting for a connection.", ("database",)
+    )
+    wait = MetricFamily("db_pool_checkout_wait_seconds", "histogram", "Time to check out a connection.", ("database",))
+    for database, pool in pools:
+        stats = pool_stats(pool)
+        for key, family in gauges.items():
+            if key in stats:
+                family.samples[(database,)] = stats[key]
+        if "timeouts" in stats:
+            timeouts.samples[(database,)] = stats["timeouts"]
+            wait.samples[(database,)] = stats["checkout_wait_seconds"]
+    return [*gauges.values(), timeouts, wait]
@@ -0,0 +1,73 @@
+import heapq
+import re
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+# Bound parameters (psycopg pyformat) and literals that vary between calls of the same query
+_PARAMETER = re.compile(r"%\(\w+\)s|%s|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAMETER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+MAX_SQL_LENGTH = 1000
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    The statement with parameters and literals replaced by ``?``.
+
+    Lists of them collapse to ``?, ...`` so a query batched with 5 or 500
+    rows reads the same. Parameter values are never included: they carry
+    user data and the encryption key.
+    """
+    sql = _PARAMETER.sub("?", _WHITESPACE.sub(" ", statement).strip())
+    sql = _PARAMETER_LIST.sub("?, ...", sql)
+    return sql if len(sql) <= MAX_SQL_LENGTH else sql[:MAX_SQL_LENGTH] + "..."
+
+
+@dataclass
+class QueryTimer:
+    """Statements executed and time spent in the database within one unit of work (a request)."""
+
+    queries: int = 0
+    seconds: float = 0.0
+    keep_slowest: int = 3
+    _slowest: list[tuple[float, int, str]] = field(default_factory=list, repr=False)  # Min-heap
+
+    def record(self, seconds: float, statement: str = "") -> None:
+        self.queries += 1
+        self.seconds += seconds
+        if self.keep_slowest <= 0:
+            return
+        # The query number breaks ties so statements are never compared
+        entry = (seconds, self.queries, statement)
+        if len(self._slowest) < self.keep_slowest:
+            heapq.heappush(self._slowest, entry)
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def slowest(self) -> list[tuple[float, str]]:
+        """Up to ``keep_slowest`` ``(seconds, normalized sql)`` pairs, slowest first."""
+        return [(seconds, normalize_sql(statement)) for seconds, _, statement in sorted(self._slowest, reverse=True)]
+
+
+class QueryBudget:
+    """
+    The most statements one request may run; a test-only check.
+
+    Set as ``app.state.query_budget`` (the ``query_budget`` pytest marker
+    does it) and QueryProfilerMiddleware records every request over it.
+    """
+
+    def __init__(self, max_queries: int):
+        self.max_queries = max_queries
+        self.violations: list[str] = []
+
+    def check(self, method: str, route: str, timer: QueryTimer) -> None:
+        if timer.queries > self.max_queries:
+            statements = "".join(f"\n    {seconds * 1000:.1f} ms  {sql}" for seconds, sql in timer.slowest())
+            self.violations.append(
+                f"{method} {route} ran {timer.queries} queries (budget {self.max_queries}); slowest:{statements}"
+            )
+
+
+# Engine events add to the timer of the current context, if any
+query_timer_var: ContextVar[QueryTimer | None] = ContextVar("query_timer", default=None)
@@ -0,0 +1,102 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.infrastructure.logging.base_logger import BaseLogger
+
+# Weight of the newest probe in the latency moving average
+LATENCY_SMOOTHING = 0.3
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: AsyncEngine
+    session_factory: async_sessionmaker[AsyncSession]
+    healthy: bool = True
+    latency: float | None = None  # Exponential moving average of probe round trips, seconds
+    failures: int = 0
+    last_error: str | None = None
+    checked_at: float | None = field(default=None, repr=False)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "latency_ms": None if self.latency is None else round(self.latency * 1000, 3),
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+class ReplicaRouter:
+    """
+    Picks the replica for each read-only session.
+
+    Choice is "power of two choices": two random healthy replicas, keep the
+    faster one. That follows latency without sending every read to the single
+    fastest replica. A replica is marked down by a failed checkout or probe
+    and comes back when a periodic probe succeeds.
+    """
+
+    def __init__(self, replicas: list[Replica], logger: BaseLogger, rng: random.Random | None = None):
+        self.replicas = replicas
+        self.logger = logger
+        self._rng = rng or random.Random()
+
+    def candidates(self) -> list[Replica]:
+        """Healthy replicas in the order to try them (best first)."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if len(healthy) < 2:
+            return healthy
+        first, second = self._rng.sample(healthy, 2)
+        best = first if _latency(first) <= _latency(second) else second
+        return [best, *sorted((r for r in healthy if r is not best), key=_latency)]
+
+    def mark_failure(self, replica: Replica, error: BaseException) -> None:
+        if replica.healthy:
+            self.logger.warning("Read replica %s marked down: %s", replica.name, error)
+        replica.healthy = False
+        replica.failures += 1
+        replica.last_error = str(error)
+
+    def mark_success(self, replica: Replica, latency: float) -> None:
+        if not replica.healthy:
+            self.logger.info("Read replica %s is back", replica.name)
+        replica.healthy = True
+        replica.last_error = None
+        replica.latency = (
+            latency
+            if replica.latency is None
+            else LATENCY_SMOOTHING * latency + (1 - LATENCY_SMOOTHING) * replica.latency
+        )
+        replica.checked_at = time.monotonic()
+
+    async def probe(self, replica: Replica) -> None:
+        start = time.perf_counter()
+        try:
+            async with replica.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            self.mark_failure(replica, e)
+        else:
+            self.mark_success(replica, time.perf_counter() - start)
+
+    async def monitor(self, interval: float) -> None:
+        """Probe every replica each ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.gather(*(self.probe(replica) for replica in self.replicas))
+            await asyncio.sleep(interval)
+
+    def stats(self) -> list[dict[str, Any]]:
+        return [replica.stats() for replica in self.replicas]
+
+
+def _latency(replica: Replica) -> float:
+    # Unprobed replicas rank as fast so they get traffic and a measurement.
+    return replica.latency if replica.latency is not None else 0.0
@@ -1,79 +1,386 @@
+from collections.abc import AsyncIterator, Sequence
 from typing import Any, TypeVar
 
-from sqlalchemy import select
+from pydantic import BaseModel
+from sqlalchemy import Row, Select, inspect, select
+from sqlalchemy import delete as sql_delete
+from sqlalchemy import update as sql_update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from app.domain.repositories.base_repository import CRUDRepository
 from app.infrastructure.config import Settings
 from app.infrastructure.logging.base_logger import BaseLogger
+from app.infrastructure.metrics import instrument_async_methods, metrics_registry
 
 ModelType = TypeVar("ModelType")
 
+REPOSITORY_CALLS = metrics_registry.histogram(
+    "repository_call_duration_seconds",
+    "Duration of repository method calls, including time waiting for a connection.",
+    labels=("repository", "method"),
+)
+
 
 class BaseRepositoryImpl(CRUDRepository[ModelType]):
     """
     Base repository class for CRUD operations using SQLAlchemy.
+
+    The reads returning model objects, and ``update``, take ``columns``: the
+    only attributes to load (the primary key always is). Encrypted columns
+    are decrypted by the database as they are selected, so leaving them out
+    saves that work; attributes left unloaded raise when accessed. ``None``
+    loads what the mapping loads by default, which skips deferred columns.
     """
 
+    # Unique columns whose conflicts make create_many skip a row instead of failing the batch.
+    conflict_columns: tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        instrument_async_methods(cls, REPOSITORY_CALLS, cls.__name__)
+
     def __init__(self, model: type[ModelType], logger: BaseLogger, settings: Settings):
         self.model = model
         self.logger = logger
         self.settings = settings
+        self._view_columns: dict[type[BaseModel], list[Any]] = {}
 
-    async def create(self, db: AsyncSession, obj: ModelType) -> ModelType:
+    async def create(
+        self,
+        db: AsyncSession,
+        obj: ModelType,
+        *,
+        refresh_columns: Sequence[str] | None = None,
+    ) -> ModelType:
+        """Insert ``obj``, then reload ``refresh_columns`` from the row (default: all the mapping loads)."""
         try:
             db.add(obj)
             await db.commit()
-            await db.refresh(obj)
+            await db.refresh(obj, attribute_names=refresh_columns)
             return obj
         except SQLAlchemyError as e:
             await db.rollback()
-            self.logger.error(f"Error creating record: {str(e)}")
+            self.logger.error("Error creating record: %s", e)
+            raise
+
+    async def create_many(self, db: AsyncSession, objs: list[ModelType]) -> list[ModelType | None]:
+        """
+        Insert all objects with a single multi-row INSERT ... RETURNING.
+
+        Every object must set the same columns. Column types still apply their
+        bind expressions (e.g. encryption) per row. Rows that hit
+        ``conflict_columns``, in the table or earlier in the same batch, are
+        skipped and returned as None; inserted objects get their primary key set.
+        """
+        if not objs:
+            return []
+        mapper = inspect(self.model, raiseerr=True)
+        pk = mapper.primary_key[0]
+        rows = [
+            {
+                attr.key: getattr(obj, attr.key)
+                for attr in mapper.column_attrs
+                if attr.key in obj.__dict__ and not (attr.key == pk.key and getattr(obj, attr.key) is None)
+            }
+            for obj in objs
+        ]
+        key_columns = [mapper.local_table.c[name] for name in self.conflict_columns]
+
+        try:
+            stmt = insert(mapper.local_table).values(rows)
+            if key_columns:
+                stmt = stmt.on_conflict_do_nothing(index_elements=key_columns)
+            result = await db.execute(stmt.returning(pk, *key_columns))
+            returned = result.all()
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            self.logger.error("Error creating %s records: %s", len(objs), e)
+            raise
+
+        if not key_columns:
+            created: list[ModelType | None] = list(objs)
+            for obj, row in zip(objs, returned, strict=True):
+                setattr(obj, pk.key, row[0])
+            return created
+
+        ids = {tuple(row[1:]): row[0] for row in returned}
+        created = []
+        for obj, values in zip(objs, rows, strict=True):
+            new_id = ids.pop(tuple(values.get(column.key) for column in key_columns), None)
+            if new_id is None:
+                created.append(None)
+            else:
+                setattr(obj, pk.key, new_id)
+                created.append(obj)
+        return created
+
+    async def read(self, db: AsyncSession, id: Any, *, columns: Sequence[str] | None = None) -> ModelType | None:
+        try:
+            return await db.get(self.model, id, options=self._load_only(columns))
+        except SQLAlchemyError as e:
+            self.logger.error("Error reading record: %s", e)
             raise
 
-    async def read(self, db: AsyncSession, id: Any) -> ModelType | None:
+    async def read_all(
+        self,
+        db: AsyncSession,
+        *,
+        columns: Sequence[str] | None = None,
+        **filters: Any,
+    ) -> list[ModelType]:
         try:
-            return await db.get(self.model, id)
+            stmt = select(self.model).options(*self._load_only(columns))
+            if filters:
+                stmt = stmt.filter_by(**filters)
+            result = await db.execute(stmt)
+            return list(result.scalars().all())
         except SQLAlchemyError as e:
-            self.logger.error(f"Error reading record: {str(e)}")
+            self.logger.error("Error reading records: %s", e)
             raise
 
-    async def read_all(self, db: AsyncSession, **filters: Any) -> list[ModelType]:
+    async def read_page(
+        self,
+        db: AsyncSession,
+        *,
+        limit: int,
+        after: Any | None = None,
+        columns: Sequence[str] | None = None,
+        **filters: Any,
+    ) -> list[ModelType]:
+        """
+        Keyset pagination on the primary key.
+
+        Filtering on ``pk > after`` instead of using OFFSET lets the index seek
+        straight to the page, so deep pages cost the same as the first one.
+        """
         try:
-            stmt = select(self.model)
+            pk = inspect(self.model, raiseerr=True).primary_key[0]
+            stmt = select(self.model).options(*self._load_only(columns)).order_by(pk).limit(limit)
+            if after is not None:
+                stmt = stmt.where(pk > after)
             if filters:
                 stmt = stmt.filter_by(**filters)
             result = await db.execute(stmt)
             return list(result.scalars().all())
         except SQLAlchemyError as e:
-            self.logger.error(f"Error reading records: {str(e)}")
+            self.logger.error("Error reading page after %s: %s", after, e)
             raise
 
-    async def update(self, db: AsyncSession, id: Any, obj: ModelType) -> ModelType:
+    async def stream(
+        self,
+        db: AsyncSession,
+        *,
+        batch_size: int = 1000,
+        columns: Sequence[str] | None = None,
+        **filters: Any,
+    ) -> AsyncIterator[list[ModelType]]:
+        """
+        Iterate over all records through a server-side cursor.
+
+        Rows are fetched ``batch_size`` at a time (yield_per), so memory stays
+        bounded by one batch however large the table is.
+        """
         try:
-            db_obj = await self.read(db, id)
-            if not db_obj:
-                raise ValueError(f"{self.model.__name__} with id {id} not found")
-            values = obj.model_dump() if hasattr(obj, "model_dump") else obj.__dict__
-            for key, value in values.items():
-                setattr(db_obj, key, value)
+            pk = inspect(self.model, raiseerr=True).primary_key[0]
+            stmt = (
+                select(self.model)
+                .options(*self._load_only(columns))
+                .order_by(pk)
+                .execution_options(yield_per=batch_size)
+            )
+            if filters:
+                stmt = stmt.filter_by(**filters)
+            result = await db.stream_scalars(stmt)
+            async for partition in result.partitions():
+                yield list(partition)
+        except SQLAlchemyError as e:
+            self.logger.error("Error streaming records: %s", e)
+            raise
+
+    def _load_only(self, columns: Sequence[str] | None) -> list[Any]:
+        """Loader options for ``columns`` (see the class docstring); none for ``None``."""
+        if columns is None:
+            return []
+        column_attrs = inspect(self.model, raiseerr=True).column_attrs
+        missing = [name for name in columns if name not in column_attrs]
+        if missing:
+            raise ValueError(f"{missing} are not columns of {self.model.__name__}")
+        return [load_only(*(getattr(self.model, name) for name in columns), raiseload=True)]
+
+    async def exists(self, db: AsyncSession, **filters: Any) -> bool:
+        """Whether a row matches ``filters``; selects only the primary key, so nothing is decrypted."""
+        try:
+            pk = inspect(self.model, raiseerr=True).primary_key[0]
+            return await db.scalar(select(pk).filter_by(**filters).limit(1)) is not None
+        except SQLAlchemyError as e:
+            self.logger.error("Error checking for a record: %s", e)
+            raise
+
+    def view_columns(self, view: type[BaseModel]) -> list[Any]:
+        """The model's columns named like the fields of ``view``: what a projection selects."""
+        columns = self._view_columns.get(view)
+        if columns is None:
+            column_attrs = inspect(self.model, raiseerr=True).column_attrs
+            missing = [name for name in view.model_fields if name not in column_attrs]
+            if missing:
+                raise ValueError(f"{view.__name__} fields {missing} are not columns of {self.model.__name__}")
+            columns = [getattr(self.model, name) for name in view.model_fields]
+            self._view_columns[view] = columns
+        return columns
+
+    def _select_view(self, view: type[BaseModel], filters: dict[str, Any]) -> Select:
+        stmt = select(*self.view_columns(view))
+        return stmt.filter_by(**filters) if filters else stmt
+
+    @staticmethod
+    def _to_views[ViewT: BaseModel](view: type[ViewT], rows: Sequence[Row], validate: bool) -> list[ViewT]:
+        if validate:
+            return [view.model_validate(row._asdict()) for row in rows]
+        return [view.model_construct(**row._asdict()) for row in rows]
+
+    async def read_view[ViewT: BaseModel](
+        self,
+        db: AsyncSession,
+        view: type[ViewT],
+        *,
+        validate: bool = False,
+        **filters: Any,
+    ) -> ViewT | None:
+        """
+        The first matching row as a ``view`` read model, selecting only its columns.
+
+        Rows come back as plain tuples: no ORM object is built or tracked in
+        the session, and columns the view lacks (an encrypted password) are
+        never fetched or decrypted. The view is built once, without
+        validation unless ``validate``.
+        """
+        try:
+            row = (await db.execute(self._select_view(view, filters))).first()
+        except SQLAlchemyError as e:
+            self.logger.error("Error reading %s: %s", view.__name__, e)
+            raise
+        return None if row is None else self._to_views(view, [row], validate)[0]
+
+    async def read_view_page[ViewT: BaseModel](
+        self,
+        db: AsyncSession,
+        view: type[ViewT],
+        *,
+        limit: int,
+        after: Any | None = None,
+        validate: bool = False,
+        **filters: Any,
+    ) -> list[ViewT]:
+        """``read_page`` as ``view`` read models (see ``read_view``)."""
+        try:
+            pk = inspect(self.model, raiseerr=True).primary_key[0]
+            stmt = self._select_view(view, filters).order_by(pk).limit(limit)
+            if after is not None:
+                stmt = stmt.where(pk > after)
+            rows = (await db.execute(stmt)).all()
+        except SQLAlchemyError as e:
+            self.logger.error("Error reading %s page after %s: %s", view.__name__, after, e)
+            raise
+        return self._to_views(view, rows, validate)
+
+    async def stream_views[ViewT: BaseModel](
+        self,
+        db: AsyncSession,
+        view: type[ViewT],
+        *,
+        batch_size: int = 1000,
+        validate: bool = False,
+        **filters: Any,
+    ) -> AsyncIterator[list[ViewT]]:
+        """``stream`` as batches of ``view`` read models (see ``read_view``)."""
+        try:
+            pk = inspect(self.model, raiseerr=True).primary_key[0]
+            stmt = self._select_view(view, filters).order_by(pk).execution_options(yield_per=batch_size)
+            result = await db.stream(stmt)
+            async for partition in result.partitions():
+                yield self._to_views(view, partition, validate)
+        except SQLAlchemyError as e:
+            self.logger.error("Error streaming %s: %s", view.__name__, e)
+            raise
+
+    async def update(
+        self,
+        db: AsyncSession,
+        id: Any,
+        values: dict[str, Any],
+        *,
+        columns: Sequence[str] | None = None,
+    ) -> ModelType | None:
+        """
+        Apply ``values`` with a single ``UPDATE ... WHERE pk = :id RETURNING``.
+
+        Only the given columns are written, and the row comes back in the same
+        round trip (``columns`` of it); ``None`` means no row has that id.
+        Empty ``values`` fall back to a plain read.
+        """
+        if not values:
+            return await self.read(db, id, columns=columns)
+        try:
+            pk = inspect(self.model, raiseerr=True).primary_key[0]
+            stmt = (
+                sql_update(self.model)
+                .where(pk == id)
+                .values(**values)
+                .returning(self.model)
+                .options(*self._load_only(columns))
+                .execution_options(synchronize_session=False)
+            )
+            result = await db.execute(stmt)
+            db_obj = result.scalars().first()
             await db.commit()
-            await db.refresh(db_obj)
             return db_obj
         except SQLAlchemyError as e:
             await db.rollback()
-            self.logger.error(f"Error updating record with id {id}: {str(e)}")
+            self.logger.error("Error updating record with id %s: %s", id, e)
+            raise
+
+    async def update_view[ViewT: BaseModel](
+        self,
+        db: AsyncSession,
+        id: Any,
+        values: dict[str, Any],
+        view: type[ViewT],
+        *,
+        validate: bool = False,
+    ) -> ViewT | None:
+        """``update`` returning only ``view``'s columns, as a ``view`` read model (see ``read_view``)."""
+        pk = inspect(self.model, raiseerr=True).primary_key[0]
+        if not values:
+            return await self.read_view(db, view, validate=validate, **{pk.key: id})
+        try:
+            stmt = (
+                sql_update(self.model)
+                .where(pk == id)
+                .values(**values)
+                .returning(*self.view_columns(view))
+                .execution_options(synchronize_session=False)
+            )
+            row = (await db.execute(stmt)).first()
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            self.logger.error("Error updating %s with id %s: %s", view.__name__, id, e)
             raise
+        return None if row is None else self._to_views(view, [row], validate)[0]
 
-    async def delete(self, db: AsyncSession, id: Any) -> None:
+    async def delete(self, db: AsyncSession, id: Any) -> bool:
+        """Delete with a single ``DELETE ... RETURNING pk``; returns whether a row was removed."""
         try:
-            db_obj = await self.read(db, id)
-            if not db_obj:
-                raise ValueError(f"{self.model.__name__} with id {id} not found")
-            await db.delete(db_obj)
+            pk = inspect(self.model, raiseerr=True).primary_key[0]
+            result = await db.execute(sql_delete(self.model).where(pk == id).returning(pk))
+            deleted = result.first() is not None
             await db.commit()
+            return deleted
         except SQLAlchemyError as e:
             await db.rollback()
-            self.logger.error(f"Error deleting record with id {id}: {str(e)}")
+            self.logger.error("Error deleting record with id %s: %s", id, e)
             raise
@@ -0,0 +1,144 @@
+from collections.abc import Sequence
+from typing import cast
+
+from sqlalchemy import CursorResult, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.config import Settings
+from app.infrastructure.database.models.user import User as UserModel
+from app.infrastructure.database.models.user_import import UserImport, user_import_staging
+from app.infrastructure.database.repositories.base_repository_impl import (
+    BaseRepositoryImpl,
+)
+from app.infrastructure.logging.base_logger import BaseLogger
+from app.infrastructure.security import email_blind_index
+
+# (line_no, email, full_name, hashed_password)
+type StagedRow = tuple[int, str, str, str]
+
+STAGING_COLUMNS = ("import_id", "line_no", "email", "email_hash", "full_name", "hashed_password")
+
+
+class UserImportRepository(BaseRepositoryImpl[UserImport]):
+    """
+    Staging and merge steps of the bulk user import.
+
+    Rows are loaded into an unlogged staging table with COPY; each chunk is
+    committed together with the job checkpoint so a crashed import resumes
+    exactly where it stopped. The merge encrypts and inserts everything in
+    a single statement.
+    """
+
+    def __init__(self, logger: BaseLogger, settings: Settings):
+        super().__init__(UserImport, logger, settings)
+
+    async def get_or_create_job(self, db: AsyncSession, import_id: str, source: str) -> UserImport:
+        """Return the job for ``import_id``, creating it on first run."""
+        job = await db.scalar(select(UserImport).where(UserImport.import_id == import_id))
+        if job is None:
+            job = await self.create(db, UserImport(import_id=import_id, source=source[:255]))
+        return job
+
+    async def stage_chunk(
+        self,
+        db: AsyncSession,
+        job: UserImport,
+        rows: Sequence[StagedRow],
+        rows_read: int,
+        rows_failed: int,
+    ) -> None:
+        """COPY a chunk into staging and advance the checkpoint in the same transaction."""
+        try:
+            connection = await db.connection()
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            if driver_connection is None:
+                raise RuntimeError("COPY needs a live psycopg connection")
+            table = connection.dialect.identifier_preparer.format_table(user_import_staging)
+            copy_sql = f"COPY {table} ({', '.join(STAGING_COLUMNS)}) FROM STDIN"
+
+            async with driver_connection.cursor() as cursor:
+                async with cursor.copy(copy_sql) as copy:
+                    for line_no, email, full_name, hashed_password in rows:
+                        await copy.write_row(
+                            (job.import_id, line_no, email, email_blind_index(email), full_name, hashed_password)
+                        )
+
+            await db.execute(
+                update(UserImport)
+                .where(UserImport.id == job.id)
+                .values(
+                    rows_read=UserImport.rows_read + rows_read,
+                    rows_staged=UserImport.rows_staged + len(rows),
+                    rows_failed=UserImport.rows_failed + rows_failed,
+                )
+            )
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            self.logger.error("Error staging import %s: %s", job.import_id, e)
+            raise
+        await db.refresh(job)
+
+    async def merge(self, db: AsyncSession, job: UserImport) -> int:
+        """
+        Encrypt staged rows into users with one INSERT ... SELECT and mark the job done.
+
+        The staged rows are consumed by a DELETE ... RETURNING in the same
+        statement. Emails that already exist, or repeat within the import,
+        are skipped (first line wins). Returns the number of users inserted.
+        """
+        key = self.settings.SECRET_KEY
+        staging = user_import_staging
+        moved = (
+            staging.delete()
+            .where(staging.c.import_id == job.import_id)
+            .returning(*(staging.c[name] for name in STAGING_COLUMNS[1:]))
+            .cte("moved")
+        )
+        now = func.timezone("utc", func.now())
+        rows = select(
+            func.pgp_sym_encrypt(moved.c.email, key, "cipher-algo=aes256"),
+            moved.c.email_hash,
+            func.pgp_sym_encrypt(moved.c.full_name, key, "cipher-algo=aes256"),
+            func.pgp_sym_encrypt(moved.c.hashed_password, key, "cipher-algo=aes256"),
+            literal(True),
+            literal(False),
+            now,
+            now,
+        ).order_by(moved.c.line_no)
+        stmt = (
+            insert(UserModel.__table__)
+            .from_select(
+                [
+                    "email",
+                    "email_hash",
+                    "full_name",
+                    "hashed_password",
+                    "is_active",
+                    "is_superuser",
+                    "created_at",
+                    "updated_at",
+                ],
+                rows,
+            )
+            .on_conflict_do_nothing(index_elements=["email_hash"])
+            .add_cte(moved)
+        )
+
+        try:
+            result = cast(CursorResult, await db.execute(stmt))
+            merged = result.rowcount
+            await db.execute(
+                update(UserImport)
+                .where(UserImport.id == job.id)
+                .values(status="done", rows_merged=UserImport.rows_merged + merged)
+            )
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            self.logger.error("Error merging import %s: %s", job.import_id, e)
+            raise
+        await db.refresh(job)
+        return merged
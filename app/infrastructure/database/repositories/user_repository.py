@@ -1,4 +1,8 @@
-from sqlalchemy import select
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities.user import UserEntity
@@ -11,29 +15,51 @@ from app.infrastructure.database.repositories.base_repository_impl import (
     BaseRepositoryImpl,
 )
 from app.infrastructure.logging.base_logger import BaseLogger
+from app.infrastructure.security import email_blind_index
+
+# What entity reads load: every field of UserEntity, the deferred hashed_password included
+ENTITY_COLUMNS = tuple(UserEntity.model_fields)
+# Reloaded after an insert; the encrypted columns hold what was just written
+INSERT_REFRESH_COLUMNS = ("id", "is_active", "is_superuser")
 
 
 class UserRepository(BaseRepositoryImpl[UserModel], UserRepositoryInterface):
     """
     Repository class for User operations.
+
+    Entity reads load hashed_password explicitly (it is deferred on the
+    model), so they decrypt all three encrypted columns. Reads that don't
+    need all of them use the views, which decrypt only the view's, or the
+    ``*_exists`` checks, which decrypt none.
     """
 
+    conflict_columns = ("email_hash",)
+
     def __init__(self, logger: BaseLogger, settings: Settings):
         super().__init__(UserModel, logger, settings)
 
     async def create_user(self, db: AsyncSession, user: UserEntity) -> UserEntity:
         """Create a new user."""
         db_user = self._to_model(user)
-        created_user = await self.create(db, db_user)
+        created_user = await self.create(db, db_user, refresh_columns=INSERT_REFRESH_COLUMNS)
         return self._to_entity(created_user)
 
+    async def create_users(self, db: AsyncSession, users: list[UserEntity]) -> list[UserEntity | None]:
+        """Create users with one multi-row INSERT; duplicates by email come back as None."""
+        created = await self.create_many(db, [self._to_model(user) for user in users])
+        return [None if db_user is None else self._to_entity(db_user) for db_user in created]
+
     async def get_user_by_email(
         self,
         db: AsyncSession,
         email: str,
     ) -> UserEntity | None:
-        """Get a user by email."""
-        stmt = select(UserModel).where(UserModel.decrypted_email == email)  # type: ignore[arg-type]
+        """Get a user by email (single probe on the blind index)."""
+        stmt = (
+            select(UserModel)
+            .options(*self._load_only(ENTITY_COLUMNS))
+            .where(UserModel.email_hash == email_blind_index(email))
+        )
         result = await db.execute(stmt)
         db_user = result.scalars().first()
         if db_user is None:
@@ -42,24 +68,161 @@ class UserRepository(BaseRepositoryImpl[UserModel], UserRepositoryInterface):
 
     async def get_user_by_id(self, db: AsyncSession, user_id: int) -> UserEntity | None:
         """Get a user by ID."""
-        db_user = await self.read(db, user_id)
+        db_user = await self.read(db, user_id, columns=ENTITY_COLUMNS)
         if db_user is None:
             return None
         return self._to_entity(db_user)
 
+    async def list_users(
+        self,
+        db: AsyncSession,
+        *,
+        limit: int,
+        after_id: int | None = None,
+    ) -> list[UserEntity]:
+        """List users ordered by ID, starting after ``after_id``."""
+        db_users = await self.read_page(db, limit=limit, after=after_id, columns=ENTITY_COLUMNS)
+        return [self._to_entity(db_user) for db_user in db_users]
+
+    async def stream_users(self, db: AsyncSession, *, batch_size: int = 1000) -> AsyncIterator[list[UserEntity]]:
+        """Stream all users in ID order, one batch of entities at a time."""
+        async for db_users in self.stream(db, batch_size=batch_size, columns=ENTITY_COLUMNS):
+            yield [self._to_entity(db_user) for db_user in db_users]
+
+    async def get_user_view[ViewT: BaseModel](
+        self,
+        db: AsyncSession,
+        user_id: int,
+        view: type[ViewT],
+        *,
+        validate: bool = False,
+    ) -> ViewT | None:
+        """Only ``view``'s columns of a user, by ID; no entity or ORM object is built."""
+        return await self.read_view(db, view, validate=validate, id=user_id)
+
+    async def get_user_view_by_email[ViewT: BaseModel](
+        self,
+        db: AsyncSession,
+        email: str,
+        view: type[ViewT],
+        *,
+        validate: bool = False,
+    ) -> ViewT | None:
+        """Only ``view``'s columns of a user, by email (blind index probe)."""
+        return await self.read_view(db, view, validate=validate, email_hash=email_blind_index(email))
+
+    async def list_user_views[ViewT: BaseModel](
+        self,
+        db: AsyncSession,
+        view: type[ViewT],
+        *,
+        limit: int,
+        after_id: int | None = None,
+        validate: bool = False,
+    ) -> list[ViewT]:
+        """``list_users`` selecting only ``view``'s columns."""
+        return await self.read_view_page(db, view, limit=limit, after=after_id, validate=validate)
+
+    async def stream_user_views[ViewT: BaseModel](
+        self,
+        db: AsyncSession,
+        view: type[ViewT],
+        *,
+        batch_size: int = 1000,
+        validate: bool = False,
+    ) -> AsyncIterator[list[ViewT]]:
+        """``stream_users`` selecting only ``view``'s columns."""
+        async for views in self.stream_views(db, view, batch_size=batch_size, validate=validate):
+            yield views
+
     async def update_user(
         self,
         db: AsyncSession,
         user_id: int,
-        user: UserEntity,
-    ) -> UserEntity:
-        """Update a user."""
-        db_user = await self.update(db, user_id, self._to_model(user))
+        changes: dict[str, Any],
+    ) -> UserEntity | None:
+        """Update only the changed columns, keeping the email blind index in sync."""
+        db_user = await self.update(db, user_id, self._update_values(changes), columns=ENTITY_COLUMNS)
+        if db_user is None:
+            return None
         return self._to_entity(db_user)
 
-    async def delete_user(self, db: AsyncSession, user_id: int) -> None:
+    async def update_user_view[ViewT: BaseModel](
+        self,
+        db: AsyncSession,
+        user_id: int,
+        changes: dict[str, Any],
+        view: type[ViewT],
+        *,
+        validate: bool = False,
+    ) -> ViewT | None:
+        """``update_user`` returning only ``view``'s columns."""
+        return await self.update_view(db, user_id, self._update_values(changes), view, validate=validate)
+
+    async def user_exists(self, db: AsyncSession, user_id: int) -> bool:
+        """Whether a user has this ID; reads only the primary key."""
+        return await self.exists(db, id=user_id)
+
+    async def email_exists(self, db: AsyncSession, email: str) -> bool:
+        """Whether a user has this email; probes the blind index and decrypts nothing."""
+        return await self.exists(db, email_hash=email_blind_index(email))
+
+    async def delete_user(self, db: AsyncSession, user_id: int) -> bool:
         """Delete a user."""
-        await self.delete(db, user_id)
+        return await self.delete(db, user_id)
+
+    async def prime_statements(self, db: AsyncSession, views: Sequence[type[BaseModel]] = ()) -> None:
+        """
+        Run the hot lookups once with placeholder values so a warming connection
+        prepares them, including their projections onto ``views``.
+        """
+        await self.get_user_by_id(db, 0)
+        await self.get_user_by_email(db, "warm-up@invalid")
+        await self.list_users(db, limit=1)
+        await self.user_exists(db, 0)
+        await self.email_exists(db, "warm-up@invalid")
+        for view in views:
+            await self.get_user_view(db, 0, view)
+            await self.get_user_view_by_email(db, "warm-up@invalid", view)
+            await self.list_user_views(db, view, limit=1)
+
+    async def backfill_email_index(self, db: AsyncSession, batch_size: int = 1000) -> int:
+        """
+        Populate email_hash for rows that have none.
+
+        The migration that adds the column fills it; this catches rows written
+        without one afterwards (e.g. by an older build during a rollout). Walks
+        them in primary key order, committing once per batch so the routine can
+        be interrupted and re-run safely. Returns the number of rows updated.
+        """
+        total = 0
+        while True:
+            stmt = (
+                select(UserModel.id, UserModel.email)
+                .where(UserModel.email_hash.is_(None))
+                .order_by(UserModel.id)
+                .limit(batch_size)
+            )
+            rows = (await db.execute(stmt)).all()
+            if not rows:
+                break
+
+            await db.execute(
+                update(UserModel),
+                [{"id": row.id, "email_hash": email_blind_index(row.email)} for row in rows],
+            )
+            await db.commit()
+            total += len(rows)
+            self.logger.info("Email blind index backfilled for %s users", total)
+        return total
+
+    @staticmethod
+    def _update_values(changes: dict[str, Any]) -> dict[str, Any]:
+        """Column values for ``changes``, with the email blind index following the email."""
+        values = dict(changes)
+        if values.get("email") is not None:
+            values["email_hash"] = email_blind_index(values["email"])
+        return values
 
     def _to_entity(self, model: UserModel) -> UserEntity:
         """Convert database model to domain entity."""
@@ -77,6 +240,7 @@ class UserRepository(BaseRepositoryImpl[UserModel], UserRepositoryInterface):
         return UserModel(
             id=entity.id,
             email=entity.email,
+            email_hash=email_blind_index(entity.email),
             full_name=entity.full_name,
             hashed_password=entity.hashed_password,
             is_active=entity.is_active,
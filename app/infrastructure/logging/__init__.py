@@ -1,12 +1,22 @@
 import logging
 
-from app.infrastructure.config import Settings
+from app.infrastructure.config import get_settings
 
 from .custom_logger import CustomLogger
+from .formatters import JsonFormatter
+from .handlers import queue_stats
 
-settings = Settings.load_configs()
+settings = get_settings()
 
 # Create default logger instance configured from settings
-logger: logging.Logger = CustomLogger(name=settings.LOG_NAME, level=settings.LOG_LEVEL)._logger
+logger: logging.Logger = CustomLogger(
+    name=settings.LOG_NAME,
+    level=settings.LOG_LEVEL,
+    lazy=True,
+    log_format=settings.LOG_FORMAT,
+    queue_size=settings.LOG_QUEUE_SIZE,
+    overflow=settings.LOG_OVERFLOW,
+    block_timeout=settings.LOG_BLOCK_TIMEOUT,
+)._logger
 
-__all__ = ["CustomLogger", "logger"]
+__all__ = ["CustomLogger", "JsonFormatter", "logger", "queue_stats"]
@@ -4,26 +4,29 @@ from abc import ABC, abstractmethod
 class BaseLogger(ABC):
     """
     Abstract base class for all logger implementations.
+
+    Messages take lazy ``%``-style arguments (``logger.debug("user %s", user_id)``):
+    they are only formatted when the level is enabled.
     """
 
     @abstractmethod
-    def debug(self, msg: str) -> None:
+    def debug(self, msg: str, *args: object) -> None:
         pass
 
     @abstractmethod
-    def info(self, msg: str) -> None:
+    def info(self, msg: str, *args: object) -> None:
         pass
 
     @abstractmethod
-    def warning(self, msg: str) -> None:
+    def warning(self, msg: str, *args: object) -> None:
         pass
 
     @abstractmethod
-    def error(self, msg: str) -> None:
+    def error(self, msg: str, *args: object) -> None:
         pass
 
     @abstractmethod
-    def critical(self, msg: str) -> None:
+    def critical(self, msg: str, *args: object) -> None:
         pass
 
     @abstractmethod
@@ -0,0 +1,18 @@
+import logging
+from contextvars import ContextVar
+
+# Set by the access-log middleware for the duration of each request
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Stamps every record with the current request id (``-`` outside a request).
+
+    Attached to the handlers on the logger itself, so it runs on the thread
+    that logged, before a queue hands the record to the writer thread.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
@@ -1,16 +1,68 @@
+import atexit
 import logging
+import queue
+import sys
+import threading
+from collections.abc import Callable
 from pathlib import Path
 from typing import Literal
 
-import coloredlogs
-
 from .base_logger import BaseLogger
+from .context import RequestContextFilter
+from .formatters import JsonFormatter
+from .handlers import BoundedQueueHandler, BoundedQueueListener, OverflowPolicy
+
+LogFormat = Literal["text", "json"]
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+
+
+# One exit hook flushes whatever every logger still has queued
+_running_listeners: set[BoundedQueueListener] = set()
+
+
+@atexit.register
+def _stop_running_listeners() -> None:
+    for listener in list(_running_listeners):
+        listener.stop()
+    _running_listeners.clear()
+
+
+class _DeferredFormatter(logging.Formatter):
+    """
+    Formatter that builds the real one when the first record is formatted.
+
+    Keeps coloredlogs out of import time while the handlers themselves are
+    installed up front.
+    """
+
+    _build_lock = threading.Lock()
+
+    def __init__(self, build: Callable[[], logging.Formatter]):
+        super().__init__()
+        self._build = build
+        self._formatter: logging.Formatter | None = None
+
+    def format(self, record: logging.LogRecord) -> str:
+        if self._formatter is None:
+            with self._build_lock:
+                if self._formatter is None:
+                    self._formatter = self._build()
+        return self._formatter.format(record)
 
 
 class CustomLogger(BaseLogger):
     """
     Custom logging implementation with colored output and file logging support.
     Inherits from BaseLogger abstract class.
+
+    With ``queue_size`` > 0 the logger only enqueues records; a listener
+    thread formats them and writes to the console/file handlers, so a slow
+    stdout never blocks the event loop (see BoundedQueueHandler for the
+    ``overflow`` policies). ``log_format="json"`` writes one JSON object per
+    line; text output is colored only when stderr is a TTY. With ``lazy``
+    the handlers are installed at once, but importing coloredlogs and
+    opening the log file wait for the first record.
     """
 
     def __init__(
@@ -19,34 +71,72 @@ class CustomLogger(BaseLogger):
         level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
         file_path: Path | None = None,
         file_level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] | None = None,
+        lazy: bool = False,
+        log_format: LogFormat = "text",
+        queue_size: int = 0,
+        overflow: OverflowPolicy = "drop_new",
+        block_timeout: float = 0.1,
     ):
         self._name = name
         self._level = level
         self._file_path = file_path
         self._file_level = file_level
+        self._log_format = log_format
+        self._queue_size = queue_size
+        self._overflow = overflow
+        self._block_timeout = block_timeout
+        self._listener: BoundedQueueListener | None = None
+        self._lazy = lazy
         self._logger = logging.getLogger(self._name)
         self._initialize_logger()
 
-    def _initialize_logger(self):
+    def _initialize_logger(self) -> None:
         """Initialize or reinitialize the logger"""
         self._logger.setLevel(self._level)
 
         # Clear existing handlers
+        self._stop_listener()
         self._logger.handlers.clear()
 
-        # Setup console handler
-        self._setup_console_handler()
-
-        # Setup file handler if needed
+        handlers = [self._console_handler()]
         if self._file_path:
-            self._setup_file_handler()
-
-    def _setup_console_handler(self):
-        """Configure colored console logging"""
-        coloredlogs.install(
-            logger=self._logger,
-            level=self._level,
-            fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+            handlers.append(self._file_handler(self._file_path))
+
+        if self._queue_size > 0:
+            log_queue: queue.Queue[logging.LogRecord] = queue.Queue(self._queue_size)
+            self._listener = BoundedQueueListener(log_queue, *handlers, respect_handler_level=True)
+            self._listener.start()
+            _running_listeners.add(self._listener)
+            handlers = [BoundedQueueHandler(log_queue, self._overflow, self._block_timeout)]
+        for handler in handlers:
+            handler.addFilter(RequestContextFilter())
+            self._logger.addHandler(handler)
+
+    def _stop_listener(self) -> None:
+        if self._listener is not None:
+            _running_listeners.discard(self._listener)
+            self._listener.stop()
+            self._listener = None
+
+    def _console_handler(self) -> logging.Handler:
+        """Console handler on stderr: JSON, colored text on a TTY, plain text otherwise"""
+        handler = logging.StreamHandler(sys.stderr)
+        if self._log_format == "json":
+            handler.setFormatter(JsonFormatter())
+        elif sys.stderr.isatty():
+            handler.setFormatter(
+                _DeferredFormatter(self._colored_formatter) if self._lazy else self._colored_formatter()
+            )
+        else:
+            handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        return handler
+
+    @staticmethod
+    def _colored_formatter() -> logging.Formatter:
+        import coloredlogs  # Deferred: only needed for interactive terminals
+
+        return coloredlogs.ColoredFormatter(
+            fmt=TEXT_FORMAT,
             field_styles={
                 "asctime": {"color": "green"},
                 "name": {"color": "blue"},
@@ -62,28 +152,28 @@ class CustomLogger(BaseLogger):
             },
         )
 
-    def _setup_file_handler(self):
+    def _file_handler(self, file_path: Path) -> logging.Handler:
         """Configure file logging"""
-        self._file_path.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(self._file_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.FileHandler(file_path, delay=self._lazy)
         file_handler.setLevel(self._file_level or self._level)
-        file_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
-        self._logger.addHandler(file_handler)
+        file_handler.setFormatter(JsonFormatter() if self._log_format == "json" else logging.Formatter(TEXT_FORMAT))
+        return file_handler
 
-    def debug(self, msg: str) -> None:
-        self._logger.debug(msg)
+    def debug(self, msg: str, *args: object) -> None:
+        self._logger.debug(msg, *args)
 
-    def info(self, msg: str) -> None:
-        self._logger.info(msg)
+    def info(self, msg: str, *args: object) -> None:
+        self._logger.info(msg, *args)
 
-    def warning(self, msg: str) -> None:
-        self._logger.warning(msg)
+    def warning(self, msg: str, *args: object) -> None:
+        self._logger.warning(msg, *args)
 
-    def error(self, msg: str) -> None:
-        self._logger.error(msg)
+    def error(self, msg: str, *args: object) -> None:
+        self._logger.error(msg, *args)
 
-    def critical(self, msg: str) -> None:
-        self._logger.critical(msg)
+    def critical(self, msg: str, *args: object) -> None:
+        self._logger.critical(msg, *args)
 
     def reload(self) -> None:
         """Reload logger configuration"""
@@ -91,5 +181,6 @@ class CustomLogger(BaseLogger):
 
     def reset(self) -> None:
         """Reset logger to initial state"""
+        self._stop_listener()
         self._logger.handlers.clear()
         self._initialize_logger()
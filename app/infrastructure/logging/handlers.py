@@ -0,0 +1,85 @@
+import copy
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Literal
+
+OverflowPolicy = Literal["drop_new", "drop_oldest", "block"]
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler over a bounded queue that never stalls the caller for long.
+
+    Only the message is rendered on the calling thread (so mutable args are
+    captured as they were); formatting and I/O happen in the listener
+    thread. When the queue is full the ``overflow`` policy decides:
+    ``drop_new`` discards the record, ``drop_oldest`` makes room by
+    discarding the oldest queued one, and ``block`` waits up to
+    ``block_timeout`` seconds before dropping. Drops are counted.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        overflow: OverflowPolicy = "drop_new",
+        block_timeout: float = 0.1,
+    ):
+        super().__init__(log_queue)
+        self._queue = log_queue  # Typed as a real Queue (QueueHandler.queue is a protocol)
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Tracebacks reference live frames; render them before handing off
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self._queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if self.overflow == "block":
+            try:
+                self._queue.put(record, timeout=self.block_timeout)
+                return
+            except queue.Full:
+                pass
+        elif self.overflow == "drop_oldest":
+            try:
+                self._queue.get_nowait()
+                self._queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+        self.dropped += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "capacity": self._queue.maxsize,
+            "overflow": self.overflow,
+            "dropped": self.dropped,
+        }
+
+
+class BoundedQueueListener(QueueListener):
+    """QueueListener whose stop() waits for room instead of failing on a full queue."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)  # type: ignore[attr-defined]
+
+
+def queue_stats(logger: logging.Logger) -> dict[str, Any] | None:
+    """Stats of the logger's background queue, or None when it logs synchronously."""
+    for handler in logger.handlers:
+        if isinstance(handler, BoundedQueueHandler):
+            return handler.stats()
+    return None
@@ -0,0 +1,22 @@
+from .exposition import CONTENT_TYPE, render
+from .histogram import DEFAULT_BUCKETS, Histogram
+from .multiprocess import MultiprocessCollector
+from .registry import Counter, HistogramFamily, MetricFamily, MetricsRegistry
+from .timing import instrument_async_methods
+
+# Process-wide registry that instrumented modules record into
+metrics_registry = MetricsRegistry()
+
+__all__ = [
+    "CONTENT_TYPE",
+    "DEFAULT_BUCKETS",
+    "Counter",
+    "Histogram",
+    "HistogramFamily",
+    "MetricFamily",
+    "MetricsRegistry",
+    "MultiprocessCollector",
+    "instrument_async_methods",
+    "metrics_registry",
+    "render",
+]
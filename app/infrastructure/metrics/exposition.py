@@ -0,0 +1,48 @@
+import math
+from collections.abc import Iterable
+
+from app.infrastructure.metrics.registry import LabelValues, MetricFamily
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def render(families: Iterable[MetricFamily]) -> str:
+    """Metric families in the Prometheus text exposition format (0.0.4)."""
+    lines: list[str] = []
+    for family in families:
+        lines.append(f"# HELP {family.name} {_escape_help(family.documentation)}")
+        lines.append(f"# TYPE {family.name} {family.kind}")
+        for label_values, value in sorted(family.samples.items()):
+            labels = _labels(family.label_names, label_values)
+            if family.kind != "histogram":
+                lines.append(f"{family.name}{labels} {_format_value(value)}")
+                continue
+            for bound, count in value["buckets"].items():
+                bucket_labels = _labels((*family.label_names, "le"), (*label_values, bound))
+                lines.append(f"{family.name}_bucket{bucket_labels} {count}")
+            lines.append(f"{family.name}_sum{labels} {_format_value(value['sum'])}")
+            lines.append(f"{family.name}_count{labels} {value['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def _labels(names: tuple[str, ...], values: LabelValues) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label(value)}"' for name, value in zip(names, values, strict=True))
+    return "{" + pairs + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", r"\\").replace("\n", r"\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
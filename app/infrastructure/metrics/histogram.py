@@ -0,0 +1,38 @@
+import threading
+from bisect import bisect_left
+from collections.abc import Sequence
+from typing import Any
+
+# Upper bounds in seconds, tuned for sub-second operations (DB checkouts, hashing, requests).
+DEFAULT_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    Thread-safe histogram with fixed upper bounds and an implicit +Inf bucket.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self._bounds = tuple(sorted(buckets))
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return cumulative bucket counts (``le`` semantics), total count and sum."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        buckets: dict[str, int] = {}
+        running = 0
+        for bound, count in zip((*self._bounds, float("inf")), counts, strict=True):
+            running += count
+            buckets["+Inf" if bound == float("inf") else repr(bound)] = running
+        return {"buckets": buckets, "count": running, "sum": total}
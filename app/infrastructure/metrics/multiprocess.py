@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from app.infrastructure.metrics.registry import MetricFamily, MetricsRegistry
+
+FILE_PREFIX = "metrics-"
+
+
+class MultiprocessCollector:
+    """
+    Combines the metrics of every worker process sharing ``directory``.
+
+    Each worker writes its registry to ``metrics-<pid>.json`` in the
+    directory (every ``flush`` and on scrape), and a scrape of any worker
+    merges all files: counters and histograms are summed over every file,
+    including workers that have exited, so totals never go backwards when a
+    worker is replaced; gauges are summed over live workers only. Values of
+    other workers are at most one flush interval old.
+
+    The directory must be emptied before the server starts.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        directory: str | Path,
+        is_alive: Callable[[int], bool] | None = None,
+    ):
+        self.registry = registry
+        self.directory = Path(directory)
+        self._is_alive = is_alive or _pid_alive
+        self._flusher: asyncio.Task[None] | None = None
+
+    def flush(self) -> None:
+        """Write this process's metrics; atomic, so readers never see a partial file."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        pid = os.getpid()
+        path = self.directory / f"{FILE_PREFIX}{pid}.json"
+        # Per thread: the periodic flush and a scrape may write at the same time
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps([_dump(family) for family in self.registry.collect()]))
+        os.replace(tmp, path)
+
+    def collect(self) -> list[MetricFamily]:
+        self.flush()
+        merged: dict[str, MetricFamily] = {}
+        for path in sorted(self.directory.glob(f"{FILE_PREFIX}*.json")):
+            try:
+                pid = int(path.stem.removeprefix(FILE_PREFIX))
+                families = json.loads(path.read_text())
+            except (ValueError, OSError):
+                continue  # Not ours, or removed while listing
+            alive = self._is_alive(pid)
+            for data in families:
+                family = _load(data)
+                if family.kind == "gauge" and not alive:
+                    continue
+                _merge(merged.setdefault(family.name, _empty(family)), family)
+        return list(merged.values())
+
+    def start(self, interval: float) -> None:
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        self.flush()
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(self.flush)
+
+
+def _dump(family: MetricFamily) -> dict[str, Any]:
+    return {
+        "name": family.name,
+        "kind": family.kind,
+        "documentation": family.documentation,
+        "label_names": list(family.label_names),
+        "samples": [[list(label_values), value] for label_values, value in family.samples.items()],
+    }
+
+
+def _load(data: dict[str, Any]) -> MetricFamily:
+    return MetricFamily(
+        name=data["name"],
+        kind=data["kind"],
+        documentation=data["documentation"],
+        label_names=tuple(data["label_names"]),
+        samples={tuple(label_values): value for label_values, value in data["samples"]},
+    )
+
+
+def _empty(family: MetricFamily) -> MetricFamily:
+    return MetricFamily(family.name, family.kind, family.documentation, family.label_names)
+
+
+def _merge(into: MetricFamily, family: MetricFamily) -> None:
+    for label_values, value in family.samples.items():
+        current = into.samples.get(label_values)
+        into.samples[label_values] = value if current is None else _add(current, value)
+
+
+def _add(current: Any, value: Any) -> Any:
+    if not isinstance(current, dict):
+        return current + value
+    buckets = dict(current["buckets"])
+    for bound, count in value["buckets"].items():
+        buckets[bound] = buckets.get(bound, 0) + count
+    return {"buckets": buckets, "count": current["count"] + value["count"], "sum": current["sum"] + value["sum"]}
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, owned by someone else
+    return True
@@ -0,0 +1,150 @@
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from app.infrastructure.metrics.histogram import DEFAULT_BUCKETS, Histogram
+
+type LabelValues = tuple[str, ...]
+type MetricKind = Literal["counter", "gauge", "histogram"]
+
+
+@dataclass
+class MetricFamily:
+    """
+    Point-in-time values of one metric.
+
+    ``samples`` maps label values (in ``label_names`` order) to a number, or
+    to a ``Histogram.snapshot()`` for histograms.
+    """
+
+    name: str
+    kind: MetricKind
+    documentation: str
+    label_names: tuple[str, ...] = ()
+    samples: dict[LabelValues, Any] = field(default_factory=dict)
+
+
+type Collector = Callable[[], Iterable[MetricFamily]]
+
+
+class Counter:
+    """
+    Monotonic counter with one value per label combination.
+    """
+
+    kind: MetricKind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values: dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            samples = dict(self._values)
+        return MetricFamily(self.name, self.kind, self.documentation, self.label_names, samples)
+
+
+class HistogramFamily:
+    """
+    One Histogram per label combination, created on first use.
+    """
+
+    kind: MetricKind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._buckets = tuple(buckets)
+        self._children: dict[LabelValues, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *label_values: str) -> Histogram:
+        """The histogram for these label values; hold on to it in hot paths."""
+        histogram = self._children.get(label_values)
+        if histogram is None:
+            with self._lock:
+                histogram = self._children.setdefault(label_values, Histogram(self._buckets))
+        return histogram
+
+    def observe(self, value: float, *label_values: str) -> None:
+        self.labels(*label_values).observe(value)
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            children = list(self._children.items())
+        samples = {label_values: histogram.snapshot() for label_values, histogram in children}
+        return MetricFamily(self.name, self.kind, self.documentation, self.label_names, samples)
+
+
+class MetricsRegistry:
+    """
+    Process-local metrics.
+
+    Counters and histograms are updated inline and cost a lock and a dict
+    lookup. Gauges come from collectors, callbacks run only when metrics are
+    scraped, so state that is already tracked elsewhere (pool occupancy,
+    queue depths) adds nothing to the request path.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | HistogramFamily] = {}
+        self._collectors: list[Collector] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, labels, lambda: Counter(name, documentation, labels))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> HistogramFamily:
+        return self._get_or_create(
+            HistogramFamily, name, labels, lambda: HistogramFamily(name, documentation, labels, buckets)
+        )
+
+    def _get_or_create[M: (Counter, HistogramFamily)](
+        self,
+        metric_cls: type[M],
+        name: str,
+        labels: Sequence[str],
+        create: Callable[[], M],
+    ) -> M:
+        # Registering the same metric twice returns the first one, so instrumented
+        # modules and middleware can be set up more than once (app factory, tests).
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = create()
+                self._metrics[name] = metric
+        if not isinstance(metric, metric_cls) or metric.label_names != tuple(labels):
+            raise ValueError(f"Metric {name} is already registered with another type or labels")
+        return metric
+
+    def add_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def collect(self) -> list[MetricFamily]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        families = [metric.collect() for metric in metrics]
+        for collector in self._collectors:
+            families.extend(collector())
+        return families
@@ -0,0 +1,45 @@
+import functools
+import inspect
+import time
+from typing import Any
+
+from app.infrastructure.metrics.histogram import Histogram
+from app.infrastructure.metrics.registry import HistogramFamily
+
+
+def instrument_async_methods(cls: type, family: HistogramFamily, owner: str) -> None:
+    """
+    Time every public coroutine method of ``cls``, inherited ones included.
+
+    Durations go to ``family`` labelled ``(owner, method)``; calls that raise
+    are timed too. Methods already wrapped for a parent class are re-wrapped
+    from the original function so each call is recorded once, under the
+    subclass. Async generators are left alone.
+    """
+    for name in dir(cls):
+        if name.startswith("_"):
+            continue
+        method = inspect.getattr_static(cls, name)
+        if not inspect.iscoroutinefunction(method):
+            continue
+        method = getattr(method, "__instrumented__", method)
+        setattr(cls, name, _timed(method, family, (owner, name)))
+
+
+def _timed(method: Any, family: HistogramFamily, label_values: tuple[str, str]) -> Any:
+    # Bound on first call, so methods that never run export no series
+    histogram: Histogram | None = None
+
+    @functools.wraps(method)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        nonlocal histogram
+        start = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            if histogram is None:
+                histogram = family.labels(*label_values)
+            histogram.observe(time.perf_counter() - start)
+
+    wrapper.__instrumented__ = method  # type: ignore[attr-defined]
+    return wrapper
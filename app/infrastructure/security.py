@@ -1,19 +1,295 @@
+import asyncio
+import hashlib
+import hmac
+import statistics
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Literal
+
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
 
-_hasher = PasswordHasher(
-    time_cost=3,
-    memory_cost=65536,
-    parallelism=2,
-)
+from app.infrastructure.config import get_settings
+from app.infrastructure.logging import logger
+from app.infrastructure.metrics import Histogram, MetricFamily, metrics_registry
+
+
+@lru_cache
+def get_password_hasher() -> PasswordHasher:
+    config = get_settings().PASSWORD_HASHING
+    if config is None:
+        return PasswordHasher(time_cost=3, memory_cost=65536, parallelism=2)
+    return PasswordHasher(
+        time_cost=config.ARGON2_TIME_COST,
+        memory_cost=config.ARGON2_MEMORY_COST,
+        parallelism=config.ARGON2_PARALLELISM,
+    )
 
 
 def hash_password(password: str) -> str:
-    return _hasher.hash(password)
+    return get_password_hasher().hash(password)
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
     try:
-        return _hasher.verify(hashed_password, password)
+        return get_password_hasher().verify(hashed_password, password)
     except VerifyMismatchError:
         return False
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True when the hash was made with parameters other than the configured ones."""
+    return get_password_hasher().check_needs_rehash(hashed_password)
+
+
+class PasswordHashingBusyError(RuntimeError):
+    """Raised when the hashing queue is full or a hash does not finish in time."""
+
+
+class PasswordHashingPool:
+    """
+    Runs argon2 work on a thread or process pool so it never blocks the event loop.
+
+    Jobs queued or running on the executor are capped at ``queue_size``; calls
+    beyond that fail fast with PasswordHashingBusyError instead of piling up.
+    Callers wait at most ``timeout`` seconds. A timed-out job keeps its slot
+    until the worker actually finishes it.
+    """
+
+    def __init__(
+        self,
+        executor: Literal["thread", "process"] = "thread",
+        workers: int = 2,
+        queue_size: int = 64,
+        timeout: float = 5.0,
+    ):
+        self._executor_kind = executor
+        self._workers = workers
+        self._queue_size = queue_size
+        self._timeout = timeout
+        self._executor: Executor | None = None
+        self._depth = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.latency = {"hash": Histogram(), "verify": Histogram()}
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs currently queued or running on the executor."""
+        return self._depth
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self._executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self._workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="argon2")
+        return self._executor
+
+    def _release(self, future: asyncio.Future) -> None:
+        self._depth -= 1
+        if not future.cancelled():
+            future.exception()  # Mark as retrieved: a timed-out caller no longer awaits it
+
+    async def run[T](self, operation: Literal["hash", "verify"], fn: Callable[..., T], *args: Any) -> T:
+        if self._depth >= self._queue_size:
+            self.rejected += 1
+            raise PasswordHashingBusyError("Password hashing queue is full")
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        future = loop.run_in_executor(self._get_executor(), fn, *args)
+        self._depth += 1
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self._timeout)
+        except TimeoutError as e:
+            self.timeouts += 1
+            raise PasswordHashingBusyError(f"Password {operation} timed out after {self._timeout}s") from e
+        finally:
+            self.latency[operation].observe(time.perf_counter() - start)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "executor": self._executor_kind,
+            "workers": self._workers,
+            "queue_size": self._queue_size,
+            "queue_depth": self._depth,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "latency_seconds": {name: histogram.snapshot() for name, histogram in self.latency.items()},
+        }
+
+    def collect_metrics(self) -> list[MetricFamily]:
+        return [
+            MetricFamily(
+                "password_hash_duration_seconds",
+                "histogram",
+                "hash_password / verify_password time on the hashing pool, queueing included.",
+                ("operation",),
+                {(name,): histogram.snapshot() for name, histogram in self.latency.items()},
+            ),
+            MetricFamily(
+                "password_hash_queue_depth", "gauge", "Hashing jobs queued or running.", samples={(): self._depth}
+            ),
+            MetricFamily(
+                "password_hash_rejected_total",
+                "counter",
+                "Hashing calls refused because the queue was full.",
+                samples={(): self.rejected},
+            ),
+            MetricFamily(
+                "password_hash_timeouts_total",
+                "counter",
+                "Hashing calls that timed out.",
+                samples={(): self.timeouts},
+            ),
+        ]
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+@lru_cache
+def get_hashing_pool() -> PasswordHashingPool:
+    config = get_settings().PASSWORD_HASHING
+    if config is None:
+        return PasswordHashingPool()
+    return PasswordHashingPool(
+        executor=config.HASH_EXECUTOR,
+        workers=config.HASH_WORKERS,
+        queue_size=config.HASH_QUEUE_SIZE,
+        timeout=config.HASH_TIMEOUT,
+    )
+
+
+metrics_registry.add_collector(lambda: get_hashing_pool().collect_metrics())
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the hashing pool."""
+    return await get_hashing_pool().run("hash", hash_password, password)
+
+
+async def hash_passwords_async(passwords: Sequence[str]) -> list[str | BaseException]:
+    """
+    Hash many passwords concurrently on the hashing pool.
+
+    At most ``workers`` of them are submitted at a time, so a large batch keeps
+    every worker busy without filling the queue that other requests rely on.
+    Failures are returned in place instead of raised.
+    """
+    semaphore = asyncio.Semaphore(get_hashing_pool().workers)
+
+    async def hash_one(password: str) -> str:
+        async with semaphore:
+            return await hash_password_async(password)
+
+    return await asyncio.gather(*(hash_one(password) for password in passwords), return_exceptions=True)
+
+
+type RehashCallback = Callable[[str], Awaitable[None]]
+
+# Strong references to in-flight rehash tasks so they aren't garbage collected mid-run.
+_rehash_tasks: set[asyncio.Task] = set()
+
+
+async def verify_password_async(
+    password: str,
+    hashed_password: str,
+    on_rehash: RehashCallback | None = None,
+) -> bool:
+    """
+    verify_password on the hashing pool.
+
+    When the password matches but its hash uses outdated argon2 parameters and
+    ``on_rehash`` is given, a new hash is computed in the background and handed
+    to ``on_rehash`` for persisting. The caller's response is not delayed.
+    """
+    valid = await get_hashing_pool().run("verify", verify_password, password, hashed_password)
+    if valid and on_rehash is not None and password_needs_rehash(hashed_password):
+        task = asyncio.create_task(_rehash(password, on_rehash))
+        _rehash_tasks.add(task)
+        task.add_done_callback(_rehash_tasks.discard)
+    return valid
+
+
+async def _rehash(password: str, on_rehash: RehashCallback) -> None:
+    try:
+        await on_rehash(await hash_password_async(password))
+    except Exception as e:
+        # The old hash still verifies; the upgrade is retried on the next login.
+        logger.warning("Background password rehash failed: %s", e)
+
+
+@dataclass(frozen=True)
+class Argon2Parameters:
+    time_cost: int
+    memory_cost: int  # KiB
+    parallelism: int
+    measured_ms: float
+    within_budget: bool
+
+
+def _measure_hash_ms(time_cost: int, memory_cost: int, parallelism: int, samples: int) -> float:
+    hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash("argon2-calibration")
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_argon2(
+    target_ms: float,
+    max_memory_kib: int,
+    parallelism: int,
+    min_memory_kib: int = 19456,
+    max_time_cost: int = 10,
+    samples: int = 3,
+) -> Argon2Parameters:
+    """
+    Pick the strongest argon2 parameters that hash within ``target_ms`` on this host.
+
+    Memory is preferred over iterations: start at the memory budget with one
+    pass, halve memory (down to ``min_memory_kib``) until a single pass fits,
+    then add passes while the median hash time stays within the target.
+    """
+    memory_cost = max_memory_kib
+    elapsed = _measure_hash_ms(1, memory_cost, parallelism, samples)
+    while elapsed > target_ms and memory_cost > min_memory_kib:
+        memory_cost = max(memory_cost // 2, min_memory_kib)
+        elapsed = _measure_hash_ms(1, memory_cost, parallelism, samples)
+
+    if elapsed > target_ms:
+        return Argon2Parameters(1, memory_cost, parallelism, round(elapsed, 2), within_budget=False)
+
+    best = Argon2Parameters(1, memory_cost, parallelism, round(elapsed, 2), within_budget=True)
+    for time_cost in range(2, max_time_cost + 1):
+        elapsed = _measure_hash_ms(time_cost, memory_cost, parallelism, samples)
+        if elapsed > target_ms:
+            break
+        best = Argon2Parameters(time_cost, memory_cost, parallelism, round(elapsed, 2), within_budget=True)
+    return best
+
+
+def email_blind_index(email: str) -> str:
+    """
+    Keyed HMAC-SHA256 of the normalized email.
+
+    Encrypted emails can't be compared in SQL without decrypting every row, so
+    lookups and uniqueness go through this deterministic digest instead.
+    """
+    normalized = email.strip().lower()
+    key = get_settings().BLIND_INDEX_KEY.encode()
+    return hmac.new(key, normalized.encode(), hashlib.sha256).hexdigest()
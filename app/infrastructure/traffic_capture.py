@@ -0,0 +1,189 @@
+import hashlib
+import hmac
+import json
+import os
+import queue
+import re
+import secrets
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Self
+from urllib.parse import parse_qsl, urlencode
+
+from app.infrastructure.config import TrafficCaptureSettings
+
+FILE_PREFIX = "capture-"
+EMAIL = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+# Keys whose values are replaced whatever they hold (password, new_password, ...)
+SECRET_KEY = re.compile(r"password", re.IGNORECASE)
+# Personal names (full_name, name, ...): encrypted at rest, so never written in clear
+NAME_KEY = re.compile(r"(^|_)name$", re.IGNORECASE)
+
+
+class Tokenizer:
+    """
+    Replaces emails, passwords and personal names with deterministic stand-ins.
+
+    Equal inputs give equal tokens (keyed HMAC), so a replay still looks up
+    the email a capture created, and tokens stay valid for the request
+    models: emails become ``u-<hex>@example.com``. Without a ``key`` a
+    random one is drawn, so tokens only match within one process's capture
+    and can't be reversed by hashing guessed emails.
+    """
+
+    def __init__(self, key: str = ""):
+        self._key = key.encode() if key else secrets.token_bytes(32)
+
+    def _digest(self, kind: str, value: str) -> str:
+        return hmac.new(self._key, f"{kind}:{value}".encode(), hashlib.sha256).hexdigest()[:16]
+
+    def email(self, email: str) -> str:
+        return f"u-{self._digest('email', email.strip().lower())}@example.com"
+
+    def password(self, password: str) -> str:
+        return f"pw-{self._digest('password', password)}"
+
+    def name(self, name: str) -> str:
+        return f"Name {self._digest('name', name)}"
+
+    def text(self, text: str) -> str:
+        return EMAIL.sub(lambda match: self.email(match.group()), text)
+
+    def query(self, query: str) -> str:
+        if "@" not in query and "%40" not in query.upper():
+            return query
+        pairs = parse_qsl(query, keep_blank_values=True)
+        return urlencode([(name, self.text(value)) for name, value in pairs])
+
+    def json(self, value: Any, key: str = "") -> Any:
+        if isinstance(value, dict):
+            return {k: self.json(v, k) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.json(item, key) for item in value]
+        if isinstance(value, str):
+            if SECRET_KEY.search(key):
+                return self.password(value)
+            return self.name(value) if NAME_KEY.search(key) else self.text(value)
+        return value
+
+
+@dataclass(frozen=True, slots=True)
+class CapturedRequest:
+    """One request as handed over by the middleware, before sanitizing."""
+
+    ts: float  # Wall clock at arrival; replay keeps the gaps between these
+    method: str
+    path: str
+    query: str
+    route: str
+    status: int
+    ms: float
+    body: bytes | None  # None: not kept (too large, or not JSON)
+    omitted: str = ""  # Why the body was not kept
+
+
+class CaptureWriter:
+    """
+    Appends sanitized requests to ``capture-<pid>-<start>.jsonl`` in ``directory``.
+
+    ``submit`` only enqueues, so a request never waits on disk: a daemon
+    thread started on first use tokenizes, serializes and writes in
+    batches. When ``queue_size`` requests are pending new ones are
+    dropped and counted. Each line is one compact JSON object.
+    """
+
+    def __init__(self, directory: str | Path, tokenizer: Tokenizer, queue_size: int = 10000):
+        self.directory = Path(directory)
+        self.tokenizer = tokenizer
+        self.path = self.directory / f"{FILE_PREFIX}{os.getpid()}-{time.strftime('%Y%m%dT%H%M%S')}.jsonl"
+        self.written = 0
+        self.dropped = 0
+        self._queue: queue.Queue[CapturedRequest | None] = queue.Queue(queue_size)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: TrafficCaptureSettings) -> Self:
+        return cls(settings.DIRECTORY, Tokenizer(settings.TOKEN_KEY), settings.QUEUE_SIZE)
+
+    def submit(self, request: CapturedRequest) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(request)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write what is queued and stop the thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> dict[str, Any]:
+        return {"path": str(self.path), "written": self.written, "dropped": self.dropped}
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._thread = threading.Thread(target=self._run, name="traffic-capture", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        with self.path.open("a", encoding="utf-8") as file:
+            while True:
+                batch = [self._queue.get()]
+                while batch[-1] is not None and len(batch) < 1000:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                requests = [request for request in batch if request is not None]
+                file.writelines(json.dumps(self.sanitize(r), separators=(",", ":")) + "\n" for r in requests)
+                file.flush()
+                self.written += len(requests)
+                if batch[-1] is None:
+                    return
+
+    def sanitize(self, request: CapturedRequest) -> dict[str, Any]:
+        record: dict[str, Any] = {
+            "ts": round(request.ts, 6),
+            "method": request.method,
+            "path": self.tokenizer.text(request.path),
+            "route": request.route,
+            "status": request.status,
+            "ms": round(request.ms, 3),
+        }
+        if request.query:
+            record["query"] = self.tokenizer.query(request.query)
+        if request.body is not None:
+            try:
+                record["body"] = self.tokenizer.json(json.loads(request.body))
+            except ValueError:
+                record["omitted"] = "invalid json"
+        elif request.omitted:
+            record["omitted"] = request.omitted
+        return record
+
+
+def capture_files(paths: Iterable[str | Path]) -> list[Path]:
+    """The given files, and the capture files inside the given directories."""
+    files: list[Path] = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob(f"{FILE_PREFIX}*.jsonl")) if path.is_dir() else [path])
+    return files
+
+
+def read_capture(paths: Iterable[str | Path]) -> list[dict[str, Any]]:
+    """Records of every capture file (one per worker), merged in arrival order."""
+    records: list[dict[str, Any]] = []
+    for path in capture_files(paths):
+        with path.open(encoding="utf-8") as file:
+            records.extend(json.loads(line) for line in file if line.strip())
+    records.sort(key=lambda record: record["ts"])
+    return records
@@ -1,10 +1,10 @@
-import uvicorn
-
 from app.factory import create_app
 from app.infrastructure.logging import logger
 
 app = create_app()
 
 if __name__ == "__main__":
+    import uvicorn  # Only needed when run directly; keeps worker imports lighter.
+
     logger.info("Starting application")
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1 @@
+"""Benchmarks. Not collected by pytest; run each module with ``python -m``."""
@@ -0,0 +1,179 @@
+"""
+Database time per request: entity reads vs. column subsets and existence checks.
+
+Every encrypted column a query selects is a pgp_sym_decrypt per row, run by
+the database. For each request path this captures the statements the
+repository sends, both the way it used to (whole entities, the password
+hash included) and the way it does now (only the response's columns, or
+only the primary key), and times them server-side with EXPLAIN ANALYZE:
+planning plus execution, without network or driver time. ``decrypts`` is
+pgp_sym_decrypt calls per request (calls in the statement x rows).
+
+Needs a reachable PostgreSQL with pgcrypto (configured like the app). Users
+are seeded into the app's table inside a transaction that is rolled back.
+
+    python -m tests.benchmarks.decrypt_cost --users 10000 --runs 200
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+from collections.abc import Awaitable, Callable
+from typing import Any, cast
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.application.dto.user import UserRead
+from app.domain.entities.user import UserEntity
+from app.infrastructure.config import get_settings
+from app.infrastructure.database.connector import db_connector
+from app.infrastructure.database.repositories.user_repository import UserRepository
+from app.infrastructure.logging import logger
+from app.infrastructure.logging.base_logger import BaseLogger
+
+HASH = "$argon2id$v=19$m=65536,t=3,p=2$c2FsdHNhbHQ$aGFzaGhhc2hoYXNoaGFzaA"
+PAGE_SIZE = 50
+
+type Call = Callable[[AsyncSession], Awaitable[Any]]
+
+
+def cases(repository: UserRepository, user_id: int, email: str) -> dict[str, tuple[Call, Call]]:
+    """Request path -> (entity call, subset call)."""
+    changes = {"full_name": "Renamed"}
+    return {
+        "GET /users/{id}": (
+            lambda db: repository.get_user_by_id(db, user_id),
+            lambda db: repository.get_user_view(db, user_id, UserRead),
+        ),
+        "GET /users/by-email/{email}": (
+            lambda db: repository.get_user_by_email(db, email),
+            lambda db: repository.get_user_view_by_email(db, email, UserRead),
+        ),
+        f"GET /users?limit={PAGE_SIZE}": (
+            lambda db: repository.list_users(db, limit=PAGE_SIZE + 1),
+            lambda db: repository.list_user_views(db, UserRead, limit=PAGE_SIZE + 1),
+        ),
+        "PUT /users/{id}": (
+            lambda db: repository.update_user(db, user_id, changes),
+            lambda db: repository.update_user_view(db, user_id, changes, UserRead),
+        ),
+        "HEAD /users/{id}": (
+            lambda db: repository.get_user_by_id(db, user_id),
+            lambda db: repository.user_exists(db, user_id),
+        ),
+        "HEAD /users/by-email/{email}": (
+            lambda db: repository.get_user_by_email(db, email),
+            lambda db: repository.email_exists(db, email),
+        ),
+    }
+
+
+class StatementRecorder:
+    """Collects the (statement, parameters) pairs sent while ``recording``."""
+
+    def __init__(self) -> None:
+        self.recording = False
+        self.statements: list[tuple[str, Any]] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if self.recording:
+            self.statements.append((statement, parameters))
+
+
+async def capture(db: AsyncSession, recorder: StatementRecorder, call: Call) -> list[tuple[str, Any]]:
+    recorder.statements = []
+    recorder.recording = True
+    try:
+        await call(db)
+    finally:
+        recorder.recording = False
+    db.expunge_all()  # The next call must query again, not hit the identity map
+    return recorder.statements
+
+
+def plan_rows(plan: dict[str, Any]) -> int:
+    """Rows the statement's expressions ran over; a ModifyTable node reports 0, its input has them."""
+    node = plan["Plan"]
+    if node["Node Type"] == "ModifyTable":
+        node = node["Plans"][0]
+    return node["Actual Rows"] * node["Actual Loops"]
+
+
+async def explain(conn: AsyncConnection, statements: list[tuple[str, Any]], runs: int) -> dict[str, Any]:
+    """Median/min server time of running all ``statements`` once, and their decrypts."""
+    totals = []
+    decrypts = 0
+    for run in range(runs):
+        total = 0.0
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, FORMAT JSON) {statement}", parameters)
+            [plan] = result.scalar_one()
+            total += plan["Planning Time"] + plan["Execution Time"]
+            if run == 0:
+                decrypts += statement.count("pgp_sym_decrypt(") * plan_rows(plan)
+        totals.append(total)
+    return {
+        "statements": len(statements),
+        "decrypts": decrypts,
+        "median_ms": round(statistics.median(totals), 4),
+        "min_ms": round(min(totals), 4),
+    }
+
+
+async def run(users: int, runs: int) -> dict[str, Any]:
+    repository = UserRepository(logger=cast(BaseLogger, logger), settings=get_settings())
+    engine = db_connector.create_engine()
+    recorder = StatementRecorder()
+    event.listen(engine.sync_engine, "before_cursor_execute", recorder)
+    results: dict[str, Any] = {}
+    try:
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            # Repository commits only release savepoints; everything is rolled back below
+            db = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+            try:
+                for start in range(0, users, 1000):
+                    await repository.create_users(
+                        db,
+                        [
+                            UserEntity(
+                                email=f"decrypt-cost-{n}@example.com", full_name=f"User {n}", hashed_password=HASH
+                            )
+                            for n in range(start, min(start + 1000, users))
+                        ],
+                    )
+                target = await repository.get_user_by_email(db, f"decrypt-cost-{users // 2}@example.com")
+                assert target is not None and target.id is not None
+                await conn.exec_driver_sql(f"ANALYZE {repository.model.__table__.fullname}")
+
+                for route, (entity_call, subset_call) in cases(repository, target.id, target.email).items():
+                    before = await explain(conn, await capture(db, recorder, entity_call), runs)
+                    after = await explain(conn, await capture(db, recorder, subset_call), runs)
+                    saved = before["median_ms"] - after["median_ms"]
+                    results[route] = {
+                        "entity": before,
+                        "subset": after,
+                        "saved_ms": round(saved, 4),
+                        "saved_pct": round(100 * saved / before["median_ms"], 1) if before["median_ms"] else 0.0,
+                    }
+                    print(json.dumps({route: results[route]}), flush=True)
+            finally:
+                await db.close()
+                await transaction.rollback()
+    finally:
+        await db_connector.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000, help="users seeded for the run")
+    parser.add_argument("--runs", type=int, default=200, help="EXPLAIN ANALYZE samples per request path")
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.runs))
+
+
+if __name__ == "__main__":
+    main()
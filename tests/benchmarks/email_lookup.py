@@ -0,0 +1,105 @@
+"""
+Email lookup latency: pgp_sym_decrypt scan vs. blind index probe.
+
+Needs a reachable PostgreSQL with pgcrypto (configured like the app). Seeds an
+unlogged scratch table per size, times both lookup strategies and prints JSON.
+
+    python -m tests.benchmarks.email_lookup --sizes 10000 100000 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.infrastructure.config import get_settings
+from app.infrastructure.database.connector import db_connector
+from app.infrastructure.security import email_blind_index
+
+TABLE = "bench_email_lookup"
+
+
+async def seed(conn, schema: str, size: int, secret_key: str, index_key: str) -> None:
+    await conn.execute(text(f"DROP TABLE IF EXISTS {schema}.{TABLE}"))
+    await conn.execute(
+        text(
+            f"CREATE UNLOGGED TABLE {schema}.{TABLE} ("
+            "id BIGSERIAL PRIMARY KEY, email BYTEA NOT NULL, email_hash VARCHAR(64))"
+        )
+    )
+    await conn.execute(
+        text(
+            f"INSERT INTO {schema}.{TABLE} (email, email_hash) "
+            "SELECT pgp_sym_encrypt('user' || g || '@example.com', :secret, 'cipher-algo=aes256'), "
+            "encode(hmac('user' || g || '@example.com', :index_key, 'sha256'), 'hex') "
+            "FROM generate_series(1, :size) AS g"
+        ),
+        {"secret": secret_key, "index_key": index_key, "size": size},
+    )
+    await conn.execute(text(f"CREATE UNIQUE INDEX ON {schema}.{TABLE} (email_hash)"))
+    await conn.execute(text(f"ANALYZE {schema}.{TABLE}"))
+
+
+async def time_queries(conn, stmt, params: list[dict]) -> list[float]:
+    timings = []
+    for param in params:
+        start = time.perf_counter()
+        await conn.execute(stmt, param)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def summarize(timings: list[float]) -> dict[str, float]:
+    return {
+        "samples": len(timings),
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+async def run(sizes: list[int], probes: int, scan_probes: int) -> list[dict]:
+    settings = get_settings()
+    schema = settings.DATABASE.DB_SCHEMA
+    engine = db_connector.create_engine()
+    scan = text(f"SELECT id FROM {schema}.{TABLE} WHERE pgp_sym_decrypt(email, :secret, 'cipher-algo=aes256') = :email")
+    probe = text(f"SELECT id FROM {schema}.{TABLE} WHERE email_hash = :email_hash")
+
+    results = []
+    try:
+        for size in sizes:
+            async with engine.begin() as conn:
+                await seed(conn, schema, size, settings.SECRET_KEY, settings.BLIND_INDEX_KEY)
+
+            emails = [f"user{random.randint(1, size)}@example.com" for _ in range(max(probes, scan_probes))]
+            async with engine.connect() as conn:
+                scan_ms = await time_queries(
+                    conn, scan, [{"secret": settings.SECRET_KEY, "email": e} for e in emails[:scan_probes]]
+                )
+                probe_ms = await time_queries(
+                    conn, probe, [{"email_hash": email_blind_index(e)} for e in emails[:probes]]
+                )
+            results.append({"rows": size, "decrypt_scan": summarize(scan_ms), "blind_index": summarize(probe_ms)})
+            print(json.dumps(results[-1]), flush=True)
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP TABLE IF EXISTS {schema}.{TABLE}"))
+        await db_connector.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--probes", type=int, default=200, help="blind index lookups per size")
+    parser.add_argument("--scan-probes", type=int, default=5, help="decrypting scans per size (slow)")
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.probes, args.scan_probes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+CPU cost of the per-request building blocks, each measured in isolation.
+
+Every benchmark is calibrated to run for at least ``--min-time`` seconds per
+sample, then sampled ``--repeat`` times; results are per-call microseconds
+(median, min, stdev) plus the library versions they were measured with.
+Save a run with ``--output`` and later pass it to ``--compare`` to flag
+benchmarks whose median got slower than ``--tolerance``; the exit status is
+non-zero on a regression, so it can gate CI. No database needed.
+
+``response.*`` benchmarks come in pairs, a route's response built through
+FastAPI's response_model validation and the FAST_RESPONSES path; the report's
+``fast_responses`` section gives the CPU saved per response.
+
+    python -m tests.benchmarks.hot_paths --output baseline.json
+    python -m tests.benchmarks.hot_paths --compare baseline.json --tolerance 0.10
+    python -m tests.benchmarks.hot_paths -k mapper -k serialize
+    python -m tests.benchmarks.hot_paths -k response.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any, cast
+from unittest.mock import patch
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from sqlalchemy import Row, create_engine, literal, select
+
+from app.adapters.api.responses import PydanticResponse
+from app.application.dto.user import UserBulkItem, UserBulkResult, UserCreate, UserPage, UserRead, UserUpdate
+from app.application.mappers.base import merge_update
+from app.application.mappers.user_mapper import UserMapper
+from app.domain.entities.user import UserEntity
+from app.infrastructure.config import Settings, get_settings
+from app.infrastructure.database.repositories.user_repository import UserRepository
+from app.infrastructure.logging import logger
+from app.infrastructure.logging.base_logger import BaseLogger
+from app.infrastructure.security import hash_password
+
+type Benchmark = Callable[[], Any]
+type AsyncBenchmark = Callable[[], Awaitable[Any]]
+
+CREATE_PAYLOAD = {"email": "Ada.Lovelace@example.com", "full_name": "Ada Lovelace", "password": "correct horse"}
+ENTITY = UserEntity(
+    id=42,
+    email="ada.lovelace@example.com",
+    full_name="Ada Lovelace",
+    hashed_password="$argon2id$v=19$m=65536,t=3,p=2$c2FsdHNhbHQ$aGFzaGhhc2hoYXNoaGFzaA",
+)
+FIXED_HASH = ENTITY.hashed_password
+PAGE = [ENTITY.model_copy(update={"id": n, "email": f"user{n}@example.com"}) for n in range(1, 51)]
+BULK = [ENTITY.model_copy(update={"id": n, "email": f"bulk{n}@example.com"}) for n in range(1, 101)]
+VERSIONS = ("pydantic", "pydantic-core", "fastapi", "starlette", "sqlalchemy", "argon2-cffi")
+
+
+async def _fixed_hash(password: str) -> str:
+    return FIXED_HASH
+
+
+def _response_field(method: str, path: str):
+    """The response field FastAPI validates and serializes the route's responses with."""
+    from app.main import app
+
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == path and method in route.methods:
+            return route.response_field
+    raise LookupError(f"{method} {path} not found")
+
+
+def _view_row(view: type[UserRead]) -> Row:
+    """A result row shaped like the projection query's for ``view`` (from in-memory SQLite)."""
+    columns = [literal(getattr(ENTITY, name)).label(name) for name in view.model_fields]
+    with create_engine("sqlite://").connect() as connection:
+        return connection.execute(select(*columns)).one()
+
+
+def _user_page(validate: bool) -> UserPage:
+    return UserPage(items=[UserMapper.to_read(entity, validate=validate) for entity in PAGE], next_cursor="abc")
+
+
+def _bulk_result(validate: bool) -> UserBulkResult:
+    items = [
+        UserBulkItem(index=n, status="created", user=UserMapper.to_read(entity, validate=validate))
+        for n, entity in enumerate(BULK)
+    ]
+    return UserBulkResult(created=len(items), failed=0, items=items)
+
+
+def build_benchmarks() -> dict[str, Benchmark | tuple[AsyncBenchmark]]:
+    """Name -> callable; async benchmarks are wrapped in a 1-tuple."""
+    repository = UserRepository(logger=cast(BaseLogger, logger), settings=get_settings())
+    user_create = UserCreate.model_validate(CREATE_PAYLOAD)
+    user_update = UserUpdate(full_name="Ada King", is_active=False)
+    user_read = UserMapper.to_read(ENTITY)
+    model = repository._to_model(ENTITY)
+    row = _view_row(UserRead)
+    field = _response_field("GET", "/api/v1/users/{user_id}")
+    page_field = _response_field("GET", "/api/v1/users")
+    bulk_field = _response_field("POST", "/api/v1/users/bulk")
+
+    async def serialize_fastapi() -> bytes:
+        return JSONResponse(await serialize_response(field=field, response_content=user_read)).body
+
+    # A route's whole response: mapping entities, then FastAPI's response_model
+    # validation and encoding (validated) or one pydantic-core serialization (fast)
+    async def user_validated() -> bytes:
+        return JSONResponse(await serialize_response(field=field, response_content=UserMapper.to_read(ENTITY))).body
+
+    async def page_validated() -> bytes:
+        return JSONResponse(await serialize_response(field=page_field, response_content=_user_page(True))).body
+
+    async def bulk_validated() -> bytes:
+        return JSONResponse(await serialize_response(field=bulk_field, response_content=_bulk_result(True))).body
+
+    return {
+        # Password hashing is measured on its own below, not inside the mappers
+        "mapper.create_to_entity": (lambda: UserMapper.create_to_entity(user_create),),
+        "mapper.update_to_changes": (lambda: UserMapper.update_to_changes(user_update),),
+        "mapper.to_read": lambda: UserMapper.to_read(ENTITY),
+        "mapper.merge_update": lambda: merge_update(ENTITY, user_update, field_map={"password": "hashed_password"}),
+        "repository.to_entity": lambda: repository._to_entity(model),
+        "repository.to_model": lambda: repository._to_model(ENTITY),
+        # One row of GET /users/{id}: ORM object -> entity -> UserRead, vs a projected row -> UserRead
+        "repository.model_to_read": lambda: UserMapper.to_read(repository._to_entity(model)),
+        "repository.row_to_view": lambda: repository._to_views(UserRead, [row], False),
+        "validate.UserCreate": lambda: UserCreate.model_validate(CREATE_PAYLOAD),
+        "serialize.UserRead.fastapi": (serialize_fastapi,),
+        "serialize.UserRead.model_dump_json": lambda: user_read.model_dump_json(),
+        "response.user.validated": (user_validated,),
+        "response.user.fast": lambda: PydanticResponse(UserMapper.to_read(ENTITY, validate=False)).body,
+        "response.page50.validated": (page_validated,),
+        "response.page50.fast": lambda: PydanticResponse(_user_page(False)).body,
+        "response.bulk100.validated": (bulk_validated,),
+        "response.bulk100.fast": lambda: PydanticResponse(_bulk_result(False)).body,
+        "security.hash_password": lambda: hash_password(CREATE_PAYLOAD["password"]),
+        "config.load_configs": Settings.load_configs,
+    }
+
+
+def _timer(benchmark: Benchmark | tuple[AsyncBenchmark], loop: asyncio.AbstractEventLoop) -> Callable[[int], float]:
+    """A function running the benchmark ``loops`` times and returning the elapsed seconds."""
+    if isinstance(benchmark, tuple):
+        call = benchmark[0]
+
+        async def run_async(loops: int) -> float:
+            start = time.perf_counter()
+            for _ in range(loops):
+                await call()
+            return time.perf_counter() - start
+
+        return lambda loops: loop.run_until_complete(run_async(loops))
+
+    def run(loops: int) -> float:
+        start = time.perf_counter()
+        for _ in range(loops):
+            benchmark()
+        return time.perf_counter() - start
+
+    return run
+
+
+def measure(timer: Callable[[int], float], repeat: int, min_time: float) -> dict[str, Any]:
+    timer(1)  # Warm-up: lazy imports, caches, first-call compilation
+    loops = 1
+    while (elapsed := timer(loops)) < min_time:
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9) * 1.1))
+    samples = [timer(loops) / loops * 1e6 for _ in range(repeat)]
+    return {
+        "median_us": round(statistics.median(samples), 3),
+        "min_us": round(min(samples), 3),
+        "stdev_us": round(statistics.stdev(samples), 3) if repeat > 1 else 0.0,
+        "loops": loops,
+        "repeat": repeat,
+    }
+
+
+def run(selected: list[str] | None = None, repeat: int = 7, min_time: float = 0.1) -> dict[str, Any]:
+    benchmarks = build_benchmarks()
+    names = [name for name in benchmarks if not selected or any(part in name for part in selected)]
+    loop = asyncio.new_event_loop()
+    try:
+        with patch("app.application.mappers.user_mapper.hash_password_async", _fixed_hash):
+            results = {name: measure(_timer(benchmarks[name], loop), repeat, min_time) for name in names}
+    finally:
+        loop.close()
+    report = {
+        "python": platform.python_version(),
+        "versions": {package: version(package) for package in VERSIONS},
+        "results": results,
+    }
+    if savings := response_savings(results):
+        report["fast_responses"] = savings
+    return report
+
+
+def response_savings(results: dict[str, Any]) -> dict[str, Any]:
+    """CPU per response saved by FAST_RESPONSES, for every payload measured both ways."""
+    savings = {}
+    for name, validated in results.items():
+        fast = results.get(name.removesuffix(".validated") + ".fast")
+        if name.endswith(".validated") and fast is not None:
+            savings[name.removesuffix(".validated")] = {
+                "validated_us": validated["median_us"],
+                "fast_us": fast["median_us"],
+                "saved_us": round(validated["median_us"] - fast["median_us"], 3),
+                "speedup": round(validated["median_us"] / fast["median_us"], 2),
+            }
+    return savings
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], tolerance: float) -> list[dict[str, Any]]:
+    """Per benchmark present in both runs: medians, their ratio and whether it regressed."""
+    rows = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        ratio = result["median_us"] / before["median_us"]
+        rows.append(
+            {
+                "benchmark": name,
+                "baseline_us": before["median_us"],
+                "current_us": result["median_us"],
+                "ratio": round(ratio, 3),
+                "regressed": ratio > 1 + tolerance,
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="selected", action="append", help="only benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=7, help="samples per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.1, help="minimum seconds per sample")
+    parser.add_argument("--output", type=Path, help="also write the results to this file")
+    parser.add_argument("--compare", type=Path, help="baseline results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed median slowdown, as a fraction")
+    args = parser.parse_args()
+
+    report = run(args.selected, args.repeat, args.min_time)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    regressed = False
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        report["baseline_versions"] = baseline.get("versions", {})
+        report["comparison"] = compare(baseline, report, args.tolerance)
+        regressed = any(row["regressed"] for row in report["comparison"])
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Cold-start cost of importing the app (``python -X importtime``).
+
+Imports the module in fresh interpreters, reports the median cumulative
+import time, wall time and the slowest modules, and exits non-zero when the
+median exceeds the budget, so it can gate CI. No database needed.
+
+    python -m tests.benchmarks.import_time --runs 7 --budget-ms 1500
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def measure(module: str) -> tuple[float, dict[str, tuple[int, int]]]:
+    """Wall time (ms) and ``{module: (self_us, cumulative_us)}`` for one fresh import."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            modules[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return wall_ms, modules
+
+
+def run(module: str, runs: int, top: int) -> dict:
+    walls: list[float] = []
+    totals: list[float] = []
+    self_times: dict[str, list[float]] = {}
+    for _ in range(runs):
+        wall_ms, modules = measure(module)
+        walls.append(wall_ms)
+        totals.append(modules[module][1] / 1000)
+        for name, (self_us, _) in modules.items():
+            self_times.setdefault(name, []).append(self_us / 1000)
+    slowest = sorted(self_times.items(), key=lambda item: statistics.median(item[1]), reverse=True)[:top]
+    return {
+        "module": module,
+        "runs": runs,
+        "import_ms": round(statistics.median(totals), 1),
+        "wall_ms": round(statistics.median(walls), 1),
+        "slowest_self_ms": {name: round(statistics.median(times), 1) for name, times in slowest},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=10, help="slowest modules (self time) to list")
+    parser.add_argument("--budget-ms", type=float, default=1500, help="fail above this median import time")
+    args = parser.parse_args()
+
+    report = run(args.module, args.runs, args.top)
+    report["budget_ms"] = args.budget_ms
+    report["within_budget"] = report["import_ms"] <= args.budget_ms
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report["within_budget"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+"""
+End-to-end load test of the /api/v1/users routes.
+
+Drives a weighted mix of reads and writes either in-process (``--target
+asgi``: ``create_app()`` over httpx's ASGI transport, repository replaced
+by an in-memory one so no database is needed) or over HTTP against a
+running server (``--target http://127.0.0.1:8000``, e.g. uvicorn plus the
+docker-compose Postgres). Load is closed-loop (``--concurrency`` clients
+back to back) or open-loop (``--rate`` arrivals per second, latency taken
+from the scheduled send time so a slow server can't hide its queueing).
+
+Reports throughput and p50/p95/p99/max latency per route as JSON. With
+``--baseline`` each route is checked against a saved report: p95/p99 above
+or throughput below it by more than ``--tolerance``, or a higher error
+rate, fail the run with exit status 1. An open-loop run that had to skip
+arrivals (``--concurrency`` requests already in flight) fails too, with or
+without a baseline: it did not offer the requested rate.
+
+    python -m tests.benchmarks.load_test --concurrency 32 --duration 10
+    python -m tests.benchmarks.load_test --rate 500 --duration 30 --target http://127.0.0.1:8000
+    python -m tests.benchmarks.load_test --baseline tests/benchmarks/load_baseline.json
+    python -m tests.benchmarks.load_test --save-baseline tests/benchmarks/load_baseline.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import math
+import random
+import sys
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import httpx
+from argon2 import PasswordHasher
+
+from app.domain.entities.user import UserEntity
+from app.domain.repositories.user_repository import UserRepository
+
+API = "/api/v1/users"
+
+
+class InMemoryUserRepository(UserRepository):
+    """
+    UserRepository over a dict, for load tests without a database.
+
+    ``latency`` seconds are awaited per call to stand in for a DB round trip.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self._users: dict[int, UserEntity] = {}
+        self._by_email: dict[str, int] = {}
+        self._ids = itertools.count(1)
+
+    def add(self, user: UserEntity) -> UserEntity:
+        """Store ``user`` under its own id (priming a replay); later creates get higher ids."""
+        assert user.id is not None
+        self._users[user.id] = user
+        self._by_email[user.email.lower()] = user.id
+        self._ids = itertools.count(max(self._users) + 1)
+        return user
+
+    async def _round_trip(self) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def _insert(self, user: UserEntity) -> UserEntity | None:
+        email = user.email.lower()
+        if email in self._by_email:
+            return None
+        user_id = next(self._ids)
+        self._users[user_id] = user.model_copy(update={"id": user_id})
+        self._by_email[email] = user_id
+        return self._users[user_id]
+
+    async def create_user(self, db, user: UserEntity) -> UserEntity:
+        await self._round_trip()
+        created = self._insert(user)
+        if created is None:
+            raise ValueError("Email already registered")
+        return created
+
+    async def create_users(self, db, users: list[UserEntity]) -> list[UserEntity | None]:
+        await self._round_trip()
+        return [self._insert(user) for user in users]
+
+    async def get_user_by_email(self, db, email: str) -> UserEntity | None:
+        await self._round_trip()
+        user_id = self._by_email.get(email.lower())
+        return self._users.get(user_id) if user_id is not None else None
+
+    async def get_user_by_id(self, db, user_id: int) -> UserEntity | None:
+        await self._round_trip()
+        return self._users.get(user_id)
+
+    async def list_users(self, db, *, limit: int, after_id: int | None = None) -> list[UserEntity]:
+        await self._round_trip()
+        ids = sorted(user_id for user_id in self._users if after_id is None or user_id > after_id)
+        return [self._users[user_id] for user_id in ids[:limit]]
+
+    async def stream_users(self, db, *, batch_size: int = 1000) -> AsyncIterator[list[UserEntity]]:
+        users = list(self._users.values())
+        for start in range(0, len(users), batch_size):
+            await self._round_trip()
+            yield users[start : start + batch_size]
+
+    async def update_user(self, db, user_id: int, changes: dict[str, Any]) -> UserEntity | None:
+        await self._round_trip()
+        user = self._users.get(user_id)
+        if user is None:
+            return None
+        self._users[user_id] = user.model_copy(update=changes)
+        return self._users[user_id]
+
+    async def delete_user(self, db, user_id: int) -> bool:
+        await self._round_trip()
+        user = self._users.pop(user_id, None)
+        if user is None:
+            return False
+        self._by_email.pop(user.email.lower(), None)
+        return True
+
+
+@dataclass
+class Workload:
+    """Users known to exist, shared by every simulated client."""
+
+    run_id: str
+    rng: random.Random
+    ids: list[int] = field(default_factory=list)
+    emails: list[str] = field(default_factory=list)
+    created: list[int] = field(default_factory=list)  # Created by this run, safe to delete
+    serial: itertools.count = field(default_factory=itertools.count)
+
+    def new_user(self) -> dict[str, str]:
+        n = next(self.serial)
+        return {
+            "email": f"load-{self.run_id}-{n}@example.com",
+            "full_name": f"Load User {n}",
+            "password": "pw-" + str(n),
+        }
+
+
+type Request = tuple[str, str, str, dict[str, Any] | None, frozenset[int]]  # route, method, url, json, expected
+type Operation = Callable[[Workload], Request]
+
+OK = frozenset({200})
+
+
+def read_user(w: Workload) -> Request:
+    return f"GET {API}/{{user_id}}", "GET", f"{API}/{w.rng.choice(w.ids)}", None, OK
+
+
+def read_by_email(w: Workload) -> Request:
+    return f"GET {API}/by-email/{{email}}", "GET", f"{API}/by-email/{w.rng.choice(w.emails)}", None, OK
+
+
+def list_users(w: Workload) -> Request:
+    return f"GET {API}", "GET", f"{API}?limit=50", None, OK
+
+
+def create_user(w: Workload) -> Request:
+    return f"POST {API}", "POST", API, w.new_user(), OK
+
+
+def update_user(w: Workload) -> Request:
+    body = {"full_name": f"Renamed {w.rng.randrange(1_000_000)}"}
+    return f"PUT {API}/{{user_id}}", "PUT", f"{API}/{w.rng.choice(w.ids)}", body, OK
+
+
+def delete_user(w: Workload) -> Request:
+    if not w.created:
+        return read_user(w)
+    user_id = w.created.pop(w.rng.randrange(len(w.created)))
+    return f"DELETE {API}/{{user_id}}", "DELETE", f"{API}/{user_id}", None, OK
+
+
+# Read-heavy, roughly what a user service sees; weights are relative
+MIX: list[tuple[Operation, int]] = [
+    (read_user, 45),
+    (read_by_email, 15),
+    (list_users, 15),
+    (update_user, 12),
+    (create_user, 8),
+    (delete_user, 5),
+]
+
+
+@dataclass
+class Recorder:
+    warmup_until: float
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+
+    def record(self, route: str, latency: float, ok: bool, finished_at: float) -> None:
+        if finished_at < self.warmup_until:
+            return
+        self.latencies.setdefault(route, []).append(latency)
+        if not ok:
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+
+async def send(client: httpx.AsyncClient, workload: Workload, recorder: Recorder, scheduled: float) -> None:
+    operations, weights = zip(*MIX, strict=True)
+    route, method, url, body, expected = workload.rng.choices(operations, weights)[0](workload)
+    try:
+        response = await client.request(method, url, json=body)
+        ok = response.status_code in expected
+        if ok and method == "POST":
+            workload.created.append(response.json()["id"])
+    except httpx.HTTPError:
+        ok = False
+    finished = time.perf_counter()
+    recorder.record(route, finished - scheduled, ok, finished)
+
+
+async def closed_loop(client, workload, recorder, concurrency: int, deadline: float) -> None:
+    async def user() -> None:
+        while time.perf_counter() < deadline:
+            await send(client, workload, recorder, time.perf_counter())
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+
+
+async def open_loop(client, workload, recorder, rate: float, max_in_flight: int, deadline: float) -> int:
+    """Send at ``rate`` per second; returns arrivals skipped because ``max_in_flight`` were pending."""
+    in_flight: set[asyncio.Task[None]] = set()
+    skipped = 0
+    start = time.perf_counter()
+    for n in itertools.count():
+        scheduled = start + n / rate
+        if scheduled >= deadline:
+            break
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        if len(in_flight) >= max_in_flight:
+            skipped += 1
+            continue
+        task = asyncio.create_task(send(client, workload, recorder, scheduled))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+    await asyncio.gather(*in_flight)
+    return skipped
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile: the smallest value with at least ``fraction`` of them at or below it."""
+    # Rounded first so float noise (0.07 * 100 = 7.000000000000001) can't push the rank up by one
+    rank = math.ceil(round(fraction * len(sorted_values), 9))
+    return sorted_values[max(0, min(len(sorted_values) - 1, rank - 1))]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict[str, Any]:
+    routes = {}
+    for route, latencies in sorted(recorder.latencies.items()):
+        latencies.sort()
+        routes[route] = {
+            "requests": len(latencies),
+            "errors": recorder.errors.get(route, 0),
+            "throughput_rps": round(len(latencies) / elapsed, 1),
+            **{
+                f"{name}_ms": round(percentile(latencies, q) * 1000, 3)
+                for name, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+            },
+        }
+    total = sum(route["requests"] for route in routes.values())
+    return {
+        "requests": total,
+        "errors": sum(route["errors"] for route in routes.values()),
+        "throughput_rps": round(total / elapsed, 1),
+        "routes": routes,
+    }
+
+
+def compare(baseline: dict[str, Any], report: dict[str, Any], tolerance: float) -> list[str]:
+    """Regressions of ``report`` against ``baseline``, one message each."""
+    failures = []
+    for route, before in baseline["routes"].items():
+        now = report["routes"].get(route)
+        if now is None:
+            failures.append(f"{route}: no requests")
+            continue
+        for key in ("p95_ms", "p99_ms"):
+            if now[key] > before[key] * (1 + tolerance):
+                failures.append(f"{route}: {key} {now[key]} > baseline {before[key]} (+{tolerance:.0%})")
+        if now["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            failures.append(
+                f"{route}: throughput {now['throughput_rps']} < baseline {before['throughput_rps']} (-{tolerance:.0%})"
+            )
+        if now["errors"] / now["requests"] > before["errors"] / max(before["requests"], 1):
+            failures.append(f"{route}: error rate rose to {now['errors']}/{now['requests']}")
+    return failures + load_shortfall(report)
+
+
+def load_shortfall(report: dict[str, Any]) -> list[str]:
+    """Open-loop arrivals that were never sent: the offered rate wasn't delivered, so latencies understate it."""
+    skipped = report.get("skipped_arrivals", 0)
+    if not skipped:
+        return []
+    return [f"open loop skipped {skipped} arrivals: all {report['concurrency']} in-flight slots were busy"]
+
+
+async def seed_http(client: httpx.AsyncClient, workload: Workload, users: int) -> None:
+    for start in range(0, users, 1000):
+        batch = [workload.new_user() for _ in range(min(1000, users - start))]
+        response = await client.post(f"{API}/bulk", json=batch)
+        response.raise_for_status()
+        for item in response.json()["items"]:
+            if item["status"] == "created":
+                workload.ids.append(item["user"]["id"])
+                workload.emails.append(item["user"]["email"])
+
+
+async def no_session():
+    yield None
+
+
+def in_process_client(repository: InMemoryUserRepository) -> httpx.AsyncClient:
+    from app.dependencies import get_db, get_read_db, get_user_repository
+    from app.factory import create_app
+
+    app = create_app()
+    app.dependency_overrides[get_user_repository] = lambda: repository
+    app.dependency_overrides[get_db] = no_session
+    app.dependency_overrides[get_read_db] = no_session
+    # No lifespan: startup would check the schema of a database that isn't there
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load-test")
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    workload = Workload(run_id=uuid.uuid4().hex[:8], rng=random.Random(args.seed))
+    if args.target == "asgi":
+        repository = InMemoryUserRepository(latency=args.db_latency_ms / 1000)
+        for _ in range(args.users):
+            new = workload.new_user()
+            entity = UserEntity(email=new["email"], full_name=new["full_name"], hashed_password="x")
+            user = await repository.create_user(None, entity)
+            assert user.id is not None
+            workload.ids.append(user.id)
+            workload.emails.append(user.email)
+        client = in_process_client(repository)
+    else:
+        client = httpx.AsyncClient(base_url=args.target, timeout=args.timeout)
+        await seed_http(client, workload, args.users)
+
+    async with client:
+        start = time.perf_counter()
+        recorder = Recorder(warmup_until=start + args.warmup)
+        deadline = start + args.warmup + args.duration
+        skipped = 0
+        if args.rate:
+            skipped = await open_loop(client, workload, recorder, args.rate, args.concurrency, deadline)
+        else:
+            await closed_loop(client, workload, recorder, args.concurrency, deadline)
+        elapsed = time.perf_counter() - start - args.warmup
+
+    return {
+        "target": args.target,
+        "model": "open" if args.rate else "closed",
+        "concurrency": args.concurrency,
+        "rate": args.rate,
+        "duration_s": args.duration,
+        "seed_users": args.users,
+        **({"skipped_arrivals": skipped} if args.rate else {}),
+        **summarize(recorder, elapsed),
+    }
+
+
+@contextmanager
+def in_process_tuning(cheap_hashing: bool, quiet_logs: bool) -> Iterator[None]:
+    """Minimal argon2 cost and WARNING-level app logs for in-process runs."""
+    from app.infrastructure.logging import logger
+
+    with ExitStack() as stack:
+        if cheap_hashing:
+            cheap = PasswordHasher(time_cost=1, memory_cost=1024, parallelism=1)
+            stack.enter_context(patch("app.infrastructure.security.get_password_hasher", lambda: cheap))
+        if quiet_logs:
+            stack.callback(logger.setLevel, logger.level)
+            logger.setLevel(logging.WARNING)
+        yield
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default="asgi", help="'asgi' (in-process, no database) or a base URL")
+    parser.add_argument("--concurrency", type=int, default=32, help="clients (closed loop) or max in flight (open)")
+    parser.add_argument("--rate", type=float, default=0.0, help="arrivals per second; enables the open loop")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds of load before measuring")
+    parser.add_argument("--users", type=int, default=1000, help="users seeded before the run")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the request mix")
+    parser.add_argument("--timeout", type=float, default=10.0, help="HTTP timeout per request (URL targets)")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="asgi: simulated DB round trip per call")
+    parser.add_argument(
+        "--real-hashing",
+        action="store_true",
+        help="asgi: hash with the configured argon2 cost instead of a minimal one",
+    )
+    parser.add_argument("--verbose-logs", action="store_true", help="asgi: keep the app's INFO logs (access log)")
+    parser.add_argument("--baseline", type=Path, help="fail on regressions against this report")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--save-baseline", type=Path, help="write this run's report as the new baseline")
+    args = parser.parse_args()
+
+    in_process = args.target == "asgi"
+    with in_process_tuning(in_process and not args.real_hashing, in_process and not args.verbose_logs):
+        report = asyncio.run(run(args))
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(report, indent=2) + "\n")
+    if args.baseline:
+        failures = compare(json.loads(args.baseline.read_text()), report, args.tolerance)
+        report["regressions"] = failures
+    else:
+        failures = load_shortfall(report)
+        if failures:
+            report["failures"] = failures
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Per-call cost of logging on the request path, synchronous vs. queued.
+
+Times ``logger.info(...)`` as seen by the caller for each pipeline mode,
+writing to a sink that sleeps ``--sink-delay-ms`` per write to mimic a
+back-pressured stdout. The queued modes should stay flat while the sink is
+slow; ``dropped`` shows what the overflow policy discarded. No database needed.
+
+    python -m tests.benchmarks.log_call --calls 20000 --sink-delay-ms 0.2
+"""
+
+import argparse
+import io
+import json
+import statistics
+import sys
+import time
+from contextlib import redirect_stderr
+
+from app.infrastructure.logging import CustomLogger, queue_stats
+
+MODES = {
+    "sync-text": {"log_format": "text", "queue_size": 0},
+    "sync-json": {"log_format": "json", "queue_size": 0},
+    "queue-text": {"log_format": "text", "queue_size": 10000},
+    "queue-json": {"log_format": "json", "queue_size": 10000},
+}
+
+
+class SlowSink(io.TextIOBase):
+    """Discards output, taking ``delay`` seconds per write like a congested pipe."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def write(self, text: str) -> int:
+        if self.delay:
+            time.sleep(self.delay)
+        return len(text)
+
+    def isatty(self) -> bool:
+        return False
+
+
+def measure(name: str, calls: int, delay: float, **options) -> dict:
+    with redirect_stderr(SlowSink(delay)):
+        custom = CustomLogger(f"bench.{name}", "INFO", **options)
+    logger = custom._logger
+    timings = []
+    for i in range(calls):
+        start = time.perf_counter_ns()
+        logger.info("GET /api/v1/users/%s -> %s in %.1f ms", i, 200, 1.5)
+        timings.append(time.perf_counter_ns() - start)
+    # Also time a call filtered out by level, the cheapest possible path
+    filtered_start = time.perf_counter_ns()
+    for _ in range(calls):
+        logger.debug("never emitted %s", 1)
+    filtered_ns = (time.perf_counter_ns() - filtered_start) / calls
+    stats = queue_stats(logger)
+    custom._stop_listener()
+    timings.sort()
+    return {
+        "mode": name,
+        "median_us": round(statistics.median(timings) / 1000, 2),
+        "p99_us": round(timings[int(len(timings) * 0.99)] / 1000, 2),
+        "max_us": round(timings[-1] / 1000, 2),
+        "filtered_us": round(filtered_ns / 1000, 3),
+        "dropped": stats["dropped"] if stats else 0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--sink-delay-ms", type=float, default=0.2, help="time the sink takes per write")
+    parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=list(MODES))
+    args = parser.parse_args()
+
+    results = [measure(mode, args.calls, args.sink_delay_ms / 1000, **MODES[mode]) for mode in args.modes]
+    json.dump({"calls": args.calls, "sink_delay_ms": args.sink_delay_ms, "results": results}, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Replays captured production traffic (TRAFFIC_CAPTURE) against the app.
+
+Requests are sent in captured order at their captured offsets divided by
+``--speed`` (2 = twice as fast), so the real arrival gaps, and with them
+the real overlap between requests, are kept. ``--speed 0`` sends as fast
+as possible with at most ``--concurrency`` in flight, by default the most
+the capture ever had in flight. Latency is taken from each request's
+scheduled time, so queueing behind a slow server counts.
+
+Targets are load_test's: ``asgi`` runs ``create_app()`` in-process over an
+in-memory repository primed with the users the capture reads by id or
+email; a base URL replays against a running server (``--prime`` creates
+the emails the capture looks up; ids must already exist there). Requests
+whose body was not captured are skipped.
+
+Prints per-route throughput, p50/p95/p99/max latency (next to the captured
+p50/p95), errors and responses whose status differs from the capture, as
+JSON. ``--baseline`` gates the run like load_test.
+
+    python -m tests.benchmarks.replay captures/
+    python -m tests.benchmarks.replay captures/capture-4242-20261018T101500.jsonl --speed 4
+    python -m tests.benchmarks.replay captures/ --speed 0 --target http://127.0.0.1:8000 --prime
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from app.adapters.api.middleware.access_log import UNMATCHED_ROUTE
+from app.domain.entities.user import UserEntity
+from app.infrastructure.traffic_capture import read_capture
+from tests.benchmarks.load_test import (
+    API,
+    InMemoryUserRepository,
+    Recorder,
+    compare,
+    in_process_client,
+    in_process_tuning,
+    percentile,
+    summarize,
+)
+
+_PARAMETER = re.compile(r"\\\{(\w+)\\\}")
+
+
+def route_key(record: dict[str, Any]) -> str:
+    route = record["route"] if record["route"] != UNMATCHED_ROUTE else record["path"]
+    return f"{record['method']} {route}"
+
+
+def route_params(route: str, path: str) -> dict[str, str]:
+    """Path parameters of ``path`` by name of the route template's placeholders."""
+    match = re.fullmatch(_PARAMETER.sub(r"(?P<\1>[^/]+)", re.escape(route)), path)
+    return match.groupdict() if match else {}
+
+
+def peak_concurrency(records: list[dict[str, Any]]) -> int:
+    """Most requests the capture had in flight at once."""
+    events = sorted(
+        [(record["ts"], 1) for record in records] + [(record["ts"] + record["ms"] / 1000, -1) for record in records]
+    )
+    peak = in_flight = 0
+    for _, change in events:
+        in_flight += change
+        peak = max(peak, in_flight)
+    return peak
+
+
+def referenced_users(records: list[dict[str, Any]]) -> tuple[set[int], set[str]]:
+    """
+    Ids and emails the capture found (a request on them didn't get 404)
+    without creating them itself.
+    """
+    ids: set[int] = set()
+    emails: set[str] = set()
+    created: set[str] = set()
+    for record in records:
+        params = route_params(record["route"], record["path"]) if record["status"] != 404 else {}
+        if params.get("user_id", "").isdigit():
+            ids.add(int(params["user_id"]))
+        if "email" in params:
+            emails.add(params["email"].lower())
+        if record["method"] == "POST" and record["route"] in (API, f"{API}/bulk"):
+            body = record.get("body")
+            for user in body if isinstance(body, list) else [body]:
+                if isinstance(user, dict) and isinstance(user.get("email"), str):
+                    created.add(user["email"].lower())
+    return ids, emails - created
+
+
+def prime_in_memory(repository: InMemoryUserRepository, ids: set[int], emails: set[str]) -> None:
+    for user_id in sorted(ids):
+        repository.add(
+            UserEntity(id=user_id, email=f"replay-{user_id}@example.com", full_name="Replay", hashed_password="x")
+        )
+    next_id = max(ids, default=0)
+    for n, email in enumerate(sorted(emails), start=next_id + 1):
+        repository.add(UserEntity(id=n, email=email, full_name="Replay", hashed_password="x"))
+
+
+async def prime_http(client: httpx.AsyncClient, emails: set[str]) -> None:
+    users = [{"email": email, "full_name": "Replay", "password": "replay-password"} for email in sorted(emails)]
+    for start in range(0, len(users), 1000):
+        response = await client.post(f"{API}/bulk", json=users[start : start + 1000])
+        response.raise_for_status()
+
+
+async def send_record(
+    client: httpx.AsyncClient,
+    record: dict[str, Any],
+    recorder: Recorder,
+    mismatches: dict[str, int],
+    scheduled: float,
+) -> None:
+    route = route_key(record)
+    url = record["path"] + (f"?{record['query']}" if record.get("query") else "")
+    try:
+        response = await client.request(record["method"], url, json=record.get("body"))
+        ok = response.status_code < 500
+        if response.status_code != record["status"]:
+            mismatches[route] = mismatches.get(route, 0) + 1
+    except httpx.HTTPError:
+        ok = False
+    finished = time.perf_counter()
+    recorder.record(route, finished - scheduled, ok, finished)
+
+
+async def replay(
+    client: httpx.AsyncClient,
+    records: list[dict[str, Any]],
+    speed: float,
+    concurrency: int,
+) -> tuple[Recorder, dict[str, int], float]:
+    """Send every record; returns the latencies, status mismatches per route and elapsed seconds."""
+    recorder = Recorder(warmup_until=0.0)
+    mismatches: dict[str, int] = {}
+    limit = asyncio.Semaphore(concurrency if concurrency > 0 else sys.maxsize)
+    in_flight: set[asyncio.Task[None]] = set()
+    start = time.perf_counter()
+    first = records[0]["ts"] if records else 0.0
+    for record in records:
+        scheduled = start + (record["ts"] - first) / speed if speed else 0.0
+        if speed:
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        await limit.acquire()
+        if not speed:
+            scheduled = time.perf_counter()
+        task = asyncio.create_task(send_record(client, record, recorder, mismatches, scheduled))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+        task.add_done_callback(lambda _: limit.release())
+    await asyncio.gather(*in_flight)
+    return recorder, mismatches, time.perf_counter() - start
+
+
+def captured_latencies(records: list[dict[str, Any]]) -> dict[str, dict[str, float]]:
+    """p50/p95 of the durations the capture recorded, per route."""
+    by_route: dict[str, list[float]] = {}
+    for record in records:
+        by_route.setdefault(route_key(record), []).append(record["ms"])
+    return {
+        route: {"captured_p50_ms": percentile(sorted(ms), 0.50), "captured_p95_ms": percentile(sorted(ms), 0.95)}
+        for route, ms in by_route.items()
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    captured = read_capture(args.captures)
+    records = [record for record in captured if "omitted" not in record]
+    concurrency = args.concurrency if args.concurrency is not None else (0 if args.speed else peak_concurrency(records))
+    ids, emails = referenced_users(records)
+    if args.target == "asgi":
+        repository = InMemoryUserRepository(latency=args.db_latency_ms / 1000)
+        prime_in_memory(repository, ids, emails)
+        client = in_process_client(repository)
+    else:
+        client = httpx.AsyncClient(base_url=args.target, timeout=args.timeout)
+        if args.prime:
+            await prime_http(client, emails)
+
+    async with client:
+        recorder, mismatches, elapsed = await replay(client, records, args.speed, concurrency)
+
+    report = summarize(recorder, elapsed)
+    for route, captured_route in captured_latencies(records).items():
+        if route in report["routes"]:
+            report["routes"][route].update(captured_route)
+    return {
+        "target": args.target,
+        "speed": args.speed,
+        "concurrency": concurrency,
+        "capture_span_s": round(records[-1]["ts"] - records[0]["ts"], 3) if records else 0.0,
+        "elapsed_s": round(elapsed, 3),
+        "skipped_requests": len(captured) - len(records),
+        "status_mismatches": dict(sorted(mismatches.items())),
+        **report,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("captures", nargs="+", type=Path, help="capture files, or directories of them")
+    parser.add_argument("--target", default="asgi", help="'asgi' (in-process, no database) or a base URL")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed factor; 0 = as fast as possible")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="max requests in flight (default: unlimited when timed, the capture's peak at --speed 0)",
+    )
+    parser.add_argument("--prime", action="store_true", help="URL targets: create the emails the capture reads")
+    parser.add_argument("--timeout", type=float, default=10.0, help="HTTP timeout per request (URL targets)")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="asgi: simulated DB round trip per call")
+    parser.add_argument(
+        "--real-hashing",
+        action="store_true",
+        help="asgi: hash with the configured argon2 cost instead of a minimal one",
+    )
+    parser.add_argument("--verbose-logs", action="store_true", help="asgi: keep the app's INFO logs (access log)")
+    parser.add_argument("--baseline", type=Path, help="fail on regressions against this report")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--save-baseline", type=Path, help="write this run's report as the new baseline")
+    args = parser.parse_args()
+
+    in_process = args.target == "asgi"
+    with in_process_tuning(in_process and not args.real_hashing, in_process and not args.verbose_logs):
+        report = asyncio.run(run(args))
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(report, indent=2) + "\n")
+    failures = compare(json.loads(args.baseline.read_text()), report, args.tolerance) if args.baseline else []
+    if args.baseline:
+        report["regressions"] = failures
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
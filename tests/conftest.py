@@ -3,13 +3,40 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from fastapi.testclient import TestClient
 
-from app.dependencies import get_db, get_user_repository
+from app.dependencies import get_db, get_read_db, get_user_repository
+from app.domain.repositories.user_repository import UserRepository as UserRepositoryInterface
+from app.infrastructure.change_feed import ChangeFeedListener
 from app.infrastructure.config import DatabaseSettings, Settings, get_settings
 from app.infrastructure.database.connector import DatabaseConnector
+from app.infrastructure.database.query_timer import QueryBudget
 from app.infrastructure.database.repositories.user_repository import UserRepository
 from app.main import app
 
 
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_queries): fail the test if any request it sends to the app runs more SQL statements",
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """Opt-in query budget: ``@pytest.mark.query_budget(2)`` checks every request the test makes."""
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+    budget = QueryBudget(*marker.args, **marker.kwargs)
+    app.state.query_budget = budget
+    try:
+        result = yield
+    finally:
+        del app.state.query_budget
+    if budget.violations:
+        pytest.fail("Query budget exceeded:\n" + "\n".join(budget.violations), pytrace=False)
+    return result
+
+
 @pytest.fixture(autouse=True)
 def clean_env():
     """
@@ -25,7 +52,11 @@ def clean_env():
         Settings.model_config["env_file"] = None
         DatabaseSettings.model_config["env_file"] = None
 
-        with patch.object(DatabaseConnector, "create_database", new=AsyncMock()):
+        with (
+            patch.object(DatabaseConnector, "verify_schema_version", new=AsyncMock()),
+            patch.object(DatabaseConnector, "warm_up", new=AsyncMock(return_value=0)),
+            patch.object(ChangeFeedListener, "start"),
+        ):
             get_settings.cache_clear()
             yield
 
@@ -46,10 +77,24 @@ def mock_user_repo():
     """Fixture for a mocked user repository."""
     repo = MagicMock(spec=UserRepository)
     repo.create_user = AsyncMock()
+    repo.create_users = AsyncMock()
     repo.get_user_by_id = AsyncMock()
     repo.get_user_by_email = AsyncMock()
+    repo.list_users = AsyncMock()
+    repo.stream_users = MagicMock()
     repo.update_user = AsyncMock()
     repo.delete_user = AsyncMock()
+    # Views and existence checks use the interface defaults, so tests stub the entity methods above
+    for name in (
+        "get_user_view",
+        "get_user_view_by_email",
+        "list_user_views",
+        "stream_user_views",
+        "update_user_view",
+        "user_exists",
+        "email_exists",
+    ):
+        setattr(repo, name, getattr(UserRepositoryInterface, name).__get__(repo))
     return repo
 
 
@@ -66,6 +111,7 @@ def client(mock_user_repo, mock_db):
 
     app.dependency_overrides[get_user_repository] = lambda: mock_user_repo
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     with TestClient(app) as test_client:
         yield test_client
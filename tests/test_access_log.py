@@ -0,0 +1,105 @@
+import io
+import logging
+import os
+import random
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.adapters.api.middleware import AccessLogMiddleware, AccessLogSampler
+from app.infrastructure.config import AccessLogSettings, Settings
+from app.infrastructure.database.query_timer import query_timer_var
+from app.infrastructure.logging.context import RequestContextFilter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def access_records(caplog):
+    return [record for record in caplog.records if hasattr(record, "route")]
+
+
+def test_sampler_applies_route_rates_by_template_or_prefix():
+    sampler = AccessLogSampler(route_rates={"/ping": 0.0, "/api/v1/health": 0.0}, rng=random.Random(0))
+
+    assert sampler.admit("/ping", 200, 1.0) is None
+    assert sampler.admit("/api/v1/health/pool", 200, 1.0) is None
+    assert sampler.admit("/api/v1/healthz", 200, 1.0) == 0
+    # Errors and slow requests are always logged, with the count skipped before them
+    assert sampler.admit("/ping", 503, 1.0) == 1
+    assert sampler.admit("/ping", 200, 5000.0) == 0
+
+
+def test_sampler_rate_limits_each_route():
+    clock = FakeClock()
+    sampler = AccessLogSampler(route_limits={"/users": 2.0}, clock=clock)
+
+    assert [sampler.admit("/users", 200, 1.0) for _ in range(4)] == [0, 0, None, None]
+    assert sampler.admit("/other", 200, 1.0) == 0
+
+    clock.now = 0.5  # Refilled one token
+    assert sampler.admit("/users", 200, 1.0) == 2
+    assert sampler.admit("/users", 200, 1.0) is None
+
+
+def test_middleware_tags_logs_and_records_db_time(caplog):
+    logger = logging.getLogger("test.access")
+    handler = logging.StreamHandler(io.StringIO())
+    handler.addFilter(RequestContextFilter())
+    logger.addHandler(handler)
+    inner = FastAPI()
+
+    @inner.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        timer = query_timer_var.get()
+        assert timer is not None
+        timer.record(0.002)
+        timer.record(0.003)
+        logger.info("reading item %s", item_id)
+        return {"id": item_id}
+
+    inner.add_middleware(AccessLogMiddleware, logger=logger, sampler=AccessLogSampler())
+    try:
+        with caplog.at_level(logging.INFO, logger="test.access"), TestClient(inner) as client:
+            response = client.get("/items/7", headers={"X-Request-ID": "req-123"})
+            generated = client.get("/items/8", headers={"X-Request-ID": "bad id\nforged"}).headers["x-request-id"]
+    finally:
+        logger.removeHandler(handler)
+
+    assert response.headers["x-request-id"] == "req-123"
+    assert generated != "bad id\nforged" and len(generated) == 32
+    app_line, access = caplog.records[0], access_records(caplog)[0]
+    assert app_line.getMessage() == "reading item 7" and app_line.request_id == "req-123"
+    assert (access.method, access.route, access.status, access.db_queries) == ("GET", "/items/{item_id}", 200, 2)
+    assert access.db_ms == pytest.approx(5.0)
+    assert access.request_id == "req-123"
+
+
+def test_app_logs_route_templates(client, mock_user_repo, caplog):
+    mock_user_repo.get_user_by_id.return_value = None
+    with caplog.at_level(logging.INFO):
+        client.get("/api/v1/users/1")
+        response = client.get("/api/v1/does-not-exist")
+
+    routes = [record.route for record in access_records(caplog)]
+    assert "/api/v1/users/{user_id}" in routes and "<unmatched>" in routes
+    assert response.headers["x-request-id"]
+
+
+@pytest.mark.parametrize("source", ["shipped config", "class defaults"])
+def test_probes_are_sampled_down_out_of_the_box(source):
+    with patch.dict(os.environ, {}, clear=True):
+        settings = Settings.load_configs().ACCESS_LOG if source == "shipped config" else AccessLogSettings()
+    sampler = AccessLogSampler.from_settings(settings)
+
+    for route in ("/ping", "/welcome", "/api/v1/health"):
+        assert sampler._policy(route)[0] == 0.01
+    assert sampler._policy("/api/v1/users/changes")[1] == 1.0
+    assert sampler._policy("/api/v1/users/{user_id}") == (1.0, 0.0)
@@ -0,0 +1,139 @@
+import argparse
+
+import httpx
+import pytest
+
+from app.adapters.api.middleware import TrafficCaptureMiddleware
+from app.dependencies import get_db, get_read_db, get_user_repository
+from app.factory import create_app
+from app.infrastructure.traffic_capture import CaptureWriter, Tokenizer
+from tests.benchmarks import decrypt_cost, hot_paths, load_test, replay
+
+
+def test_hot_path_benchmarks_run_and_report_per_call_times():
+    report = hot_paths.run(["mapper.", "serialize."], repeat=2, min_time=0.001)
+
+    assert set(report["results"]) == {
+        "mapper.create_to_entity",
+        "mapper.update_to_changes",
+        "mapper.to_read",
+        "mapper.merge_update",
+        "serialize.UserRead.fastapi",
+        "serialize.UserRead.model_dump_json",
+    }
+    assert all(result["median_us"] > 0 and result["loops"] >= 1 for result in report["results"].values())
+    assert "pydantic" in report["versions"]
+
+
+def test_compare_flags_medians_slower_than_the_tolerance():
+    baseline = {"results": {"a": {"median_us": 10.0}, "b": {"median_us": 10.0}, "gone": {"median_us": 1.0}}}
+    current = {"results": {"a": {"median_us": 10.5}, "b": {"median_us": 12.0}, "new": {"median_us": 1.0}}}
+
+    rows = hot_paths.compare(baseline, current, tolerance=0.10)
+
+    assert [(row["benchmark"], row["ratio"], row["regressed"]) for row in rows] == [
+        ("a", 1.05, False),
+        ("b", 1.2, True),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_load_test_runs_the_route_mix_in_process():
+    args = argparse.Namespace(
+        target="asgi", seed=0, users=50, db_latency_ms=0.0, concurrency=4, rate=0.0, duration=0.3, warmup=0.0
+    )
+
+    with load_test.in_process_tuning(cheap_hashing=True, quiet_logs=True):
+        report = await load_test.run(args)
+
+    assert report["requests"] > 0 and report["errors"] == 0
+    assert "GET /api/v1/users/{user_id}" in report["routes"]
+
+
+def test_load_test_baseline_gate():
+    route = {"requests": 100, "errors": 0, "throughput_rps": 100.0, "p95_ms": 10.0, "p99_ms": 20.0}
+    baseline = {"routes": {"GET /a": route, "GET /b": route}}
+    report = {"routes": {"GET /a": {**route, "p99_ms": 24.0, "throughput_rps": 80.0}, "GET /b": {**route, "errors": 1}}}
+
+    assert load_test.compare(baseline, report, tolerance=0.25) == ["GET /b: error rate rose to 1/100"]
+    assert load_test.compare(baseline, report, tolerance=0.1) == [
+        "GET /a: p99_ms 24.0 > baseline 20.0 (+10%)",
+        "GET /a: throughput 80.0 < baseline 100.0 (-10%)",
+        "GET /b: error rate rose to 1/100",
+    ]
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(n) for n in range(1, 101)]
+
+    assert [load_test.percentile(values, q) for q in (0.0, 0.07, 0.5, 0.95, 0.99, 1.0)] == [1, 7, 50, 95, 99, 100]
+    assert load_test.percentile([float(n) for n in range(1, 21)], 0.95) == 19
+    assert load_test.percentile([3.0], 0.99) == 3
+
+
+def test_decrypts_count_the_rows_an_update_returns():
+    """ModifyTable reports 0 actual rows; the rows RETURNING decrypted come from its input node."""
+    select = {"Plan": {"Node Type": "Index Scan", "Actual Rows": 51, "Actual Loops": 1}}
+    update = {
+        "Plan": {
+            "Node Type": "ModifyTable",
+            "Actual Rows": 0,
+            "Actual Loops": 1,
+            "Plans": [{"Node Type": "Index Scan", "Actual Rows": 1, "Actual Loops": 1}],
+        }
+    }
+
+    assert decrypt_cost.plan_rows(select) == 51
+    assert decrypt_cost.plan_rows(update) == 1
+
+
+def test_skipped_open_loop_arrivals_fail_the_gate():
+    route = {"requests": 100, "errors": 0, "throughput_rps": 100.0, "p95_ms": 10.0, "p99_ms": 20.0}
+    report = {"concurrency": 8, "skipped_arrivals": 12, "routes": {"GET /a": route}}
+
+    assert load_test.compare({"routes": {"GET /a": route}}, report, tolerance=0.25) == [
+        "open loop skipped 12 arrivals: all 8 in-flight slots were busy"
+    ]
+    assert load_test.load_shortfall({**report, "skipped_arrivals": 0}) == []
+
+
+@pytest.mark.asyncio
+async def test_replay_of_captured_traffic_matches_the_captured_statuses(tmp_path):
+    app = create_app()
+    repository = load_test.InMemoryUserRepository()
+    app.dependency_overrides[get_user_repository] = lambda: repository
+    app.dependency_overrides[get_db] = app.dependency_overrides[get_read_db] = load_test.no_session
+    writer = CaptureWriter(tmp_path, Tokenizer("test-key"))
+    app.add_middleware(TrafficCaptureMiddleware, writer=writer)
+
+    with load_test.in_process_tuning(cheap_hashing=True, quiet_logs=True):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://capture") as client:
+            user = {"email": "Ada@Example.com", "full_name": "Ada", "password": "s3cret"}
+            user_id = (await client.post("/api/v1/users", json=user)).json()["id"]
+            await client.get(f"/api/v1/users/by-email/{user['email']}")
+            await client.put(f"/api/v1/users/{user_id}", json={"full_name": "Ada King"})
+            await client.get(f"/api/v1/users/{user_id}")
+            await client.get("/api/v1/users/999")
+        writer.close()
+
+        args = argparse.Namespace(
+            captures=[tmp_path], target="asgi", speed=0.0, concurrency=None, db_latency_ms=0.0, prime=False
+        )
+        report = await replay.run(args)
+
+    assert report["requests"] == 5 and report["errors"] == 0
+    assert report["status_mismatches"] == {}
+    assert set(report["routes"]) == {
+        "POST /api/v1/users",
+        "GET /api/v1/users/by-email/{email}",
+        "PUT /api/v1/users/{user_id}",
+        "GET /api/v1/users/{user_id}",
+    }
+    assert report["routes"]["GET /api/v1/users/{user_id}"]["requests"] == 2
+
+
+def test_response_benchmarks_report_the_fast_path_savings():
+    report = hot_paths.run(["response.user."], repeat=1, min_time=0.001)
+
+    assert set(report["results"]) == {"response.user.validated", "response.user.fast"}
+    assert set(report["fast_responses"]["response.user"]) == {"validated_us", "fast_us", "saved_us", "speedup"}
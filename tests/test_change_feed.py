@@ -0,0 +1,187 @@
+import asyncio
+import json
+import logging
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import psycopg
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.application.user_changes import user_change_events
+from app.dependencies import get_change_feed_listener
+from app.infrastructure.cache import CachedUserRepository, InMemoryCache
+from app.infrastructure.change_feed import (
+    ChangeFeed,
+    ChangeFeedListener,
+    UserChange,
+    install_user_change_trigger,
+)
+from app.infrastructure.change_feed.triggers import MAX_NOTIFY_ROWS
+from app.infrastructure.database.models import User
+from app.main import app
+
+# conftest stubs ChangeFeedListener.start so app startup never connects; keep the real one here.
+start_listener = ChangeFeedListener.start
+
+
+def payload(op: str = "update", user_id: int = 1, hashes=("old", "new")) -> str:
+    return json.dumps({"op": op, "rows": [[user_id, *hashes]]})
+
+
+class FakeConnection:
+    """Delivers the given payloads, then fails its liveness probe like a dropped connection."""
+
+    def __init__(self, payloads):
+        self.payloads = list(payloads)
+        self.executed = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def execute(self, query):
+        self.executed.append(query)
+        if query == "SELECT 1":
+            raise psycopg.OperationalError("connection lost")
+
+    async def notifies(self, timeout=None):
+        while self.payloads:
+            yield SimpleNamespace(payload=self.payloads.pop(0))
+
+
+def test_user_change_parses_trigger_payload():
+    [change] = UserChange.from_payload(payload())
+    assert change == UserChange(op="update", id=1, email_hashes=("old", "new"))
+    assert change.public() == {"op": "update", "id": 1}
+
+    statement = json.dumps({"op": "delete", "rows": [[1, "a"], [2, None]]})
+    assert UserChange.from_payload(statement) == [
+        UserChange(op="delete", id=1, email_hashes=("a",)),
+        UserChange(op="delete", id=2, email_hashes=()),
+    ]
+
+    [resync] = UserChange.from_payload(json.dumps({"op": "resync", "rows": 500}))
+    assert resync.op == "resync" and resync.reason == "500 rows changed in one statement"
+
+    with pytest.raises(ValueError):
+        UserChange.from_payload(json.dumps({"op": "truncate", "rows": [[1]]}))
+    with pytest.raises(ValueError):
+        UserChange.from_payload(json.dumps({"op": "update", "id": 1}))
+
+
+@pytest.mark.asyncio
+async def test_feed_fans_out_to_every_subscriber():
+    feed = ChangeFeed()
+    first, second = feed.subscribe(), feed.subscribe()
+
+    feed.publish_payload(payload(op="insert", hashes=("h",)))
+    feed.publish_payload("not json")
+
+    assert (await first.get()).op == "insert"
+    assert (await second.get()).op == "insert"
+    assert feed.stats() == {"subscribers": 2, "published": 1, "invalid": 1, "overflows": 0}
+
+    feed.publish_payload(json.dumps({"op": "delete", "rows": [[2, "a"], [3, "b"]]}))
+    assert [(await first.get()).id for _ in range(2)] == [2, 3]
+    assert feed.stats()["published"] == 3
+
+    first.close()
+    assert feed.stats()["subscribers"] == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_gets_one_resync_instead_of_backlog():
+    feed = ChangeFeed(queue_size=2)
+    with feed.subscribe() as subscription:
+        for user_id in range(5):
+            feed.publish(UserChange(op="update", id=user_id))
+
+        change = await subscription.get()
+        assert change.op == "resync" and change.reason == "subscriber overflow"
+
+        feed.publish(UserChange(op="delete", id=9))
+        assert (await subscription.get()).id == 9
+        assert feed.stats()["overflows"] == 1
+
+
+@pytest.mark.asyncio
+async def test_listener_publishes_and_resyncs_after_reconnect():
+    feed = ChangeFeed()
+    subscription = feed.subscribe()
+    connections = [FakeConnection([payload(user_id=1)]), FakeConnection([payload(user_id=2)])]
+
+    async def connect():
+        if connections:
+            return connections.pop(0)
+        await asyncio.Event().wait()
+
+    listener = ChangeFeedListener(connect, feed, channel="user_changes", logger=logging.getLogger("test"))
+    with patch("app.infrastructure.change_feed.listener.INITIAL_RECONNECT_DELAY", 0):
+        start_listener(listener)
+        received = [await asyncio.wait_for(subscription.get(), 1) for _ in range(3)]
+        await listener.stop()
+
+    assert [(change.op, change.id) for change in received] == [("update", 1), ("resync", None), ("update", 2)]
+    assert listener.reconnects == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_applies_feed_changes():
+    cache = InMemoryCache(max_size=10)
+    repository = CachedUserRepository(MagicMock(), cache, ttl=60, negative_ttl=5)
+    await cache.set("user:id:1", "cached", ttl=60)
+    await cache.set("user:email:old", 1, ttl=60)
+    await cache.set("user:id:2", "cached", ttl=60)
+
+    [change] = UserChange.from_payload(payload())
+    await repository.apply_change(change)
+    assert cache.stats().size == 1
+
+    await repository.apply_change(UserChange.resync("test"))
+    assert cache.stats().size == 0
+
+
+def test_trigger_notifies_channel_once_per_statement():
+    conn = MagicMock()
+    conn.dialect = postgresql.dialect()
+
+    install_user_change_trigger(conn, User.__table__, "user_changes")
+
+    function, drop_row_trigger, *triggers = [str(call.args[0]) for call in conn.execute.call_args_list]
+    assert "CREATE OR REPLACE FUNCTION" in function
+    assert function.count("pg_notify('user_changes'") == 2
+    assert f"changed > {MAX_NOTIFY_ROWS}" in function and "'resync'" in function
+    assert "json_build_array(n.id, o.email_hash, n.email_hash)" in function
+    assert drop_row_trigger.startswith("DROP TRIGGER IF EXISTS users_notify_change")
+    creates = [statement for statement in triggers if statement.startswith("CREATE TRIGGER")]
+    assert len(creates) == 3
+    assert all("FOR EACH STATEMENT" in statement and "FOR EACH ROW" not in statement for statement in creates)
+    assert "AFTER UPDATE" in creates[1] and "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows" in creates[1]
+
+
+@pytest.mark.asyncio
+async def test_sse_stream_resyncs_resumed_clients_and_sends_keep_alives():
+    feed = ChangeFeed()
+    events = user_change_events(feed, heartbeat=0.01, resumed=True)
+
+    first = await anext(events)
+    assert first.startswith(b"id: 1\nevent: resync\n")
+    assert await anext(events) == b": keep-alive\n\n"
+
+    feed.publish(UserChange(op="delete", id=7, email_hashes=("secret",)))
+    event = await anext(events)
+    assert event == b'id: 2\nevent: delete\ndata: {"op": "delete", "id": 7}\n\n'
+
+    await events.aclose()
+    assert feed.stats()["subscribers"] == 0
+
+
+def test_change_feed_health_reports_disabled(client):
+    app.dependency_overrides[get_change_feed_listener] = lambda: None
+
+    response = client.get("/api/v1/health/change-feed")
+
+    assert response.json() == {"enabled": False}
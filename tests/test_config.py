@@ -1,22 +1,37 @@
 import os
+import subprocess
+import sys
 from unittest.mock import patch
 
-from app.infrastructure.config import Settings
+import pytest
+from pydantic import ValidationError
+
+from app.infrastructure.config import Settings, get_settings
 
 
 def test_default_settings():
-    """Test that default settings are loaded correctly."""
+    """Test that .conf values apply over class defaults when the environment sets nothing."""
     # Ensure no relevant env vars are set
     with patch.dict(os.environ, {}, clear=True):
         settings = Settings.load_configs()
-        assert settings.APP_NAME == "Empty APP"
-        assert settings.LOG_LEVEL == "INFO"
+        assert settings.APP_NAME == "Empty App Backend"  # config/app.conf
+        assert settings.LOG_LEVEL == "INFO"  # Class default, not in any .conf
         assert settings.DEBUG is False
-        assert settings.CORS_ORIGINS == ["*"]
+        assert settings.CORS_ORIGINS == ["http://localhost:3000", "http://127.0.0.1:3000"]
         assert settings.DATABASE is not None
         assert settings.DATABASE.HOST == "localhost"
 
 
+def test_conf_only_values_survive_loading():
+    """Test that class defaults don't mask .conf values, while set env vars still win."""
+    with patch.dict(os.environ, {"POOL_SIZE": "7"}, clear=True):
+        settings = Settings.load_configs()
+
+    assert settings.DATABASE.WARMUP_CONNECTIONS == 5  # connection.conf; the class default is 0
+    assert settings.DATABASE.POOL_SIZE == 7
+    assert settings.TRAFFIC_CAPTURE.EXCLUDE_PATHS == ["/metrics", "/api/v1/users/changes"]
+
+
 def test_env_var_override():
     """Test that environment variables override defaults."""
     env_vars = {
@@ -60,3 +75,47 @@ def test_int_parsing():
     with patch.dict(os.environ, {"PORT": "9999"}):  # PORT is in DatabaseSettings
         settings = Settings.load_configs()
         assert settings.DATABASE.PORT == 9999
+
+
+def test_settings_snapshot_is_shared_and_frozen():
+    """Test that get_settings returns one immutable instance."""
+    settings = get_settings()
+    assert get_settings() is settings
+    with pytest.raises(ValidationError):
+        settings.APP_NAME = "changed"
+    with pytest.raises(ValidationError):
+        settings.DATABASE.HOST = "elsewhere"
+
+
+def test_app_import_loads_settings_once_and_defers_logging_setup():
+    """Test that importing the app parses config files once and does not import coloredlogs or uvicorn."""
+    code = """
+import sys
+from app.infrastructure.config import Settings
+
+calls = 0
+load = Settings.load_configs.__func__
+
+def counting(cls):
+    global calls
+    calls += 1
+    return load(cls)
+
+Settings.load_configs = classmethod(counting)
+import app.main
+print(calls, "coloredlogs" in sys.modules, "uvicorn" in sys.modules)
+"""
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["1", "False", "False"]
+
+
+def test_section_env_vars_are_prefixed():
+    """Test that generic field names only apply to their own section from the environment."""
+    env = {"ENABLED": "false", "SAMPLE_RATE": "0.5", "USER_CACHE_ENABLED": "false", "ACCESS_LOG_SAMPLE_RATE": "0.25"}
+    with patch.dict(os.environ, env, clear=True):
+        settings = Settings.load_configs()
+
+    assert settings.USER_CACHE.ENABLED is False
+    assert settings.CHANGE_FEED.ENABLED is True and settings.METRICS.ENABLED is True
+    assert settings.ACCESS_LOG.SAMPLE_RATE == 0.25
+    assert settings.TRAFFIC_CAPTURE.SAMPLE_RATE == 1.0
@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import os
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from app.dependencies import get_db, get_db_connector
+from app.infrastructure.config import Settings
+from app.infrastructure.database.connector import DatabaseConnector, DatabaseDrainingError
+from app.infrastructure.database.pool import InstrumentedAsyncQueuePool, PoolTelemetry
+from app.infrastructure.metrics import Histogram
+from app.main import app
+
+# conftest stubs DatabaseConnector.warm_up so app startup never connects; keep the real one here.
+warm_up = DatabaseConnector.warm_up
+
+
+def make_connector(**env: str) -> DatabaseConnector:
+    with patch.dict(os.environ, env):
+        settings = Settings.load_configs()
+    return DatabaseConnector(settings, logging.getLogger("test"))
+
+
+def test_engine_options_follow_pool_settings():
+    """Test that pool sizing and connect args come from the database settings."""
+    connector = make_connector(
+        POOL_SIZE="7",
+        MAX_OVERFLOW="3",
+        POOL_TIMEOUT="12",
+        POOL_RECYCLE="600",
+        POOL_USE_LIFO="true",
+        POOL_PRE_PING="false",
+        CONNECT_TIMEOUT="4",
+        APPLICATION_NAME="users-api",
+    )
+    options = connector.engine_options
+
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert options["pool_size"] == 7
+    assert options["max_overflow"] == 3
+    assert options["pool_timeout"] == 12
+    assert options["pool_recycle"] == 600
+    assert options["pool_use_lifo"] is True
+    assert options["pool_pre_ping"] is False
+    assert options["connect_args"]["connect_timeout"] == 4
+    assert options["connect_args"]["application_name"] == "users-api"
+
+
+def test_null_pool_skips_sizing_options():
+    """Test that POOL_CLASS=null disables pooling."""
+    options = make_connector(POOL_CLASS="null").engine_options
+    assert options["poolclass"] is NullPool
+    assert "pool_size" not in options
+
+
+def test_engine_is_built_with_instrumented_pool():
+    """Test that the configured pool reaches the engine and reports stats."""
+    connector = make_connector(POOL_SIZE="4")
+    stats = connector.pool_stats()
+
+    assert stats["pool_class"] == "InstrumentedAsyncQueuePool"
+    assert stats["size"] == 4
+    assert stats["checked_out"] == 0
+    assert stats["waiters"] == 0
+    assert stats["checkout_wait_seconds"]["count"] == 0
+
+
+def test_pool_telemetry_counts_waits():
+    """Test that checkout waits land in the histogram and waiters are released."""
+    telemetry = PoolTelemetry()
+    with telemetry.checkout(blocks=True):
+        assert telemetry.waiters == 1
+    with telemetry.checkout(blocks=False):
+        assert telemetry.waiters == 0
+    assert telemetry.waiters == 0
+    assert telemetry.checkout_wait.snapshot()["count"] == 2
+
+
+def test_only_checkouts_on_an_exhausted_pool_are_waiters():
+    """Test that a checkout which can open a new connection is not counted as waiting."""
+    pool = InstrumentedAsyncQueuePool(MagicMock(), pool_size=1, max_overflow=1)
+
+    assert not pool.exhausted()
+    first = pool.connect()
+    assert not pool.exhausted()  # May still overflow
+    second = pool.connect()
+    assert pool.exhausted()
+
+    def blocked_until_timeout():
+        seen.append(pool.telemetry.waiters)
+        raise PoolTimeoutError()
+
+    seen: list[int] = []
+    with (
+        patch.object(AsyncAdaptedQueuePool, "_do_get", side_effect=blocked_until_timeout),
+        pytest.raises(PoolTimeoutError),
+    ):
+        pool.connect()
+    assert seen == [1] and pool.telemetry.timeouts == 1
+
+    second.close()
+    assert not pool.exhausted()
+    first.close()
+
+    assert pool.telemetry.waiters == 0
+    assert pool.telemetry.checkout_wait.snapshot()["count"] == 3
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(3.65)
+
+
+def test_pool_stats_endpoint(client):
+    connector = MagicMock()
+    connector.pool_stats.return_value = {"pool_class": "InstrumentedAsyncQueuePool", "checked_out": 2}
+    app.dependency_overrides[get_db_connector] = lambda: connector
+
+    response = client.get("/api/v1/health/pool")
+
+    assert response.status_code == 200
+    assert response.json()["checked_out"] == 2
+
+
+def make_warming_session(fails: bool = False):
+    driver_connection = SimpleNamespace(prepare_threshold=5)
+    connection = MagicMock()
+    connection.get_raw_connection = AsyncMock(return_value=SimpleNamespace(driver_connection=driver_connection))
+    session = MagicMock()
+    session.connection = AsyncMock(side_effect=OSError("refused") if fails else None, return_value=connection)
+    session.close = AsyncMock()
+    return session, driver_connection
+
+
+@pytest.mark.asyncio
+async def test_warm_up_primes_one_connection_per_session():
+    """Test that warm-up holds N sessions at once, prepares on first use and tolerates failures."""
+    connector = make_connector(POOL_SIZE="3")
+    warming = [make_warming_session(), make_warming_session(), make_warming_session(fails=True)]
+    thresholds = []
+
+    async def primer(session):
+        thresholds.append(next(driver.prepare_threshold for s, driver in warming if s is session))
+
+    with patch.object(connector, "get_session", side_effect=[session for session, _ in warming]):
+        warmed = await warm_up(connector, 10, primers=[primer])
+
+    assert warmed == 2
+    assert thresholds == [0, 0]
+    assert all(driver.prepare_threshold == 5 for _, driver in warming)
+    assert all(session.close.await_count == 1 for session, _ in warming)
+
+
+@pytest.mark.asyncio
+async def test_warm_up_is_skipped_without_a_pool():
+    connector = make_connector(POOL_CLASS="null")
+    with patch.object(connector, "get_session") as get_session:
+        assert await warm_up(connector, 5) == 0
+    get_session.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_drain_waits_for_in_flight_connections_then_disposes():
+    """Test that draining refuses new sessions, waits for checkins and disposes."""
+    connector = make_connector()
+    connector._checked_out = 1
+
+    async def finish_request():
+        await asyncio.sleep(0.1)
+        connector._checked_out -= 1
+
+    with patch.object(connector, "dispose", new=AsyncMock()) as dispose:
+        drain = asyncio.create_task(connector.drain(timeout=5))
+        request = asyncio.create_task(finish_request())
+        await asyncio.sleep(0)
+        with pytest.raises(DatabaseDrainingError):
+            connector.get_session()
+        assert not dispose.await_count
+
+        assert await drain is True
+        await request
+        dispose.assert_awaited_once()
+    assert not connector._draining
+
+
+@pytest.mark.asyncio
+async def test_drain_gives_up_at_deadline():
+    connector = make_connector()
+    connector._checked_out = 2
+
+    with patch.object(connector, "dispose", new=AsyncMock()) as dispose:
+        assert await connector.drain(timeout=0.05) is False
+    dispose.assert_awaited_once()
+
+
+def test_draining_requests_get_503(client):
+    async def draining_db():
+        raise DatabaseDrainingError("Database connector is draining for shutdown")
+        yield
+
+    app.dependency_overrides[get_db] = draining_db
+
+    response = client.post("/api/v1/users/", json={"email": "a@example.com", "password": "secret-password"})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
@@ -0,0 +1,124 @@
+import io
+import json
+import logging
+import queue
+import sys
+import threading
+from unittest.mock import patch
+
+from app.dependencies import get_logger
+from app.infrastructure.logging import CustomLogger, JsonFormatter, queue_stats
+from app.infrastructure.logging.handlers import BoundedQueueHandler
+from app.main import app
+
+
+def make_record(msg="hello %s", args=("world",), **extra) -> logging.LogRecord:
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_emits_one_compact_object():
+    record = make_record(request_id="abc")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record.exc_info = sys.exc_info()
+
+    line = JsonFormatter().format(record)
+
+    entry = json.loads(line)
+    assert line == json.dumps(entry, separators=(",", ":"))
+    assert entry["level"] == "INFO" and entry["logger"] == "test" and entry["msg"] == "hello world"
+    assert entry["request_id"] == "abc"
+    assert "ValueError: boom" in entry["exc"]
+
+
+def test_queue_handler_renders_message_before_handoff():
+    log_queue: queue.Queue = queue.Queue(10)
+    handler = BoundedQueueHandler(log_queue)
+    args = ["before"]
+
+    handler.handle(make_record("value=%s", (args,)))
+    args[0] = "after"
+
+    queued = log_queue.get_nowait()
+    assert queued.getMessage() == "value=['before']" and queued.args is None
+
+
+def test_overflow_policies():
+    def fill(policy):
+        log_queue: queue.Queue = queue.Queue(2)
+        handler = BoundedQueueHandler(log_queue, overflow=policy, block_timeout=0.01)
+        for i in range(4):
+            handler.handle(make_record(str(i), ()))
+        return [log_queue.get_nowait().msg for _ in range(log_queue.qsize())], handler.stats()
+
+    kept, stats = fill("drop_new")
+    assert kept == ["0", "1"] and stats["dropped"] == 2
+
+    kept, stats = fill("drop_oldest")
+    assert kept == ["2", "3"] and stats["dropped"] == 2
+
+    kept, stats = fill("block")
+    assert kept == ["0", "1"] and stats == {"queued": 0, "capacity": 2, "overflow": "block", "dropped": 2}
+
+
+def test_queued_logger_writes_on_background_thread():
+    stream = io.StringIO()
+    writers = []
+
+    class RecordingStream(io.StringIO):
+        def write(self, text):
+            writers.append(threading.current_thread())
+            return stream.write(text)
+
+    with patch("sys.stderr", RecordingStream()):
+        custom = CustomLogger("test.queued", "INFO", log_format="json", queue_size=100)
+        custom.info("queued message")
+        custom._stop_listener()  # Flushes the queue
+
+    assert json.loads(stream.getvalue())["msg"] == "queued message"
+    assert writers and all(thread is not threading.main_thread() for thread in writers)
+
+
+def test_text_output_is_plain_when_not_a_tty():
+    stream = io.StringIO()
+    with patch("sys.stderr", stream):
+        custom = CustomLogger("test.plain", "INFO")
+        custom.info("plain")
+
+    assert stream.getvalue().endswith(" - test.plain - INFO - [-] plain\n")
+    assert "\x1b[" not in stream.getvalue()
+
+
+def test_lazy_logger_writes_the_first_record_once(tmp_path):
+    log_file = tmp_path / "app.log"
+    with patch("sys.stderr", io.StringIO()):
+        custom = CustomLogger("test.lazy", "INFO", file_path=log_file, lazy=True)
+        assert not log_file.exists()  # Opened by the first record
+
+        custom.info("first")
+        custom.info("second")
+
+    assert [line.rsplit(" ", 1)[-1] for line in log_file.read_text().splitlines()] == ["first", "second"]
+
+
+def test_lazy_queued_logger_reports_stats_before_the_first_record():
+    with patch("sys.stderr", io.StringIO()):
+        custom = CustomLogger("test.lazy_queued", "INFO", lazy=True, queue_size=10)
+        try:
+            assert queue_stats(custom._logger) == {"queued": 0, "capacity": 10, "overflow": "drop_new", "dropped": 0}
+        finally:
+            custom._stop_listener()
+
+
+def test_logging_health_endpoint(client):
+    custom = CustomLogger("test.health", "INFO", queue_size=5)
+    app.dependency_overrides[get_logger] = lambda: custom._logger
+    try:
+        response = client.get("/api/v1/health/logging")
+    finally:
+        custom._stop_listener()
+
+    assert response.json() == {"enabled": True, "queued": 0, "capacity": 5, "overflow": "drop_new", "dropped": 0}
@@ -0,0 +1,109 @@
+import logging
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.infrastructure.config import Settings
+from app.infrastructure.database.connector import DatabaseConnector
+from app.infrastructure.database.repositories.base_repository_impl import REPOSITORY_CALLS, BaseRepositoryImpl
+from app.infrastructure.metrics import MetricFamily, MetricsRegistry, MultiprocessCollector, render
+
+
+def sample_value(text: str, series: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(series + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{series} not in output")
+
+
+def test_render_uses_prometheus_text_format():
+    registry = MetricsRegistry()
+    registry.counter("jobs_total", "Jobs\nrun.", labels=("queue",)).inc('a"b\\c')
+    registry.histogram("job_seconds", "Job time.", buckets=(0.1, 1.0)).observe(0.5)
+
+    text = render(registry.collect())
+
+    assert "# HELP jobs_total Jobs\\nrun.\n# TYPE jobs_total counter\n" in text
+    assert 'jobs_total{queue="a\\"b\\\\c"} 1.0\n' in text
+    assert 'job_seconds_bucket{le="0.1"} 0\njob_seconds_bucket{le="1.0"} 1\njob_seconds_bucket{le="+Inf"} 1\n' in text
+    assert "job_seconds_sum 0.5\njob_seconds_count 1\n" in text
+
+
+def test_registering_a_metric_again_returns_it_unless_it_conflicts():
+    registry = MetricsRegistry()
+    counter = registry.counter("calls_total", "Calls.", labels=("method",))
+
+    assert registry.counter("calls_total", "Calls.", labels=("method",)) is counter
+    with pytest.raises(ValueError):
+        registry.histogram("calls_total", "Calls.", labels=("method",))
+
+
+def test_metrics_endpoint_reports_routes_by_template(client, mock_user_repo):
+    mock_user_repo.get_user_by_id.return_value = None
+    client.get("/api/v1/users/1")
+    client.get("/api/v1/users/2")
+
+    response = client.get("/metrics")
+
+    assert response.headers["content-type"] == "text/plain; version=0.0.4; charset=utf-8"
+    route = 'method="GET",route="/api/v1/users/{user_id}"'
+    assert sample_value(response.text, f'http_requests_total{{{route},status="404"}}') >= 2
+    assert sample_value(response.text, f"http_request_duration_seconds_count{{{route}}}") >= 2
+    assert "# TYPE password_hash_duration_seconds histogram" in response.text
+
+
+@pytest.mark.asyncio
+async def test_repository_calls_are_timed_once_under_the_concrete_class():
+    class ThingRepository(BaseRepositoryImpl[object]):
+        async def touch(self, db):
+            return "touched"
+
+    class SpecialThingRepository(ThingRepository):
+        pass
+
+    repository = SpecialThingRepository(object, logging.getLogger("test"), MagicMock())
+    db = MagicMock()
+    db.get = AsyncMock(side_effect=RuntimeError("down"))
+
+    assert await repository.touch(db) == "touched"
+    with pytest.raises(RuntimeError):
+        await repository.read(db, 1)
+
+    assert REPOSITORY_CALLS.labels("SpecialThingRepository", "touch").snapshot()["count"] == 1
+    assert REPOSITORY_CALLS.labels("SpecialThingRepository", "read").snapshot()["count"] == 1
+    assert REPOSITORY_CALLS.labels("ThingRepository", "touch").snapshot()["count"] == 0
+
+
+def test_connector_reports_pool_gauges_for_created_engines():
+    connector = DatabaseConnector(Settings.load_configs(), logging.getLogger("test"))
+    assert {family.name: family.samples for family in connector.collect_metrics()}["db_pool_size"] == {}
+
+    connector.create_engine()
+    families = {family.name: family for family in connector.collect_metrics()}
+
+    assert families["db_pool_size"].samples == {("primary",): connector.settings.DATABASE.POOL_SIZE}
+    assert families["db_pool_checked_out"].samples == {("primary",): 0}
+    assert families["db_pool_checkout_wait_seconds"].kind == "histogram"
+    assert families["db_connections_in_flight"].samples == {(): 0}
+
+
+def test_multiprocess_collector_merges_workers(tmp_path):
+    def worker(requests: int, connections: int) -> MetricsRegistry:
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests.").inc(amount=requests)
+        registry.histogram("latency_seconds", "Latency.", buckets=(1.0,)).observe(0.5)
+        registry.add_collector(lambda: [MetricFamily("connections", "gauge", "Open.", samples={(): connections})])
+        return registry
+
+    with patch("app.infrastructure.metrics.multiprocess.os.getpid", return_value=4242):
+        MultiprocessCollector(worker(requests=5, connections=7), tmp_path).flush()
+    collector = MultiprocessCollector(worker(requests=3, connections=2), tmp_path, is_alive=lambda pid: pid != 4242)
+
+    families = {family.name: family for family in collector.collect()}
+
+    # The exited worker's counts are kept, its gauge is not
+    assert families["requests_total"].samples == {(): 8.0}
+    assert families["latency_seconds"].samples[()]["buckets"] == {"1.0": 2, "+Inf": 2}
+    assert families["connections"].samples == {(): 2}
+    assert {path.name for path in tmp_path.iterdir()} == {"metrics-4242.json", f"metrics-{os.getpid()}.json"}
@@ -0,0 +1,168 @@
+import io
+import logging
+import re
+from contextlib import redirect_stdout
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from alembic import command
+from alembic.script import ScriptDirectory
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.schema import CreateColumn, CreateIndex
+
+from app.infrastructure.config import get_settings
+from app.infrastructure.database import connector as connector_module
+from app.infrastructure.database.connector import DatabaseConnector, SchemaVersionError
+from app.infrastructure.database.migrations import BASELINE_REVISION, alembic_config, head_revisions
+from app.infrastructure.database.models import Base
+from app.infrastructure.security import email_blind_index
+from app.main import app
+
+# conftest stubs the version check so app startup never connects; keep the real one here.
+verify_schema_version = DatabaseConnector.verify_schema_version
+
+HEAD = "9b2e4d7c1a05"
+
+
+def normalize(sql: str) -> str:
+    return re.sub(r"\s+", " ", sql).replace("( ", "(").replace(" )", ")").strip()
+
+
+def make_connector(versions=None, error=None) -> DatabaseConnector:
+    conn = MagicMock()
+    conn.execute = AsyncMock(side_effect=error, return_value=MagicMock(scalars=MagicMock(return_value=versions or [])))
+    engine = MagicMock(dialect=postgresql.dialect())
+    engine.connect.return_value.__aenter__ = AsyncMock(return_value=conn)
+    engine.connect.return_value.__aexit__ = AsyncMock(return_value=None)
+    connector = DatabaseConnector(get_settings(), logging.getLogger("test"))
+    connector._engine = engine
+    return connector
+
+
+def test_single_head_revision():
+    assert head_revisions() == {HEAD}
+
+
+def upgrade_sql(revisions: str) -> str:
+    output = io.StringIO()
+    with redirect_stdout(output):
+        command.upgrade(alembic_config(), revisions, sql=True)
+    return normalize(output.getvalue())
+
+
+def test_migrations_create_what_the_models_declare():
+    """Test that upgrading from scratch builds every column and index Base.metadata declares."""
+    migration_sql = upgrade_sql("head")
+
+    dialect = postgresql.dialect()
+    for table in Base.metadata.sorted_tables:
+        name = table.fullname
+        created = re.search(rf"CREATE (?:UNLOGGED )?TABLE {re.escape(name)} \((.*?)\);", migration_sql)
+        assert created is not None, name
+        for column in table.columns:
+            ddl = normalize(str(CreateColumn(column).compile(dialect=dialect)))
+            assert f"{ddl}," in created.group(1) + "," or f"ALTER TABLE {name} ADD COLUMN {ddl};" in migration_sql
+        for index in table.indexes:
+            assert normalize(str(CreateIndex(index).compile(dialect=dialect))) in migration_sql
+    model_indexes = {index.name for table in Base.metadata.tables.values() for index in table.indexes}
+    dropped = set(re.findall(r"DROP INDEX \w+\.(\w+);", migration_sql))
+    assert dropped and not dropped & model_indexes
+    assert f"alembic_version SET version_num='{HEAD}'" in migration_sql
+
+
+def test_baseline_database_upgrades_in_place():
+    """Test that a database stamped at the baseline gets the blind index and import tables, not a new users table."""
+    schema = get_settings().DATABASE.DB_SCHEMA
+    migration_sql = upgrade_sql(f"{BASELINE_REVISION}:head")
+
+    assert f"CREATE TABLE {schema}.users" not in migration_sql
+    assert f"ALTER TABLE {schema}.users ADD COLUMN email_hash VARCHAR(64);" in migration_sql
+    assert f"DROP INDEX {schema}.ix_{schema}_users_email;" in migration_sql
+    assert f"CREATE UNIQUE INDEX ix_{schema}_users_email_hash ON {schema}.users (email_hash);" in migration_sql
+    assert f"CREATE TABLE {schema}.user_imports" in migration_sql
+    assert (
+        f"UPDATE {schema}.alembic_version SET version_num='{HEAD}' "
+        f"WHERE {schema}.alembic_version.version_num = '{BASELINE_REVISION}'"
+    ) in migration_sql
+
+
+def test_migrate_stamps_tables_built_before_migrations():
+    connection = MagicMock()
+    with (
+        patch.object(connector_module, "_predates_migrations", side_effect=[True, False]),
+        patch("alembic.command.stamp") as stamp,
+        patch("alembic.command.upgrade") as upgrade,
+    ):
+        connector_module._upgrade(connection, "head")
+        assert stamp.call_args.args[1] == BASELINE_REVISION
+        connector_module._upgrade(connection, "head")
+
+    stamp.assert_called_once()
+    assert upgrade.call_count == 2
+    assert upgrade.call_args.args[0].attributes["connection"] is connection
+
+
+def test_blind_index_migration_backfills_in_batches():
+    migration = ScriptDirectory.from_config(alembic_config()).get_revision(HEAD).module
+    batches = [
+        [SimpleNamespace(id=1, email="A@example.com"), SimpleNamespace(id=2, email="b@example.com")],
+        [SimpleNamespace(id=3, email=" c@example.com")],
+        [],
+    ]
+    conn = MagicMock()
+    conn.execute.side_effect = lambda statement, parameters=None: MagicMock(
+        all=MagicMock(return_value=batches.pop(0) if parameters is None else [])
+    )
+
+    assert migration.backfill_email_hashes(conn, batch_size=2) == 3
+
+    updates = [call.args[1] for call in conn.execute.call_args_list if len(call.args) > 1]
+    assert updates == [
+        [
+            {"user_id": 1, "hash": email_blind_index("a@example.com")},
+            {"user_id": 2, "hash": email_blind_index("b@example.com")},
+        ],
+        [{"user_id": 3, "hash": email_blind_index("c@example.com")}],
+    ]
+    assert "LIMIT" in str(conn.execute.call_args_list[0].args[0].compile(dialect=postgresql.dialect()))
+
+
+def test_blind_index_migration_refuses_duplicate_emails():
+    migration = ScriptDirectory.from_config(alembic_config()).get_revision(HEAD).module
+    conn = MagicMock()
+    conn.scalar.return_value = 2
+
+    with pytest.raises(RuntimeError, match="2 emails are registered more than once"):
+        migration.check_unique_email_hashes(conn)
+
+
+@pytest.mark.asyncio
+async def test_schema_check_is_one_query():
+    connector = make_connector(versions=[HEAD])
+
+    await verify_schema_version(connector)
+
+    query = str(connector._engine.connect.return_value.__aenter__.return_value.execute.await_args.args[0])
+    assert query == f"SELECT version_num FROM {get_settings().DATABASE.DB_SCHEMA}.alembic_version"
+
+
+@pytest.mark.asyncio
+async def test_schema_check_rejects_other_revisions_and_unversioned_databases():
+    with pytest.raises(SchemaVersionError, match="expects"):
+        await verify_schema_version(make_connector(versions=["0000older"]))
+
+    missing = ProgrammingError("SELECT", {}, Exception('relation "alembic_version" does not exist'))
+    with pytest.raises(SchemaVersionError, match="not versioned"):
+        await verify_schema_version(make_connector(error=missing))
+
+
+def test_app_refuses_to_start_on_schema_mismatch():
+    with (
+        patch.object(DatabaseConnector, "verify_schema_version", new=AsyncMock(side_effect=SchemaVersionError("old"))),
+        pytest.raises(SchemaVersionError),
+        TestClient(app),
+    ):
+        pass
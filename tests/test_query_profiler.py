@@ -0,0 +1,145 @@
+import logging
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.adapters.api.middleware import QueryProfilerMiddleware
+from app.dependencies import get_read_db, get_user_repository
+from app.infrastructure.config import Settings, get_settings
+from app.infrastructure.database.connector import DatabaseConnector
+from app.infrastructure.database.models.user import User as UserModel
+from app.infrastructure.database.query_timer import QueryBudget, QueryTimer, normalize_sql, query_timer_var
+from app.infrastructure.database.repositories.user_repository import UserRepository
+
+USERS = UserModel.__table__.fullname
+
+
+def test_normalize_sql_hides_values_and_collapses_lists():
+    statement = """
+        SELECT users.id FROM users
+        WHERE users.email_hash IN (%(email_hash_1_1)s, %(email_hash_1_2)s, %(email_hash_1_3)s)
+          AND users.full_name = 'O''Brien' LIMIT 50
+    """
+
+    assert normalize_sql(statement) == (
+        "SELECT users.id FROM users WHERE users.email_hash IN (?, ...) AND users.full_name = ? LIMIT ?"
+    )
+
+
+def test_query_timer_keeps_the_slowest_statements():
+    timer = QueryTimer(keep_slowest=2)
+    for seconds, statement in [(0.001, "SELECT 1"), (0.030, "SELECT 2"), (0.002, "SELECT 3"), (0.020, "SELECT 4")]:
+        timer.record(seconds, statement)
+
+    assert timer.queries == 4 and timer.seconds == pytest.approx(0.053)
+    assert timer.slowest() == [(0.030, "SELECT ?"), (0.020, "SELECT ?")]
+
+
+def make_app(queries: int) -> FastAPI:
+    inner = FastAPI()
+
+    @inner.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        timer = query_timer_var.get()
+        assert timer is not None
+        for _ in range(queries):
+            timer.record(0.004, "SELECT * FROM items WHERE id = %(id)s")
+        return {"id": item_id}
+
+    inner.add_middleware(QueryProfilerMiddleware)
+    return inner
+
+
+def test_middleware_sends_server_timing():
+    with TestClient(make_app(queries=2)) as client:
+        response = client.get("/items/1")
+
+    db, app_timing = response.headers["server-timing"].split(", ")
+    assert db == 'db;dur=8.0;desc="2 queries"'
+    assert app_timing.startswith("app;dur=")
+
+
+def test_middleware_reports_requests_over_the_budget():
+    inner = make_app(queries=3)
+    inner.state.query_budget = QueryBudget(max_queries=2)
+
+    with TestClient(inner) as client:
+        client.get("/items/1")
+
+    [violation] = inner.state.query_budget.violations
+    assert violation.startswith("GET /items/{item_id} ran 3 queries (budget 2)")
+    assert "SELECT * FROM items WHERE id = ?" in violation
+
+
+class RecordingSession:
+    """
+    Stands in for an AsyncSession: every statement is compiled for PostgreSQL
+    and recorded in the request's QueryTimer, as the connector's cursor
+    hook would, and finds no rows.
+    """
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    async def execute(self, statement, *args, **kwargs):
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        self.statements.append(sql)
+        timer = query_timer_var.get()
+        if timer is not None:
+            timer.record(0.001, sql)
+        result = MagicMock()
+        result.first.return_value = None
+        result.all.return_value = []
+        return result
+
+    async def scalar(self, statement, *args, **kwargs):
+        await self.execute(statement)
+        return None
+
+
+@pytest.mark.query_budget(1)
+@pytest.mark.parametrize(
+    ("method", "path", "status"),
+    [
+        ("GET", "/api/v1/users/1", 404),
+        ("GET", "/api/v1/users/by-email/a@example.com", 404),
+        ("HEAD", "/api/v1/users/1", 404),
+        ("HEAD", "/api/v1/users/by-email/a@example.com", 404),
+        ("GET", "/api/v1/users?limit=2", 200),
+    ],
+)
+def test_user_reads_stay_within_one_query(client, method, path, status):
+    session = RecordingSession()
+
+    async def recording_db():
+        yield session
+
+    app = client.app
+    app.dependency_overrides[get_user_repository] = lambda: UserRepository(logging.getLogger("test"), get_settings())
+    app.dependency_overrides[get_read_db] = recording_db
+
+    assert client.request(method, path).status_code == status
+    assert len(session.statements) == 1 and USERS in session.statements[0]
+
+
+def test_connector_logs_slow_statements_without_parameters(caplog):
+    with patch.dict(os.environ, {"QUERY_PROFILER_SLOW_QUERY_MS": "100"}):
+        connector = DatabaseConnector(Settings.load_configs(), logging.getLogger("test.slow"))
+    dispatch = connector.create_engine().sync_engine.dispatch
+    statement = "SELECT users.id FROM users WHERE users.email_hash = %(email_hash)s"
+
+    with caplog.at_level(logging.WARNING, logger="test.slow"):
+        for took in (0.0, 0.5):
+            context = SimpleNamespace()
+            dispatch.before_cursor_execute(MagicMock(), MagicMock(), statement, {"email_hash": "x"}, context, False)
+            context.query_start -= took
+            dispatch.after_cursor_execute(MagicMock(), MagicMock(), statement, {"email_hash": "x"}, context, False)
+
+    [record] = caplog.records
+    assert record.database == "primary" and record.db_ms >= 500
+    assert record.sql == "SELECT users.id FROM users WHERE users.email_hash = ?"
@@ -0,0 +1,118 @@
+import configparser
+import logging
+import random
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import Response
+from sqlalchemy.exc import OperationalError
+
+from app.dependencies import STICKY_PRIMARY_COOKIE, container
+from app.infrastructure.config import DatabaseSettings, Settings
+from app.infrastructure.database.connector import DatabaseConnector
+from app.infrastructure.database.replicas import Replica, ReplicaRouter
+
+REPLICA_SECTIONS = """
+[POSTGRESQL_REPLICA]
+HOST=replica-1
+[POSTGRESQL_REPLICA_2]
+HOST=replica-2
+POOL_SIZE=9
+"""
+
+
+class ConfigWithReplicas(configparser.ConfigParser):
+    def read(self, filenames, encoding=None):
+        result = super().read(filenames, encoding)
+        if not self.has_section("POSTGRESQL_REPLICA"):
+            self.read_string(REPLICA_SECTIONS)
+        return result
+
+
+def make_replica(name: str, latency: float | None = None, session=None) -> Replica:
+    return Replica(
+        name=name,
+        engine=MagicMock(),
+        session_factory=MagicMock(return_value=session or MagicMock()),
+        latency=latency,
+    )
+
+
+def make_session(fails: bool = False):
+    session = MagicMock(info={})
+    session.connection = AsyncMock(side_effect=OperationalError("SELECT 1", {}, Exception("down")) if fails else None)
+    session.close = AsyncMock()
+    return session
+
+
+def test_replica_sections_inherit_primary_settings():
+    with patch("configparser.ConfigParser", ConfigWithReplicas):
+        settings = Settings.load_configs()
+
+    assert [replica.HOST for replica in settings.DATABASE_REPLICAS] == ["replica-1", "replica-2"]
+    assert settings.DATABASE_REPLICAS[0].DB_NAME == settings.DATABASE.DB_NAME
+    assert settings.DATABASE_REPLICAS[1].POOL_SIZE == 9
+
+
+def test_router_prefers_faster_replica_and_skips_unhealthy():
+    fast, slow = make_replica("fast", latency=0.001), make_replica("slow", latency=0.050)
+    router = ReplicaRouter([fast, slow], logging.getLogger("test"), rng=random.Random(0))
+
+    assert router.candidates() == [fast, slow]
+
+    router.mark_failure(fast, RuntimeError("down"))
+    assert router.candidates() == [slow]
+
+    router.mark_success(fast, 0.002)
+    assert fast.healthy and fast.latency == pytest.approx(0.3 * 0.002 + 0.7 * 0.001)
+
+
+@pytest.mark.asyncio
+async def test_readonly_session_falls_back_to_next_replica_then_primary():
+    connector = DatabaseConnector(Settings.load_configs(), logging.getLogger("test"))
+    down = make_replica("down", latency=0.001, session=make_session(fails=True))
+    up_session = make_session()
+    up = make_replica("up", latency=0.010, session=up_session)
+    connector._replica_router = ReplicaRouter([down, up], logging.getLogger("test"), rng=random.Random(0))
+
+    session = await connector.open_session(readonly=True)
+
+    assert session is up_session and session.info["replica"] == "up"
+    assert not down.healthy
+
+    up.healthy = False
+    with patch.object(connector, "get_session", return_value="primary") as primary:
+        assert await connector.open_session(readonly=True) == "primary"
+        primary.assert_called_once()
+
+
+def test_writes_pin_reads_to_primary():
+    with_replica = container.settings.model_copy(update={"DATABASE_REPLICAS": [DatabaseSettings(HOST="replica-1")]})
+    with patch.object(container, "settings", with_replica):
+        response = Response()
+        container.mark_primary_sticky(response)
+
+    cookie = response.headers["set-cookie"]
+    assert cookie.startswith(f"{STICKY_PRIMARY_COOKIE}=")
+    until = cookie.split(";")[0].split("=")[1]
+
+    assert container.reads_from_primary(SimpleNamespace(cookies={STICKY_PRIMARY_COOKIE: until}))
+    assert not container.reads_from_primary(SimpleNamespace(cookies={STICKY_PRIMARY_COOKIE: "0"}))
+    assert not container.reads_from_primary(SimpleNamespace(cookies={}))
+
+
+def test_no_sticky_cookie_without_replicas():
+    without_replicas = container.settings.model_copy(update={"DATABASE_REPLICAS": []})
+    with patch.object(container, "settings", without_replicas):
+        response = Response()
+        container.mark_primary_sticky(response)
+
+    assert "set-cookie" not in response.headers
+
+
+def test_replica_health_endpoint(client):
+    response = client.get("/api/v1/health/replicas")
+
+    assert response.status_code == 200
+    assert response.json() == {"replicas": []}
@@ -0,0 +1,143 @@
+import asyncio
+import threading
+from unittest.mock import AsyncMock
+
+import pytest
+from argon2 import PasswordHasher
+
+from app.infrastructure.config import update_env_file
+from app.infrastructure.security import (
+    PasswordHashingBusyError,
+    PasswordHashingPool,
+    calibrate_argon2,
+    email_blind_index,
+    hash_password,
+    hash_password_async,
+    password_needs_rehash,
+    verify_password,
+    verify_password_async,
+)
+
+
+def test_email_blind_index_is_deterministic():
+    """Test that the same email always maps to the same digest."""
+    assert email_blind_index("user@example.com") == email_blind_index("user@example.com")
+    assert len(email_blind_index("user@example.com")) == 64
+
+
+def test_email_blind_index_normalizes_case_and_whitespace():
+    """Test that lookups are insensitive to case and surrounding whitespace."""
+    assert email_blind_index("  User@Example.COM ") == email_blind_index("user@example.com")
+    assert email_blind_index("user@example.com") != email_blind_index("other@example.com")
+
+
+def test_hash_and_verify_password():
+    """Test the argon2 round trip."""
+    hashed = hash_password("secret")
+    assert verify_password("secret", hashed) is True
+    assert verify_password("wrong", hashed) is False
+
+
+@pytest.mark.asyncio
+async def test_hash_password_async_round_trip():
+    """Test that the pooled variants agree with the synchronous ones."""
+    hashed = await hash_password_async("secret")
+    assert await verify_password_async("secret", hashed) is True
+    assert await verify_password_async("wrong", hashed) is False
+    assert verify_password("secret", hashed) is True
+
+
+@pytest.mark.asyncio
+async def test_hashing_pool_rejects_when_queue_is_full():
+    """Test that calls beyond the queue bound fail fast."""
+    pool = PasswordHashingPool(workers=1, queue_size=1, timeout=5)
+    release = threading.Event()
+    try:
+        first = asyncio.create_task(pool.run("hash", release.wait))
+        await asyncio.sleep(0)
+        assert pool.queue_depth == 1
+
+        with pytest.raises(PasswordHashingBusyError):
+            await pool.run("hash", hash_password, "secret")
+        assert pool.rejected == 1
+
+        release.set()
+        await first
+        assert pool.queue_depth == 0
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hashing_pool_times_out_slow_calls():
+    """Test that callers stop waiting after the per-call timeout."""
+    pool = PasswordHashingPool(workers=1, queue_size=4, timeout=0.01)
+    release = threading.Event()
+    try:
+        with pytest.raises(PasswordHashingBusyError):
+            await pool.run("verify", release.wait)
+        stats = pool.stats()
+        assert stats["timeouts"] == 1
+        assert stats["latency_seconds"]["verify"]["count"] == 1
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_verify_password_async_upgrades_outdated_hash():
+    """Test that a valid login with outdated parameters triggers a background rehash."""
+    outdated = PasswordHasher(time_cost=1, memory_cost=8192, parallelism=1).hash("secret")
+    assert password_needs_rehash(outdated) is True
+
+    upgraded = asyncio.Queue()
+
+    assert await verify_password_async("secret", outdated, on_rehash=upgraded.put) is True
+    new_hash = await asyncio.wait_for(upgraded.get(), timeout=5)
+
+    assert verify_password("secret", new_hash) is True
+    assert password_needs_rehash(new_hash) is False
+
+
+@pytest.mark.asyncio
+async def test_verify_password_async_skips_rehash_for_current_or_wrong_password():
+    on_rehash = AsyncMock()
+    current = hash_password("secret")
+    outdated = PasswordHasher(time_cost=1, memory_cost=8192, parallelism=1).hash("secret")
+
+    assert await verify_password_async("secret", current, on_rehash=on_rehash) is True
+    assert await verify_password_async("wrong", outdated, on_rehash=on_rehash) is False
+    await asyncio.sleep(0.05)
+
+    on_rehash.assert_not_awaited()
+
+
+def test_calibrate_argon2_respects_budget():
+    """Test that calibration stays within the memory budget and reports its timing."""
+    params = calibrate_argon2(
+        target_ms=10_000,
+        max_memory_kib=1024,
+        min_memory_kib=256,
+        parallelism=1,
+        max_time_cost=2,
+        samples=1,
+    )
+    assert params.within_budget is True
+    assert params.memory_cost == 1024
+    assert params.time_cost == 2
+
+
+def test_calibrate_argon2_flags_unreachable_target():
+    params = calibrate_argon2(target_ms=0, max_memory_kib=1024, min_memory_kib=512, parallelism=1, samples=1)
+    assert params.within_budget is False
+    assert (params.time_cost, params.memory_cost) == (1, 512)
+
+
+def test_update_env_file_replaces_and_appends(tmp_path):
+    env_file = tmp_path / ".env"
+    env_file.write_text("# comment\nSECRET_KEY=abc\nARGON2_TIME_COST=3\n")
+
+    update_env_file(env_file, {"ARGON2_TIME_COST": 4, "ARGON2_MEMORY_COST": 32768})
+
+    assert env_file.read_text() == "# comment\nSECRET_KEY=abc\nARGON2_TIME_COST=4\nARGON2_MEMORY_COST=32768\n"
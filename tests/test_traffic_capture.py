@@ -0,0 +1,109 @@
+import json
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, EmailStr
+
+from app.adapters.api.middleware import TrafficCaptureMiddleware
+from app.infrastructure.config import TrafficCaptureSettings
+from app.infrastructure.traffic_capture import CaptureWriter, Tokenizer, read_capture
+
+
+def test_tokens_are_deterministic_per_key_and_still_valid_emails():
+    tokenizer = Tokenizer("key")
+
+    token = tokenizer.email("Ada@Example.com")
+
+    assert token == tokenizer.email("ada@example.com ") != Tokenizer("other key").email("ada@example.com")
+
+    class Model(BaseModel):
+        email: EmailStr
+
+    assert Model(email=token).email == token
+
+
+def test_json_bodies_lose_emails_and_passwords():
+    tokenizer = Tokenizer("key")
+    body = [{"email": "ada@example.com", "full_name": "Ada <ada@example.com>", "password": "s3cret", "age": 36}]
+
+    [sanitized] = tokenizer.json(body)
+
+    assert sanitized == {
+        "email": tokenizer.email("ada@example.com"),
+        "full_name": tokenizer.name("Ada <ada@example.com>"),
+        "password": tokenizer.password("s3cret"),
+        "age": 36,
+    }
+    assert tokenizer.query("email=ada%40example.com&limit=5") == (
+        f"email={tokenizer.email('ada@example.com').replace('@', '%40')}&limit=5"
+    )
+
+
+def make_app(writer: CaptureWriter, **options) -> FastAPI:
+    inner = FastAPI()
+
+    @inner.post("/users")
+    async def create(request: Request):
+        await request.body()
+        return {"id": 1}
+
+    @inner.get("/users/by-email/{email}")
+    async def by_email(email: str):
+        return {"email": email}
+
+    @inner.get("/stream")
+    async def stream():
+        return {}
+
+    inner.add_middleware(TrafficCaptureMiddleware, writer=writer, **options)
+    return inner
+
+
+def test_middleware_records_sanitized_requests(tmp_path):
+    writer = CaptureWriter(tmp_path, Tokenizer("key"))
+    tokenizer = Tokenizer("key")
+
+    with TestClient(make_app(writer, max_body_bytes=200, exclude_paths=["/stream"])) as client:
+        client.post("/users", json={"email": "ada@example.com", "password": "s3cret", "full_name": "Ada Lovelace"})
+        client.get("/users/by-email/ada@example.com", params={"verbose": "1"})
+        client.post("/users", json={"email": "x" * 300})
+        client.post("/users", files={"file": ("users.csv", b"email\nada@example.com\n")})
+        client.get("/stream")
+    writer.close()
+
+    captured = writer.path.read_text()
+    assert "ada@example.com" not in captured and "s3cret" not in captured and "Lovelace" not in captured
+    created, lookup, too_large, upload = read_capture([tmp_path])
+    assert created["method"] == "POST" and created["route"] == "/users" and created["status"] == 200
+    assert created["body"] == {
+        "email": tokenizer.email("ada@example.com"),
+        "password": tokenizer.password("s3cret"),
+        "full_name": tokenizer.name("Ada Lovelace"),
+    }
+    assert lookup["route"] == "/users/by-email/{email}" and lookup["query"] == "verbose=1"
+    assert lookup["path"] == f"/users/by-email/{tokenizer.email('ada@example.com')}"
+    assert too_large["omitted"] == "body over 200 bytes" and "body" not in too_large
+    assert upload["omitted"] == "content-type multipart/form-data"
+    assert writer.stats()["written"] == 4
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    writer = CaptureWriter(tmp_path, Tokenizer("key"), queue_size=1)
+    writer._start = lambda: None  # No consumer: the queue stays full
+
+    with TestClient(make_app(writer)) as client:
+        for _ in range(3):
+            assert client.get("/users/by-email/a@b.co").status_code == 200
+
+    assert writer.dropped == 2
+
+
+def test_records_are_merged_across_worker_files_in_arrival_order(tmp_path):
+    (tmp_path / "capture-1-a.jsonl").write_text(json.dumps({"ts": 2.0}) + "\n" + json.dumps({"ts": 4.0}) + "\n")
+    (tmp_path / "capture-2-a.jsonl").write_text(json.dumps({"ts": 3.0}) + "\n")
+
+    assert [record["ts"] for record in read_capture([tmp_path])] == [2.0, 3.0, 4.0]
+
+
+def test_streams_and_scrapes_are_excluded_by_default():
+    assert set(TrafficCaptureSettings().EXCLUDE_PATHS) == {"/metrics", "/api/v1/users/changes"}
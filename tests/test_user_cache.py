@@ -0,0 +1,233 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.application.dto.user import UserRead
+from app.dependencies import container, get_user_cache
+from app.domain.entities.user import UserEntity
+from app.infrastructure.cache import MISSING, CachedUserRepository, InMemoryCache
+from app.infrastructure.config import Settings
+from app.infrastructure.database.repositories.user_repository import UserRepository
+from app.main import app
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_user(user_id: int = 1, email: str = "a@example.com") -> UserEntity:
+    return UserEntity(id=user_id, email=email, full_name="A", hashed_password="h")
+
+
+@pytest.fixture
+def inner():
+    repo = MagicMock(spec=UserRepository)
+    repo.get_user_by_id = AsyncMock(return_value=make_user())
+    repo.get_user_by_email = AsyncMock(return_value=make_user())
+    repo.update_user = AsyncMock()
+    repo.delete_user = AsyncMock(return_value=True)
+    repo.create_users = AsyncMock(return_value=[])
+    return repo
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cached(inner, clock):
+    return CachedUserRepository(inner, InMemoryCache(max_size=100, clock=clock), ttl=60, negative_ttl=5)
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_least_recently_used():
+    cache = InMemoryCache(max_size=2)
+    await cache.set("a", 1, ttl=60)
+    await cache.set("b", 2, ttl=60)
+    assert await cache.get("a") == 1
+    await cache.set("c", 3, ttl=60)
+
+    assert await cache.get("b") is MISSING
+    assert await cache.get("a") == 1
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (2, 1, 1, 2)
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl(clock):
+    cache = InMemoryCache(max_size=10, clock=clock)
+    await cache.set("a", None, ttl=5)
+    assert await cache.get("a") is None
+    clock.now = 5
+    assert await cache.get("a") is MISSING
+    assert cache.stats().expirations == 1
+
+
+@pytest.mark.asyncio
+async def test_get_user_by_id_reads_through_once(cached, inner):
+    db = MagicMock(info={})
+    first = await cached.get_user_by_id(db, 1)
+    second = await cached.get_user_by_id(db, 1)
+
+    assert first == second == make_user()
+    inner.get_user_by_id.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_views_of_one_user_come_from_the_cache_and_lists_from_projections(cached, inner):
+    db = MagicMock(info={})
+    inner.list_user_views = AsyncMock(return_value=[])
+
+    await cached.get_user_by_id(db, 1)
+    view = await cached.get_user_view(db, 1, UserRead)
+    await cached.list_user_views(db, UserRead, limit=10)
+
+    assert view == UserRead(id=1, email="a@example.com", full_name="A", is_active=True, is_superuser=False)
+    inner.get_user_by_id.assert_awaited_once()
+    inner.list_user_views.assert_awaited_once_with(db, UserRead, limit=10, after_id=None, validate=False)
+
+
+@pytest.mark.asyncio
+async def test_misses_are_cached_for_negative_ttl(cached, inner, clock):
+    inner.get_user_by_email.return_value = None
+    db = MagicMock(info={})
+
+    assert await cached.get_user_by_email(db, "missing@example.com") is None
+    assert await cached.get_user_by_email(db, "MISSING@example.com") is None
+    assert inner.get_user_by_email.await_count == 1
+
+    clock.now = 5
+    await cached.get_user_by_email(db, "missing@example.com")
+    assert inner.get_user_by_email.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_email_lookup_is_served_from_cache_after_id_lookup(cached, inner):
+    db = MagicMock(info={})
+    await cached.get_user_by_id(db, 1)
+    assert await cached.get_user_by_email(db, "a@example.com") == make_user()
+    inner.get_user_by_email.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_refreshes_entry_and_old_email_is_not_served(cached, inner):
+    db = MagicMock(info={})
+    await cached.get_user_by_email(db, "a@example.com")
+    inner.update_user.return_value = make_user(email="b@example.com")
+    inner.get_user_by_email.return_value = None
+
+    await cached.update_user(db, 1, {"email": "b@example.com"})
+
+    assert (await cached.get_user_by_id(db, 1)).email == "b@example.com"
+    assert await cached.get_user_by_email(db, "a@example.com") is None
+    inner.get_user_by_email.assert_awaited_with(db, "a@example.com")
+    inner.get_user_by_id.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_delete_invalidates_cached_user(cached, inner):
+    db = MagicMock(info={})
+    await cached.get_user_by_id(db, 1)
+    assert await cached.delete_user(db, 1) is True
+
+    inner.get_user_by_id.return_value = None
+    assert await cached.get_user_by_id(db, 1) is None
+    assert inner.get_user_by_id.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_create_users_drops_negative_email_entries(cached, inner):
+    inner.get_user_by_email.return_value = None
+    db = MagicMock(info={})
+    await cached.get_user_by_email(db, "a@example.com")
+
+    await cached.create_users(db, [make_user(user_id=None)])
+    inner.get_user_by_email.return_value = make_user()
+
+    assert await cached.get_user_by_email(db, "a@example.com") == make_user()
+
+
+@pytest.mark.asyncio
+async def test_replica_reads_are_cached_briefly(cached, inner, clock):
+    replica_db = MagicMock(info={"replica": "replica-1:5432"})
+    await cached.get_user_by_id(replica_db, 1)
+    await cached.get_user_by_id(replica_db, 1)
+    assert inner.get_user_by_id.await_count == 1
+
+    clock.now = 5
+    await cached.get_user_by_id(replica_db, 1)
+    assert inner.get_user_by_id.await_count == 2
+
+
+def test_cache_stats_endpoint(client):
+    cache = InMemoryCache(max_size=10)
+    app.dependency_overrides[get_user_cache] = lambda: cache
+
+    response = client.get("/api/v1/health/cache")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "enabled": True,
+        "hits": 0,
+        "misses": 0,
+        "evictions": 0,
+        "expirations": 0,
+        "invalidations": 0,
+        "size": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_existence_checks_answer_from_cached_entries(cached, inner):
+    db = MagicMock(info={})
+    inner.user_exists = AsyncMock(return_value=False)
+    inner.email_exists = AsyncMock(return_value=True)
+    inner.get_user_by_email.return_value = None
+
+    await cached.get_user_by_id(db, 1)
+    await cached.get_user_by_email(db, "missing@example.com")
+
+    assert await cached.user_exists(db, 1) is True
+    assert await cached.email_exists(db, "missing@example.com") is False
+    inner.user_exists.assert_not_called()
+    inner.email_exists.assert_not_called()
+    assert await cached.user_exists(db, 2) is False
+    assert await cached.email_exists(db, "a@example.com") is True
+
+
+@pytest.mark.asyncio
+async def test_view_updates_drop_the_user_and_the_new_emails_miss(cached, inner):
+    db = MagicMock(info={})
+    inner.update_user_view = AsyncMock(return_value=None)
+    inner.get_user_by_email.return_value = None
+    await cached.get_user_by_id(db, 1)
+    await cached.get_user_by_email(db, "b@example.com")
+
+    await cached.update_user_view(db, 1, {"email": "b@example.com"}, UserRead)
+    inner.get_user_by_email.return_value = make_user(email="b@example.com")
+
+    await cached.get_user_by_id(db, 1)
+    assert inner.get_user_by_id.await_count == 2
+    assert await cached.get_user_by_email(db, "b@example.com") == make_user(email="b@example.com")
+
+
+def test_backend_comes_from_settings_and_unknown_ones_fail():
+    settings = Settings.load_configs()
+    cache_settings = settings.USER_CACHE
+    assert cache_settings is not None and cache_settings.BACKEND == "memory"
+
+    with patch.object(container, "settings", settings):
+        cache = container._build_user_cache()
+    assert isinstance(cache, InMemoryCache) and cache.max_size == cache_settings.MAX_SIZE
+
+    unknown = settings.model_copy(update={"USER_CACHE": cache_settings.model_copy(update={"BACKEND": "redis"})})
+    with (
+        patch.object(container, "settings", unknown),
+        pytest.raises(ValueError, match="Unknown USER_CACHE BACKEND 'redis'"),
+    ):
+        container._build_user_cache()
@@ -0,0 +1,148 @@
+import io
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.application.dto.user import UserImportReport
+from app.application.user_import import import_users, iter_lines, parse_records
+from app.dependencies import get_user_import_repository
+from app.main import app
+
+
+def reader(data: bytes):
+    stream = io.BytesIO(data)
+
+    async def read(size: int) -> bytes:
+        return stream.read(size)
+
+    return read
+
+
+async def collect(data: bytes, fmt):
+    return [item async for item in parse_records(iter_lines(reader(data)), fmt)]
+
+
+class FakeImportRepository:
+    """Records staged chunks and mimics the checkpoint counters of UserImportRepository."""
+
+    def __init__(self, rows_read: int = 0, status: str = "staging"):
+        self.job = SimpleNamespace(
+            import_id="job",
+            status=status,
+            rows_read=rows_read,
+            rows_staged=0,
+            rows_failed=0,
+            rows_merged=0,
+        )
+        self.staged: list = []
+
+    async def get_or_create_job(self, db, import_id, source):
+        return self.job
+
+    async def stage_chunk(self, db, job, rows, rows_read, rows_failed):
+        self.staged.extend(rows)
+        job.rows_read += rows_read
+        job.rows_staged += len(rows)
+        job.rows_failed += rows_failed
+
+    async def merge(self, db, job):
+        job.rows_merged = job.rows_staged
+        job.status = "done"
+
+
+async def fake_hash(passwords):
+    return [f"hashed:{password}" for password in passwords]
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_handles_lines_split_across_reads():
+    with patch("app.application.user_import.READ_SIZE", 3):
+        lines = [line async for line in iter_lines(reader(b"first\r\nsecond\nlast"))]
+    assert lines == [b"first", b"second", b"last"]
+
+
+@pytest.mark.asyncio
+async def test_parse_records_csv_uses_header_and_reports_bad_lines():
+    data = b"email,full_name,password\na@example.com,A,secret123\n\nbroken\n"
+    records = await collect(data, "csv")
+    assert records == [
+        (2, {"email": "a@example.com", "full_name": "A", "password": "secret123"}),
+        (4, "expected 3 fields, got 1"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_parse_records_ndjson_rejects_non_objects():
+    data = b'{"email": "a@example.com"}\n[1, 2]\nnot json\n'
+    records = await collect(data, "ndjson")
+    assert records[0] == (1, {"email": "a@example.com"})
+    assert records[1] == (2, "expected a JSON object")
+    assert records[2][0] == 3 and isinstance(records[2][1], str)
+
+
+@pytest.mark.asyncio
+async def test_import_users_validates_hashes_and_merges():
+    repository = FakeImportRepository()
+    data = b"email,full_name,password\na@example.com,A,secret123\nnot-an-email,B,secret123\n"
+    with patch("app.application.user_import.hash_passwords_async", side_effect=fake_hash):
+        report = await import_users(MagicMock(), repository, reader(data), "csv", "job", chunk_size=1)
+
+    assert repository.staged == [(2, "a@example.com", "A", "hashed:secret123")]
+    assert report.status == "done"
+    assert (report.rows_read, report.rows_staged, report.rows_failed, report.rows_merged) == (2, 1, 1, 1)
+    assert [error.line for error in report.errors] == [3]
+
+
+@pytest.mark.asyncio
+async def test_import_users_resumes_after_checkpoint():
+    repository = FakeImportRepository(rows_read=1)
+    data = b"email,full_name,password\na@example.com,A,secret123\nb@example.com,B,secret123\n"
+    with patch("app.application.user_import.hash_passwords_async", side_effect=fake_hash):
+        report = await import_users(MagicMock(), repository, reader(data), "csv", "job")
+
+    assert [row[1] for row in repository.staged] == ["b@example.com"]
+    assert report.rows_read == 2
+
+
+@pytest.mark.asyncio
+async def test_import_users_does_not_reapply_finished_import():
+    repository = FakeImportRepository(rows_read=1, status="done")
+    report = await import_users(MagicMock(), repository, reader(b"ignored\n"), "csv", "job")
+    assert repository.staged == []
+    assert report.status == "done"
+
+
+def test_import_route_returns_report(client):
+    app.dependency_overrides[get_user_import_repository] = lambda: MagicMock()
+    report = UserImportReport(
+        import_id="abc",
+        status="done",
+        rows_read=1,
+        rows_staged=1,
+        rows_failed=0,
+        rows_merged=1,
+        elapsed_seconds=0.1,
+        rows_per_second=10.0,
+    )
+    with patch("app.adapters.api.v1.routers.user.import_users", return_value=report) as run:
+        response = client.post(
+            "/api/v1/users/import?format=ndjson&import_id=abc",
+            files={"file": ("users.ndjson", b"{}\n", "application/x-ndjson")},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["rows_merged"] == 1
+    assert run.call_args.args[3:5] == ("ndjson", "abc")
+
+
+def test_import_route_failure_names_import_id(client):
+    app.dependency_overrides[get_user_import_repository] = lambda: MagicMock()
+    with patch("app.adapters.api.v1.routers.user.import_users", side_effect=RuntimeError("boom")):
+        response = client.post(
+            "/api/v1/users/import?import_id=abc",
+            files={"file": ("users.csv", b"", "text/csv")},
+        )
+
+    assert response.status_code == 400
+    assert "abc" in response.json()["detail"]
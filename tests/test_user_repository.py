@@ -0,0 +1,230 @@
+import logging
+from collections import namedtuple
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.application.dto.user import UserRead
+from app.domain.entities.user import UserEntity
+from app.infrastructure.config import get_settings
+from app.infrastructure.database.models.user import User as UserModel
+from app.infrastructure.database.repositories.user_repository import ENTITY_COLUMNS, UserRepository
+from app.infrastructure.security import email_blind_index
+
+# Schema-qualified table name, as rendered in SQL
+USERS = UserModel.__table__.fullname
+
+
+@pytest.fixture
+def repository():
+    return UserRepository(logger=logging.getLogger("test"), settings=get_settings())
+
+
+def test_to_model_sets_email_blind_index(repository):
+    """Test that models built from entities carry the email blind index."""
+    entity = UserEntity(email="a@example.com", full_name="A", hashed_password="h")
+    model = repository._to_model(entity)
+    assert model.email_hash == email_blind_index("a@example.com")
+
+
+@pytest.mark.asyncio
+async def test_get_user_by_email_probes_blind_index(repository):
+    """Test that email lookups filter on email_hash instead of decrypting rows."""
+    db = MagicMock()
+    result = MagicMock()
+    result.scalars.return_value.first.return_value = None
+    db.execute = AsyncMock(return_value=result)
+
+    assert await repository.get_user_by_email(db, "a@example.com") is None
+
+    stmt = db.execute.await_args.args[0]
+    where = str(stmt.whereclause)
+    assert "email_hash" in where
+    assert "pgp_sym_decrypt" not in where
+    assert stmt.compile().params["email_hash_1"] == email_blind_index("a@example.com")
+
+
+@pytest.mark.asyncio
+async def test_list_users_uses_keyset_instead_of_offset(repository):
+    """Test that pages seek on the primary key rather than skipping rows."""
+    db = MagicMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = []
+    db.execute = AsyncMock(return_value=result)
+
+    assert await repository.list_users(db, limit=51, after_id=100) == []
+
+    sql = str(db.execute.await_args.args[0].compile())
+    assert "WHERE" in sql and ".id >" in sql
+    assert "ORDER BY" in sql and "LIMIT" in sql
+    assert "OFFSET" not in sql
+
+
+@pytest.mark.asyncio
+async def test_create_users_issues_one_multi_row_insert(repository):
+    """Test that a batch becomes one encrypted INSERT ... ON CONFLICT ... RETURNING."""
+    users = [
+        UserEntity(email="a@example.com", full_name="A", hashed_password="h"),
+        UserEntity(email="b@example.com", full_name="B", hashed_password="h"),
+        UserEntity(email="A@example.com", full_name="A again", hashed_password="h"),
+    ]
+    db = MagicMock()
+    result = MagicMock()
+    result.all.return_value = [(7, email_blind_index("a@example.com")), (8, email_blind_index("b@example.com"))]
+    db.execute = AsyncMock(return_value=result)
+    db.commit = AsyncMock()
+
+    created = await repository.create_users(db, users)
+
+    assert [u.id if u else None for u in created] == [7, 8, None]
+    db.execute.assert_awaited_once()
+    sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.count("pgp_sym_encrypt(%(email_m") == 3
+    assert "ON CONFLICT (email_hash) DO NOTHING" in sql
+    assert "RETURNING" in sql
+
+
+@pytest.mark.asyncio
+async def test_update_user_is_one_update_returning_changed_columns(repository):
+    """Test that an update writes only the changed columns and returns the row in one statement."""
+    db = MagicMock()
+    result = MagicMock()
+    result.scalars.return_value.first.return_value = None
+    db.execute = AsyncMock(return_value=result)
+    db.commit = AsyncMock()
+
+    assert await repository.update_user(db, 5, {"email": "new@example.com"}) is None
+
+    db.execute.assert_awaited_once()
+    stmt = db.execute.await_args.args[0]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("UPDATE")
+    set_clause = sql.split(" SET ")[1].split(" WHERE ")[0]
+    assert "email=" in set_clause and "email_hash=" in set_clause
+    assert "full_name" not in set_clause and "hashed_password" not in set_clause
+    assert "RETURNING" in sql
+    assert email_blind_index("new@example.com") in stmt.compile().params.values()
+
+
+@pytest.mark.asyncio
+async def test_update_user_without_changes_only_reads(repository):
+    """Test that an empty update does not issue an UPDATE."""
+    db = MagicMock()
+    db.get = AsyncMock(return_value=None)
+    db.execute = AsyncMock()
+
+    assert await repository.update_user(db, 5, {}) is None
+    db.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_delete_user_is_one_delete_returning(repository):
+    """Test that delete reports a missing row from DELETE ... RETURNING without reading first."""
+    db = MagicMock()
+    result = MagicMock()
+    result.first.return_value = None
+    db.execute = AsyncMock(return_value=result)
+    db.commit = AsyncMock()
+    db.get = AsyncMock()
+
+    assert await repository.delete_user(db, 5) is False
+
+    db.get.assert_not_called()
+    sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("DELETE") and "RETURNING" in sql
+
+
+@pytest.mark.asyncio
+async def test_user_view_selects_only_the_view_columns(repository):
+    """Test that view reads fetch plain rows of the DTO's columns, never the password hash."""
+    Row = namedtuple("Row", list(UserRead.model_fields))
+    db = MagicMock()
+    result = MagicMock()
+    result.first.return_value = Row(id=5, email="a@example.com", full_name="A", is_active=True, is_superuser=False)
+    db.execute = AsyncMock(return_value=result)
+    db.get = AsyncMock()
+
+    user = await repository.get_user_view_by_email(db, "a@example.com", UserRead)
+
+    assert user == UserRead(id=5, email="a@example.com", full_name="A", is_active=True, is_superuser=False)
+    db.get.assert_not_called()
+    sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    select_list = sql.split(" FROM ")[0]
+    assert f"pgp_sym_decrypt({USERS}.email," in select_list and "AS full_name" in select_list
+    assert "hashed_password" not in sql
+    assert f"WHERE {USERS}.email_hash = " in sql
+
+
+@pytest.mark.asyncio
+async def test_user_view_pages_use_keyset(repository):
+    """Test that projected pages keep the keyset seek of list_users."""
+    db = MagicMock()
+    result = MagicMock()
+    result.all.return_value = []
+    db.execute = AsyncMock(return_value=result)
+
+    assert await repository.list_user_views(db, UserRead, limit=51, after_id=100) == []
+
+    sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "users.id >" in sql and f"ORDER BY {USERS}.id" in sql and "LIMIT" in sql
+    assert "hashed_password" not in sql
+
+
+def test_views_must_only_have_column_fields(repository):
+    class Summary(BaseModel):
+        id: int
+        display_name: str
+
+    with pytest.raises(ValueError, match=r"Summary fields \['display_name'\] are not columns of User"):
+        repository.view_columns(Summary)
+
+
+def test_hashed_password_is_only_decrypted_when_asked_for(repository):
+    """Test that plain selects skip the deferred password and entity reads load it explicitly."""
+    dialect = postgresql.dialect()
+    plain = str(select(UserModel).compile(dialect=dialect))
+    entity = str(select(UserModel).options(*repository._load_only(ENTITY_COLUMNS)).compile(dialect=dialect))
+    subset = str(select(UserModel).options(*repository._load_only(["is_active"])).compile(dialect=dialect))
+
+    assert "hashed_password" not in plain and plain.count("pgp_sym_decrypt(") == 2
+    assert "AS hashed_password" in entity and entity.count("pgp_sym_decrypt(") == 3
+    assert "pgp_sym_decrypt" not in subset and "is_active" in subset
+    with pytest.raises(ValueError, match=r"\['nickname'\] are not columns of User"):
+        repository._load_only(["nickname"])
+
+
+@pytest.mark.asyncio
+async def test_existence_checks_decrypt_nothing(repository):
+    """Test that exists probes select only the primary key."""
+    db = MagicMock()
+    db.scalar = AsyncMock(side_effect=[5, None])
+
+    assert await repository.user_exists(db, 5) is True
+    assert await repository.email_exists(db, "a@example.com") is False
+
+    by_id, by_email = (str(call.args[0].compile(dialect=postgresql.dialect())) for call in db.scalar.await_args_list)
+    assert by_id.startswith(f"SELECT {USERS}.id \nFROM") and "LIMIT" in by_id
+    assert f"WHERE {USERS}.email_hash = " in by_email
+    assert "pgp_sym_decrypt" not in by_id + by_email
+
+
+@pytest.mark.asyncio
+async def test_update_user_view_returns_only_the_view_columns(repository):
+    """Test that a view update keeps the blind index in sync and never returns the password."""
+    Row = namedtuple("Row", list(UserRead.model_fields))
+    db = MagicMock()
+    result = MagicMock()
+    result.first.return_value = Row(id=5, email="new@example.com", full_name="A", is_active=True, is_superuser=False)
+    db.execute = AsyncMock(return_value=result)
+    db.commit = AsyncMock()
+
+    user = await repository.update_user_view(db, 5, {"email": "new@example.com"}, UserRead)
+
+    assert user == UserRead(id=5, email="new@example.com", full_name="A", is_active=True, is_superuser=False)
+    sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "email_hash=" in sql.split(" SET ")[1].split(" WHERE ")[0]
+    returning = sql.split(" RETURNING ")[1]
+    assert returning.count("pgp_sym_decrypt(") == 2 and "hashed_password" not in returning
@@ -1,4 +1,17 @@
+import json
+import time
+from contextlib import asynccontextmanager
+from unittest import mock
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from argon2 import PasswordHasher
+
+from app.application.pagination import decode_cursor, encode_cursor
+from app.dependencies import STICKY_PRIMARY_COOKIE, container, get_db, get_session_factory
 from app.domain.entities.user import UserEntity
+from app.infrastructure.config import DatabaseSettings, get_settings
+from app.infrastructure.security import PasswordHashingBusyError, password_needs_rehash, verify_password
 
 
 def test_create_user_success(client, mock_user_repo):
@@ -79,6 +92,20 @@ def test_read_user_by_email_success(client, mock_user_repo, mock_db):
     mock_user_repo.get_user_by_email.assert_awaited_once_with(mock_db, email)
 
 
+def test_head_checks_existence_without_a_body(client, mock_user_repo, mock_db):
+    """Test that HEAD on a user or an email answers 200/404 with no body."""
+    mock_user_repo.user_exists = AsyncMock(side_effect=[True, False])
+    mock_user_repo.email_exists = AsyncMock(return_value=True)
+
+    assert client.head("/api/v1/users/5").status_code == 200
+    assert client.head("/api/v1/users/6").status_code == 404
+    response = client.head("/api/v1/users/by-email/a@example.com")
+
+    assert response.status_code == 200 and response.content == b""
+    mock_user_repo.email_exists.assert_awaited_once_with(mock_db, "a@example.com")
+    mock_user_repo.get_user_by_id.assert_not_called()
+
+
 def test_update_user_success(client, mock_user_repo):
     """Test updating a user successfully."""
     user_id = 1
@@ -124,3 +151,260 @@ def test_delete_user_success(client, mock_user_repo, mock_db):
     assert response.json()["message"] == "User deleted successfully"
 
     mock_user_repo.delete_user.assert_awaited_once_with(mock_db, user_id)
+
+
+def test_update_user_sends_only_changes(client, mock_user_repo, mock_db):
+    """Test that an update skips the pre-read and passes only the set fields, password hashed."""
+    mock_user_repo.update_user.return_value = UserEntity(
+        id=1, email="u@example.com", full_name="U", hashed_password="hashed"
+    )
+
+    with patch("app.application.mappers.user_mapper.hash_password_async", new=AsyncMock(return_value="hashed")):
+        response = client.put("/api/v1/users/1", json={"password": "new-secret", "full_name": None})
+
+    assert response.status_code == 200
+    mock_user_repo.get_user_by_id.assert_not_called()
+    mock_user_repo.update_user.assert_awaited_once_with(mock_db, 1, {"hashed_password": "hashed"})
+
+
+def test_update_user_not_found(client, mock_user_repo):
+    """Test that updating a missing user returns 404."""
+    mock_user_repo.update_user.return_value = None
+
+    response = client.put("/api/v1/users/999", json={"full_name": "Nobody"})
+
+    assert response.status_code == 404
+
+
+def test_delete_user_not_found(client, mock_user_repo):
+    """Test that deleting a missing user returns 404."""
+    mock_user_repo.delete_user.return_value = False
+
+    response = client.delete("/api/v1/users/999")
+
+    assert response.status_code == 404
+    mock_user_repo.get_user_by_id.assert_not_called()
+
+
+def test_create_user_returns_503_when_hashing_is_saturated(client, mock_user_repo):
+    """Test that a saturated hashing pool surfaces as 503 instead of blocking."""
+    user_input = {"email": "busy@example.com", "full_name": "Busy", "password": "secret"}
+
+    with patch(
+        "app.application.mappers.user_mapper.hash_password_async",
+        AsyncMock(side_effect=PasswordHashingBusyError("Password hashing queue is full")),
+    ):
+        response = client.post("/api/v1/users", json=user_input)
+
+    assert response.status_code == 503
+    mock_user_repo.create_user.assert_not_awaited()
+
+
+def make_users(*ids: int) -> list[UserEntity]:
+    return [UserEntity(id=i, email=f"u{i}@example.com", full_name=f"U{i}", hashed_password="h") for i in ids]
+
+
+def test_list_users_first_page(client, mock_user_repo, mock_db):
+    """Test that a full page returns an opaque cursor pointing after its last row."""
+    mock_user_repo.list_users.return_value = make_users(1, 2, 3)
+
+    response = client.get("/api/v1/users", params={"limit": 2})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [u["id"] for u in data["items"]] == [1, 2]
+    assert decode_cursor(data["next_cursor"]) == {"id": 2}
+    mock_user_repo.list_users.assert_awaited_once_with(mock_db, limit=3, after_id=None)
+
+
+def test_list_users_follows_cursor(client, mock_user_repo, mock_db):
+    """Test that the cursor becomes the keyset position and the last page has no cursor."""
+    mock_user_repo.list_users.return_value = make_users(3)
+
+    response = client.get("/api/v1/users", params={"limit": 2, "cursor": encode_cursor({"id": 2})})
+
+    assert response.status_code == 200
+    assert response.json() == {"items": [mock.ANY], "next_cursor": None}
+    mock_user_repo.list_users.assert_awaited_once_with(mock_db, limit=3, after_id=2)
+
+
+def test_list_users_rejects_bad_cursor_and_page_size(client, mock_user_repo):
+    assert client.get("/api/v1/users", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/api/v1/users", params={"limit": 10_000}).status_code == 422
+    mock_user_repo.list_users.assert_not_awaited()
+
+
+def stream_of(*batches: list[UserEntity]):
+    async def stream(db, batch_size):
+        for batch in batches:
+            yield batch
+
+    return stream
+
+
+def test_export_users_ndjson(client, mock_user_repo):
+    """Test that every batch is streamed as one JSON object per line."""
+    mock_user_repo.stream_users.side_effect = stream_of(make_users(1, 2), make_users(3))
+
+    response = client.get("/api/v1/users/export", params={"batch_size": 2})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == [1, 2, 3]
+    assert all("hashed_password" not in line for line in lines)
+
+
+def test_export_users_csv(client, mock_user_repo):
+    mock_user_repo.stream_users.side_effect = stream_of(make_users(1))
+
+    response = client.get("/api/v1/users/export", params={"format": "csv"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines() == [
+        "email,full_name,id,is_active,is_superuser",
+        "u1@example.com,U1,1,True,False",
+    ]
+
+
+def test_create_users_bulk_reports_each_item(client, mock_user_repo):
+    """Test that one insert covers the batch and duplicates are reported per item."""
+    users_input = [
+        {"email": "a@example.com", "full_name": "A", "password": "pw-a"},
+        {"email": "b@example.com", "full_name": "B", "password": "pw-b"},
+    ]
+    mock_user_repo.create_users.return_value = [make_users(10)[0], None]
+
+    response = client.post("/api/v1/users/bulk", json=users_input)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["created"], data["failed"]) == (1, 1)
+    assert data["items"][0]["status"] == "created"
+    assert data["items"][0]["user"]["id"] == 10
+    assert data["items"][1] == {
+        "index": 1,
+        "status": "error",
+        "user": None,
+        "error": "Email already registered",
+    }
+    mock_user_repo.create_users.assert_awaited_once()
+    assert len(mock_user_repo.create_users.await_args.args[1]) == 2
+
+
+def test_create_users_bulk_keeps_hashing_failures_out_of_the_insert(client, mock_user_repo):
+    users_input = [{"email": "a@example.com", "full_name": "A", "password": "pw-a"}]
+
+    with patch(
+        "app.application.mappers.user_mapper.hash_passwords_async",
+        AsyncMock(return_value=[PasswordHashingBusyError("Password hashing queue is full")]),
+    ):
+        response = client.post("/api/v1/users/bulk", json=users_input)
+
+    assert response.status_code == 200
+    assert response.json()["items"][0]["error"] == "Password hashing queue is full"
+    mock_user_repo.create_users.assert_not_awaited()
+
+
+def test_create_users_bulk_rejects_oversized_batches(client, mock_user_repo):
+    user = {"email": "a@example.com", "full_name": "A", "password": "pw"}
+    assert client.post("/api/v1/users/bulk", json=[user] * 1001).status_code == 422
+    assert client.post("/api/v1/users/bulk", json=[]).status_code == 422
+
+
+def test_fast_responses_match_validated_ones(client, mock_user_repo):
+    """Test that pre-serialized responses carry the same JSON as FastAPI's response_model path."""
+    mock_user_repo.get_user_by_id.return_value = make_users(7)[0]
+    mock_user_repo.list_users.return_value = make_users(1, 2, 3)
+    mock_user_repo.create_users.return_value = [make_users(10)[0], None]
+    bulk = [{"email": f"{n}@example.com", "full_name": "N", "password": "pw"} for n in "ab"]
+    validated = get_settings().model_copy(update={"FAST_RESPONSES": False})
+
+    def responses():
+        return [
+            client.get("/api/v1/users/7"),
+            client.get("/api/v1/users", params={"limit": 2}),
+            client.post("/api/v1/users/bulk", json=bulk),
+        ]
+
+    fast = responses()
+    with patch("app.adapters.api.v1.routers.user.get_settings", lambda: validated):
+        slow = responses()
+
+    for fast_response, slow_response in zip(fast, slow, strict=True):
+        assert fast_response.status_code == slow_response.status_code == 200
+        assert fast_response.headers["content-type"] == slow_response.headers["content-type"]
+        assert fast_response.json() == slow_response.json()
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_writes_set_the_sticky_primary_cookie(client, mock_user_repo, mock_db, fast):
+    """Test that the cookie get_db sets on the injected Response survives in both response modes."""
+    mock_user_repo.update_user.return_value = make_users(7)[0]
+    mock_user_repo.create_users.return_value = make_users(10)
+    settings = container.settings.model_copy(
+        update={"DATABASE_REPLICAS": [DatabaseSettings(HOST="replica-1")], "FAST_RESPONSES": fast}
+    )
+
+    @asynccontextmanager
+    async def primary_session(readonly=False):
+        yield mock_db
+
+    del client.app.dependency_overrides[get_db]  # Run the real dependency, which sets the cookie
+    with (
+        patch.object(container, "settings", settings),
+        patch.object(container, "get_db", primary_session),
+        patch("app.adapters.api.v1.routers.user.get_settings", lambda: settings),
+    ):
+        responses = [
+            client.put("/api/v1/users/7", json={"full_name": "U7"}),
+            client.post("/api/v1/users/bulk", json=[{"email": "u10@example.com", "full_name": "N", "password": "pw"}]),
+        ]
+
+    for response in responses:
+        assert response.status_code == 200
+        assert STICKY_PRIMARY_COOKIE in response.cookies
+
+
+def test_verify_persists_an_upgraded_hash(client, mock_user_repo, mock_db):
+    """Test that a login with an outdated hash writes the new hash through the repository in its own session."""
+    outdated = PasswordHasher(time_cost=1, memory_cost=8192, parallelism=1).hash("secret")
+    mock_user_repo.get_user_by_email.return_value = UserEntity(
+        id=7, email="u7@example.com", full_name="U7", hashed_password=outdated
+    )
+    rehash_session = mock.MagicMock()
+
+    @asynccontextmanager
+    async def session_factory():
+        yield rehash_session
+
+    client.app.dependency_overrides[get_session_factory] = lambda: session_factory
+
+    response = client.post("/api/v1/users/verify", json={"email": "u7@example.com", "password": "secret"})
+
+    assert response.status_code == 200
+    assert response.json()["id"] == 7 and "hashed_password" not in response.json()
+    mock_user_repo.get_user_by_email.assert_awaited_once_with(mock_db, "u7@example.com")
+    deadline = time.monotonic() + 5
+    while not mock_user_repo.update_user.await_count and time.monotonic() < deadline:
+        time.sleep(0.01)  # The rehash finishes after the response
+    [(session, user_id, changes)] = [call.args for call in mock_user_repo.update_user.await_args_list]
+    assert session is rehash_session and user_id == 7
+    assert verify_password("secret", changes["hashed_password"])
+    assert not password_needs_rehash(changes["hashed_password"])
+
+
+def test_verify_rejects_wrong_passwords_and_unknown_emails(client, mock_user_repo):
+    hashed = PasswordHasher(time_cost=1, memory_cost=8192, parallelism=1).hash("secret")
+    mock_user_repo.get_user_by_email.return_value = UserEntity(
+        id=7, email="u7@example.com", full_name="U7", hashed_password=hashed
+    )
+    client.app.dependency_overrides[get_session_factory] = lambda: None
+
+    assert client.post("/api/v1/users/verify", json={"email": "u7@example.com", "password": "wrong"}).status_code == 401
+    mock_user_repo.get_user_by_email.return_value = None
+    assert (
+        client.post("/api/v1/users/verify", json={"email": "no@example.com", "password": "secret"}).status_code == 401
+    )
+    mock_user_repo.update_user.assert_not_awaited()